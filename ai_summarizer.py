@@ -1,77 +1,125 @@
-import openai
-from datetime import datetime, timedelta
+import hashlib
 import json
-import re
+import random
+import threading
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
+from content_store import ContentStore, article_id
+from article_schema import ensure_normalized
+from dedup import Deduplicator, content_hash
+from keywords import TECH_KEYWORDS
+from llm_backend import create_backend
+from prompt_packer import PromptPacker, estimate_tokens, truncate_to_tokens
+
+# 提示词模板版本：修改_build_prompt或系统提示后加1，已缓存的总结随之失效
+PROMPT_VERSION = 3
+
+# 值得重试的临时错误（按类名判断，LLM后端不必依赖openai的异常模块）
+TRANSIENT_ERRORS = {
+    'Timeout', 'APITimeoutError', 'APIConnectionError', 'RateLimitError',
+    'ServiceUnavailableError', 'InternalServerError', 'TryAgain',
+    'TimeoutError', 'ConnectionError'
+}
+
+
+def is_transient(error):
+    """超时、连接失败、限流和服务端错误可以重试，参数或鉴权错误重试也不会成功"""
+    return any(cls.__name__ in TRANSIENT_ERRORS for cls in type(error).__mro__)
+
+
+def quarter_of(month_key):
+    """2025-08 -> 2025-Q3"""
+    year, month = month_key.split('-')
+    return f"{year}-Q{(int(month) - 1) // 3 + 1}"
+
+
+def year_of(period):
+    """2025-Q3 -> 2025"""
+    return period.split('-')[0]
+
+
+# 汇总层级：名称、上一层的分组方式
+ROLLUP_LEVELS = [('quarter', '季度', quarter_of), ('year', '年度', year_of)]
+
 
 class AISummarizer:
-    def __init__(self):
+    def __init__(self, content_store=None, db=None, author='', backend=None, term_index=None):
         self.config = Config()
-        if self.config.OPENAI_API_KEY:
-            openai.api_key = self.config.OPENAI_API_KEY
-        else:
+        self.content_store = content_store or ContentStore()
+        # 设置了数据库时，按月份从数据库查询文章
+        self.db = db
+        self.author = author
+        # 设置了关键词索引时，提示词和统计总结中附上该月TF-IDF最高的词
+        self.term_index = term_index
+        # 所有月份、所有map请求共享的LLM并发上限
+        self.llm_slots = threading.BoundedSemaphore(self.config.SUMMARY_CONCURRENCY)
+        self.packer = PromptPacker(self.config.SUMMARY_PROMPT_TOKENS, self.config.SUMMARY_ARTICLE_MIN_TOKENS)
+        # LLM后端：OpenAI或兼容服务、录制回放；没有可用后端时生成统计总结
+        self.backend = backend if backend is not None else create_backend(self.config)
+        if self.backend is None:
             print("警告: 未设置OpenAI API密钥，将无法使用AI总结功能")
     
     def group_articles_by_month(self, articles):
         """按月份分组文章"""
         monthly_articles = defaultdict(list)
         
-        for article in articles:
-            # 解析发布时间
-            publish_date = self._parse_date(article.get('publish_time', ''))
-            if publish_date:
-                month_key = publish_date.strftime('%Y-%m')
-                monthly_articles[month_key].append(article)
+        for article in ensure_normalized(articles):
+            # 月份在入库规范化时已解析
+            if article['month']:
+                monthly_articles[article['month']].append(article)
         
         return dict(monthly_articles)
     
-    def _parse_date(self, date_str):
-        """解析各种格式的日期字符串"""
-        if not date_str:
-            return None
-            
-        # 常见的CSDN日期格式
-        date_patterns = [
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',  # 2025-09-15
-            r'(\d{4})年(\d{1,2})月(\d{1,2})日',  # 2025年9月15日
-            r'(\d{1,2})-(\d{1,2})',  # 09-15 (当年)
-            r'(\d{1,2})月(\d{1,2})日',  # 9月15日 (当年)
-        ]
-        
-        current_year = datetime.now().year
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, date_str)
-            if match:
-                try:
-                    groups = match.groups()
-                    if len(groups) == 3:  # 年月日
-                        year, month, day = map(int, groups)
-                    elif len(groups) == 2:  # 月日
-                        year = current_year
-                        month, day = map(int, groups)
-                    else:
-                        continue
-                    
-                    return datetime(year, month, day)
-                except ValueError:
-                    continue
-        
-        return None
-    
     def generate_monthly_summary(self, articles, month_key):
-        """为指定月份生成AI总结"""
-        if not self.config.OPENAI_API_KEY:
-            return self._generate_simple_summary(articles, month_key)
+        """为指定月份生成AI总结，重试后仍失败时退回统计总结"""
+        return self._generate_monthly_summary(articles, month_key)[0]
+    
+    def _generate_monthly_summary(self, articles, month_key):
+        """返回(总结, 是否可缓存)；AI请求失败退回的统计总结不缓存，下次运行重新尝试"""
+        if self.backend is None:
+            return self._generate_simple_summary(articles, month_key), True
         
+        # 正文相同或几乎相同的文章只保留一篇，不重复发送给LLM；统计和文章列表仍用本月全部文章
+        prompt_articles = Deduplicator().dedupe_by_content(articles, self.content_store.full_text)
+        try:
+            if self.packer.fits(prompt_articles):
+                return self._complete(self._build_prompt(prompt_articles, month_key)), True
+            return self._map_reduce_summary(prompt_articles, month_key), True
+        except Exception as e:
+            print(f"{month_key}月份AI总结生成失败: {e}")
+            return self._generate_simple_summary(articles, month_key), False
+    
+    def model_name(self):
+        """生成总结的模型；没有LLM后端时为统计总结"""
+        return self.config.SUMMARY_MODEL if self.backend is not None else 'simple'
+    
+    def cache_key(self, month_articles):
+        """月度总结的内容寻址键：文章ID、标题和正文哈希 + 提示词版本 + 模型
+        
+        阅读量等统计数据每天都在变，不计入键，否则每次爬取都会让所有月份失效；
+        正文哈希取自文章记录（保存正文时算好），判断缓存命中不需要解压正文
+        """
+        digest = hashlib.sha256(f"v{PROMPT_VERSION}\n{self.model_name()}\n".encode('utf-8'))
+        for article in sorted(month_articles, key=lambda a: article_id(a['url'])):
+            text_hash = self.content_store.text_hash(article)
+            line = f"{article_id(article['url'])}\t{article.get('title', '')}\t{text_hash}\n"
+            digest.update(line.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _build_prompt(self, articles, month_key, articles_text=None):
+        """构建月度总结的提示词；articles_text为map阶段整理的要点时用于reduce"""
         # 准备文章内容
-        articles_text = self._prepare_articles_for_summary(articles)
+        if articles_text is None:
+            articles_text = self._prepare_articles_for_summary(articles)
         
-        # 构建提示词
-        prompt = f"""
+        terms = self._month_terms(articles)
+        terms_text = f"本月高频术语（TF-IDF）：{', '.join(terms)}\n" if terms else ''
+        
+        return f"""
 请根据以下{month_key}月份的CSDN博客文章，生成一份详细的月度总结报告。
-
+{terms_text}
 文章内容：
 {articles_text}
 
@@ -102,42 +150,98 @@ class AISummarizer:
 
 请用中文回答，内容要专业且有深度。
 """
+    
+    def _map_reduce_summary(self, articles, month_key):
+        """文章太多放不进一个提示词：分组并发提炼要点（map），再由要点生成月度总结（reduce）"""
+        chunks = self.packer.chunks(articles)
+        print(f"{month_key}月份共{len(articles)}篇文章，分{len(chunks)}组提炼要点后汇总")
+        
+        def extract(indexed_chunk):
+            index, chunk = indexed_chunk
+            prompt = f"""
+请阅读以下{month_key}月份的CSDN博客文章（第{index}/{len(chunks)}组），逐篇提炼技术主题、核心观点和技术亮点。
+用简洁的中文要点列出，保留文章标题、阅读量和点赞数。
 
+文章内容：
+{self._prepare_articles_for_summary(chunk)}
+"""
+            return self._complete(prompt, max_tokens=self.config.SUMMARY_MAP_TOKENS)
+        
+        with self.executor() as pool:
+            notes = list(pool.map(extract, enumerate(chunks, 1)))
+        notes = self._merge_notes(notes, month_key)
+        
+        articles_text = f"本月共{len(articles)}篇文章，分组整理的要点如下：\n\n" + '\n\n'.join(notes)
+        return self._complete(self._build_prompt(articles, month_key, articles_text))
+    
+    def _merge_notes(self, notes, month_key):
+        """要点合计仍超出预算时，逐层合并相邻的要点，直到放得进一个提示词"""
+        budget = self.config.SUMMARY_PROMPT_TOKENS
+        while len(notes) > 1 and sum(estimate_tokens(note) for note in notes) > budget:
+            groups = [[]]
+            for note in notes:
+                if groups[-1] and sum(estimate_tokens(n) for n in groups[-1] + [note]) > budget:
+                    groups.append([])
+                groups[-1].append(note)
+            if len(groups) == len(notes):
+                # 每条要点单独就接近预算，无法再合并
+                break
+            
+            def merge(group):
+                if len(group) == 1:
+                    return group[0]
+                prompt = f"请把以下{month_key}月份博客文章的几组要点合并为一份，保留最重要的技术主题和亮点：\n\n" + '\n\n'.join(group)
+                return self._complete(prompt, max_tokens=self.config.SUMMARY_MAP_TOKENS)
+            
+            with self.executor() as pool:
+                notes = list(pool.map(merge, groups))
+        return notes
+    
+    def _complete(self, prompt, max_tokens=None):
+        """调用LLM，每次调用有超时，临时错误按带抖动的指数退避重试，整体不超过SUMMARY_DEADLINE秒"""
+        deadline = time.monotonic() + self.config.SUMMARY_DEADLINE
+        attempt = 0
+        while True:
+            try:
+                return self._call_backend(prompt, max_tokens, deadline)
+            except Exception as e:
+                attempt += 1
+                if not is_transient(e) or attempt > self.config.SUMMARY_RETRIES:
+                    raise
+                # 完全抖动：在[0, base × 2^attempt]内随机等待，避免并发请求同时重试
+                delay = random.uniform(0, self.config.SUMMARY_RETRY_BASE_DELAY * 2 ** attempt)
+                if time.monotonic() + delay >= deadline:
+                    raise
+                print(f"LLM请求失败（{e}），{delay:.1f}秒后第{attempt}次重试")
+                time.sleep(delay)
+    
+    def _call_backend(self, prompt, max_tokens, deadline):
+        """占用一个并发槽位调用一次LLM；等待槽位的时间也计入deadline，超过即抛出TimeoutError"""
+        if not self.llm_slots.acquire(timeout=max(0, deadline - time.monotonic())):
+            raise TimeoutError(f"等待LLM并发槽位超过{self.config.SUMMARY_DEADLINE}秒")
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+            return self.backend.complete(
                 messages=[
                     {"role": "system", "content": "你是一个专业的技术博客分析师，擅长分析技术文章并生成深度总结。"},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=2000,
-                temperature=0.7
+                model=self.config.SUMMARY_MODEL,
+                max_tokens=max_tokens or self.config.SUMMARY_MAX_TOKENS,
+                temperature=0.7,
+                timeout=min(self.config.SUMMARY_TIMEOUT, deadline - time.monotonic())
             )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            print(f"AI总结生成失败: {e}")
-            return self._generate_simple_summary(articles, month_key)
+        finally:
+            self.llm_slots.release()
     
     def _prepare_articles_for_summary(self, articles):
-        """准备文章内容用于AI总结"""
-        articles_text = ""
-        
-        for i, article in enumerate(articles, 1):
+        """准备文章内容用于AI总结：在SUMMARY_PROMPT_TOKENS预算内按文章热度分配正文长度"""
+        def header(i, article):
             title = article.get('title', '无标题')
-            content = article.get('content', '')[:500]  # 限制长度
             read_count = article.get('read_count', 0)
             like_count = article.get('like_count', 0)
-            
-            articles_text += f"""
-{i}. 标题：{title}
-   阅读量：{read_count} | 点赞数：{like_count}
-   内容摘要：{content}...
-   
-"""
+            return f"{i}. 标题：{title}\n   阅读量：{read_count} | 点赞数：{like_count}"
         
-        return articles_text
+        return self.packer.pack(articles, self.content_store.full_text, header)
     
     def _generate_simple_summary(self, articles, month_key):
         """生成简单的统计总结（不使用AI）"""
@@ -145,9 +249,9 @@ class AISummarizer:
         total_likes = sum(article.get('like_count', 0) for article in articles)
         total_comments = sum(article.get('comment_count', 0) for article in articles)
         
-        # 提取关键词
+        # 提取关键词：TF-IDF高频术语在前，再补充标题中出现的技术词表关键词
         all_titles = ' '.join(article.get('title', '') for article in articles)
-        keywords = self._extract_keywords(all_titles)
+        keywords = list(dict.fromkeys(self._month_terms(articles) + self._extract_keywords(all_titles)))
         
         # 找出热门文章
         hot_articles = sorted(articles, 
@@ -177,43 +281,209 @@ class AISummarizer:
         return summary
     
     def _extract_keywords(self, text):
-        """简单的关键词提取"""
-        # 技术相关关键词
-        tech_keywords = [
-            'Python', 'Java', 'JavaScript', 'C++', 'Go', 'Rust',
-            'React', 'Vue', 'Angular', 'Node.js', 'Django', 'Flask',
-            'MySQL', 'Redis', 'MongoDB', 'PostgreSQL',
-            'Docker', 'Kubernetes', 'Linux', 'Git',
-            'AI', '人工智能', '机器学习', '深度学习',
-            '算法', '数据结构', '设计模式',
-            '前端', '后端', '全栈', '微服务',
-            '云计算', '大数据', '区块链'
-        ]
-        
-        found_keywords = []
-        text_upper = text.upper()
-        
-        for keyword in tech_keywords:
-            if keyword.upper() in text_upper or keyword in text:
-                found_keywords.append(keyword)
-        
-        return found_keywords
-    
-    def generate_all_monthly_summaries(self, articles):
-        """生成所有月份的总结"""
-        monthly_articles = self.group_articles_by_month(articles)
-        summaries = {}
-        
-        for month_key, month_articles in monthly_articles.items():
-            print(f"正在生成{month_key}月份总结...")
-            summary = self.generate_monthly_summary(month_articles, month_key)
-            summaries[month_key] = {
-                'summary': summary,
-                'article_count': len(month_articles),
-                'articles': month_articles
-            }
+        """提取文本中出现的技术关键词，按出现次数从多到少"""
+        return TECH_KEYWORDS.extract(text)
+    
+    def _month_terms(self, articles, n=10):
+        """文章集合TF-IDF最高的n个词，没有关键词索引时为空
+        
+        IDF随全部文章变化，这些词不计入缓存键，否则每新增一篇文章所有月份都会失效
+        """
+        if self.term_index is None:
+            return []
+        return self.term_index.keywords(articles, n=n)
+    
+    def generate_all_monthly_summaries(self, articles=None, cached=None):
+        """生成所有月份的总结；不传articles时从数据库按月份查询
+        
+        各月份并发生成（最多SUMMARY_CONCURRENCY个同时进行），总耗时接近最慢的月份；
+        cached为已保存的总结，输入没有变化的月份直接复用
+        """
+        cached = cached or {}
+        if articles is None:
+            months = list(self.db.month_counts(self.author))
+            load = lambda month_key: self.db.articles_in_month(month_key, self.author)
+        else:
+            monthly_articles = self.group_articles_by_month(articles)
+            months = list(monthly_articles)
+            load = monthly_articles.get
         
+        with self.executor() as pool:
+            results = pool.map(
+                lambda month_key: self.summarize_month(month_key, load(month_key), cached.get(month_key)),
+                months
+            )
+            summaries = dict(zip(months, results))
+        
+        reused = sum(1 for month_key in months if summaries[month_key] is cached.get(month_key))
+        print(f"月度总结: 复用{reused}个月份，重新生成{len(months) - reused}个月份")
         return summaries
+    
+    def executor(self):
+        """月度总结的线程池，并发数即同时进行的LLM请求数"""
+        return ThreadPoolExecutor(max_workers=self.config.SUMMARY_CONCURRENCY)
+    
+    def summarize_month(self, month_key, month_articles, cached=None):
+        """生成单个月份的总结条目；cached的缓存键与本月输入一致时直接返回cached"""
+        # 去重结果由本月文章决定，按去重前的文章计算缓存键，命中时不必读取正文
+        key = self.cache_key(month_articles)
+        if cached and cached.get('cache_key') == key:
+            return cached
+        
+        print(f"正在生成{month_key}月份总结...")
+        summary, cacheable = self._generate_monthly_summary(month_articles, month_key)
+        return {
+            'summary': summary,
+            'article_count': len(month_articles),
+            'articles': month_articles,
+            'cache_key': key if cacheable else None
+        }
+
+    def generate_rollups(self, summaries, cached=None):
+        """由月度总结逐级生成季度总结和年度总结
+        
+        季度总结只读取该季度各月的总结和统计，年度总结只读取各季度的总结，
+        不会重新发送文章内容；cached为已保存的汇总，下级总结没有变化的时间段直接复用
+        """
+        cached = cached or {}
+        rollups = {}
+        children = summaries
+        
+        for level, label, parent_of in ROLLUP_LEVELS:
+            groups = defaultdict(dict)
+            for child_key, entry in children.items():
+                groups[parent_of(child_key)][child_key] = entry
+            
+            periods = sorted(groups, reverse=True)
+            with self.executor() as pool:
+                results = pool.map(
+                    lambda period: self.summarize_period(period, level, label, groups[period], cached.get(period)),
+                    periods
+                )
+                children = dict(zip(periods, results))
+            rollups.update(children)
+        
+        reused = sum(1 for period, entry in rollups.items() if entry is cached.get(period))
+        print(f"季度/年度总结: 复用{reused}个，重新生成{len(rollups) - reused}个")
+        return dict(sorted(rollups.items(), reverse=True))
+    
+    def _period_stats(self, children):
+        """汇总下级时间段的统计数据和热门文章"""
+        stats = {'reads': 0, 'likes': 0, 'comments': 0}
+        hot_articles = []
+        for entry in children.values():
+            if 'stats' in entry:
+                for key in stats:
+                    stats[key] += entry['stats'].get(key, 0)
+                hot_articles.extend(entry.get('hot_articles', []))
+                continue
+            for article in entry.get('articles', []):
+                stats['reads'] += article.get('read_count', 0)
+                stats['likes'] += article.get('like_count', 0)
+                stats['comments'] += article.get('comment_count', 0)
+                hot_articles.append({
+                    key: article.get(key) for key in ('title', 'url', 'publish_time', 'read_count', 'like_count')
+                })
+        
+        hot_articles.sort(key=lambda x: (x.get('read_count') or 0) + (x.get('like_count') or 0) * 5, reverse=True)
+        return stats, hot_articles[:5]
+    
+    def _period_cache_key(self, level, children):
+        """汇总的缓存键：提示词版本 + 模型 + 各下级总结的内容"""
+        digest = hashlib.sha256(f"v{PROMPT_VERSION}\n{self.model_name()}\n{level}\n".encode('utf-8'))
+        for child_key in sorted(children):
+            digest.update(f"{child_key}\t{content_hash(children[child_key].get('summary', ''))}\n".encode('utf-8'))
+        return digest.hexdigest()
+    
+    def summarize_period(self, period, level, label, children, cached=None):
+        """由下级总结生成一个季度或年度的总结条目"""
+        key = self._period_cache_key(level, children)
+        if cached and cached.get('cache_key') == key:
+            return cached
+        
+        print(f"正在生成{period}{label}总结...")
+        stats, hot_articles = self._period_stats(children)
+        article_count = sum(entry.get('article_count', 0) for entry in children.values())
+        summary, cacheable = self._generate_period_summary(
+            period, label, children, stats, hot_articles, article_count
+        )
+        return {
+            'summary': summary,
+            'level': level,
+            'periods': sorted(children, reverse=True),
+            'article_count': article_count,
+            'stats': stats,
+            'hot_articles': hot_articles,
+            'cache_key': key if cacheable else None
+        }
+    
+    def _generate_period_summary(self, period, label, children, stats, hot_articles, article_count):
+        """返回(总结, 是否可缓存)；没有LLM后端或请求失败时生成统计汇总"""
+        if self.backend is None:
+            return self._generate_simple_period_summary(period, label, children, stats, hot_articles), True
+        
+        # 各下级总结平分提示词预算，长期跨度也只是一次小请求
+        share = self.config.SUMMARY_PROMPT_TOKENS // max(1, len(children))
+        sections = '\n\n'.join(
+            f"【{child_key}】\n{truncate_to_tokens(children[child_key].get('summary', ''), share)}"
+            for child_key in sorted(children)
+        )
+        hot_text = '\n'.join(
+            f"- {a.get('title')} (阅读:{a.get('read_count')}, 点赞:{a.get('like_count')})" for a in hot_articles
+        )
+        prompt = f"""
+请根据以下{period}各时间段的CSDN博客总结，生成一份{label}回顾。
+
+基本统计：文章{article_count}篇，阅读{stats['reads']}，点赞{stats['likes']}，评论{stats['comments']}
+
+热门文章：
+{hot_text}
+
+各时间段总结：
+{sections}
+
+请按以下格式生成：
+
+## {period} {label}回顾
+
+### 📊 基本统计
+### 🧭 技术方向演变
+[对比各时间段，分析技术关注点的变化]
+
+### 💡 代表性成果
+### 🚀 下一阶段建议
+
+请用中文回答，内容精炼。
+"""
+        try:
+            return self._complete(prompt), True
+        except Exception as e:
+            print(f"{period}{label}总结生成失败: {e}")
+            return self._generate_simple_period_summary(period, label, children, stats, hot_articles), False
+    
+    def _generate_simple_period_summary(self, period, label, children, stats, hot_articles):
+        """生成简单的统计汇总（不使用AI）"""
+        article_count = sum(entry.get('article_count', 0) for entry in children.values())
+        keywords = self._extract_keywords(' '.join(a.get('title') or '' for a in hot_articles))
+        
+        summary = f"""## {period} {label}回顾
+
+### 📊 基本统计
+- 发布文章数量：{article_count}篇
+- 总阅读量：{stats['reads']}
+- 总点赞数：{stats['likes']}
+- 总评论数：{stats['comments']}
+
+### 📅 各时间段发文
+"""
+        for child_key in sorted(children):
+            summary += f"- {child_key}：{children[child_key].get('article_count', 0)}篇\n"
+        
+        summary += f"\n### 🎯 主要关键词\n{', '.join(keywords[:10])}\n\n### 🔥 热门文章\n"
+        for i, article in enumerate(hot_articles, 1):
+            summary += f"{i}. {article.get('title')} (阅读:{article.get('read_count')}, 点赞:{article.get('like_count')})\n"
+        
+        return summary
 
 if __name__ == "__main__":
     # 测试代码
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+文章统计的列式表示 - NumPy
+阅读量、点赞数、评论数和发布时间各为一列数组，合计、热门/最新前k篇（argpartition）、月度计数（bincount）、
+平均值和分位数都是向量化计算，百万篇文章的首页统计在几十毫秒内完成
+"""
+
+import numpy as np
+from article_schema import ensure_normalized
+
+# 发布时间未知（与numpy的NaT相同），按时间排序时排在最后
+MISSING_TIME = np.iinfo(np.int64).min
+
+
+def top_k(values, k):
+    """values最大的k个位置，按值从大到小；值相同时位置靠前的在前，与稳定排序取前k个的结果一致"""
+    n = len(values)
+    if n > k:
+        # argpartition只保证第k大的值在边界上，与它相等的值按位置补齐
+        threshold = values[np.argpartition(values, n - k)[n - k]]
+        above = np.flatnonzero(values > threshold)
+        equal = np.flatnonzero(values == threshold)[:k - len(above)]
+        indices = np.concatenate([above, equal])
+    else:
+        indices = np.arange(n)
+    # 按(值, -位置)升序后反转，即值从大到小、同值位置从小到大
+    return indices[np.lexsort((-indices, values[indices]))[::-1]]
+
+
+class ArticleColumns:
+    def __init__(self, reads, likes, comments, timestamps, urls=None):
+        """timestamps为发布时间（秒），未知为MISSING_TIME；urls与各列一一对应"""
+        self.reads = np.asarray(reads, dtype=np.int64)
+        self.likes = np.asarray(likes, dtype=np.int64)
+        self.comments = np.asarray(comments, dtype=np.int64)
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.urls = urls
+        # 热度分数：阅读量 + 点赞数 × 5（与article_db.article_score一致）
+        self.scores = self.reads + self.likes * 5
+
+    @classmethod
+    def from_articles(cls, articles):
+        """由规范化的文章记录构建"""
+        articles = ensure_normalized(articles)
+        n = len(articles)
+        return cls(
+            np.fromiter((a.get('read_count', 0) for a in articles), dtype=np.int64, count=n),
+            np.fromiter((a.get('like_count', 0) for a in articles), dtype=np.int64, count=n),
+            np.fromiter((a.get('comment_count', 0) for a in articles), dtype=np.int64, count=n),
+            np.fromiter(
+                (MISSING_TIME if a['timestamp'] is None else a['timestamp'] for a in articles),
+                dtype=np.int64, count=n
+            ),
+            [a['url'] for a in articles]
+        )
+
+    def __len__(self):
+        return len(self.reads)
+
+    def totals(self):
+        """文章数和阅读、点赞、评论总数"""
+        return {
+            'articles': len(self),
+            'reads': int(self.reads.sum()),
+            'likes': int(self.likes.sum()),
+            'comments': int(self.comments.sum())
+        }
+
+    def hot(self, k):
+        """热度最高的k篇的位置"""
+        return top_k(self.scores, k)
+
+    def latest(self, k):
+        """发布时间最新的k篇的位置"""
+        return top_k(self.timestamps, k)
+
+    def month_counts(self):
+        """各月份的文章数{YYYY-MM: 篇数}，按月份倒序；发布时间未知的不计"""
+        known = self.timestamps[self.timestamps != MISSING_TIME]
+        if not len(known):
+            return {}
+        # 先按天计数，只把出现过的天数范围（几千个值）换算为月份，避免对每篇文章做日历换算
+        days = known // 86400
+        first_day = days.min()
+        per_day = np.bincount(days - first_day)
+        day_months = (np.arange(len(per_day)) + first_day).astype('datetime64[D]').astype('datetime64[M]')
+        month_ids = day_months.view(np.int64)
+        counts = np.bincount(month_ids - month_ids[0], weights=per_day).astype(np.int64)
+        active = np.flatnonzero(counts)[::-1]
+        labels = np.datetime_as_string((active + month_ids[0]).astype('datetime64[M]'), unit='M')
+        return dict(zip(labels.tolist(), counts[active].tolist()))
+
+    def average_reads(self):
+        return int(self.reads.sum() // len(self)) if len(self) else 0
+
+    def read_percentiles(self, q=(50, 90)):
+        """阅读量的分位数（取不超过该位置的实际值），没有文章时全为0"""
+        n = len(self)
+        if not n:
+            return [0] * len(q)
+        ranks = np.asarray(q) * (n - 1) // 100
+        if self.reads.min() >= 0 and self.reads.max() <= 16 * n:
+            # 阅读量是范围有限的整数：计数后在累计分布上查找，不需要排序
+            cumulative = np.cumsum(np.bincount(self.reads))
+            return [int(v) for v in np.searchsorted(cumulative, ranks, side='right')]
+        return [int(v) for v in np.partition(self.reads, ranks)[ranks]]
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+文章/总结存储 - SQLite后端
+文章按(作者, 文章键)存储，文章键通常就是url；url、发布时间、月份和统计数据单独成列（取自规范化后的文章记录），月份带索引，写入为upsert，
+按月份查询时不需要整文件加载和逐条解析日期
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from article_schema import ensure_normalized
+from config import Config
+
+
+def article_score(article):
+    """热度分数：阅读量 + 点赞数 × 5"""
+    return article.get('read_count', 0) + article.get('like_count', 0) * 5
+
+
+def article_keys(articles):
+    """每篇文章的存储键：url在这批文章中唯一时就是url；url为空或重复时（如示例数据）
+    用url加标题和发布时间的哈希，保证每篇文章各占一行且每次保存键不变"""
+    url_counts = {}
+    for article in articles:
+        url = article.get('url') or ''
+        url_counts[url] = url_counts.get(url, 0) + 1
+
+    keys = []
+    seen = set()
+    for article in articles:
+        url = article.get('url') or ''
+        key = url
+        if not url or url_counts[url] > 1:
+            digest = hashlib.sha1(f"{article.get('title', '')}\0{article.get('published')}".encode('utf-8'))
+            key = f"{url}#{digest.hexdigest()[:12]}"
+        # 标题和时间也相同的记录按出现顺序编号
+        base, n = key, 1
+        while key in seen:
+            n += 1
+            key = f"{base}#{n}"
+        seen.add(key)
+        keys.append(key)
+    return keys
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    author TEXT NOT NULL,
+    article_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT,
+    publish_date TEXT,
+    month TEXT,
+    read_count INTEGER NOT NULL DEFAULT 0,
+    like_count INTEGER NOT NULL DEFAULT 0,
+    comment_count INTEGER NOT NULL DEFAULT 0,
+    score INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (author, article_key)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_author_position ON articles (author, position);
+CREATE INDEX IF NOT EXISTS idx_articles_author_month ON articles (author, month);
+
+CREATE TABLE IF NOT EXISTS summaries (
+    author TEXT NOT NULL,
+    month TEXT NOT NULL,
+    article_count INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (author, month)
+);
+
+CREATE TABLE IF NOT EXISTS rollups (
+    author TEXT NOT NULL,
+    period TEXT NOT NULL,
+    level TEXT NOT NULL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (author, period)
+);
+"""
+
+
+class ArticleDB:
+    def __init__(self, path=None):
+        self.config = Config()
+        self.path = path or self.config.DATABASE_FILE
+        self.lock = threading.Lock()
+
+        # 流水线和多作者模式下多个线程共用一个连接，由锁串行化
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock, self.conn:
+            if self.path != ':memory:':
+                self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.executescript(SCHEMA)
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _articles(self, sql, params=()):
+        # 旧版本保存的记录没有规范化字段，读取时补齐一次，下次保存后即为规范化的记录
+        return ensure_normalized([json.loads(row['data']) for row in self._query(sql, params)])
+
+    def upsert_articles(self, articles, author=''):
+        """按文章键写入文章；只有内容变化的文章才更新updated_at。articles的顺序即展示顺序"""
+        now = time.time()
+        articles = ensure_normalized(articles)
+        rows = []
+        for position, (key, article) in enumerate(zip(article_keys(articles), articles)):
+            rows.append((
+                author, key, article.get('url') or '', position, article.get('title', ''),
+                article['published'], article['month'],
+                article.get('read_count', 0), article.get('like_count', 0),
+                article.get('comment_count', 0), article_score(article),
+                json.dumps(article, ensure_ascii=False, sort_keys=True), now
+            ))
+
+        with self.lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO articles (author, article_key, url, position, title, publish_date, month,
+                                      read_count, like_count, comment_count, score, data, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(author, article_key) DO UPDATE SET
+                    url = excluded.url,
+                    position = excluded.position,
+                    title = excluded.title,
+                    publish_date = excluded.publish_date,
+                    month = excluded.month,
+                    read_count = excluded.read_count,
+                    like_count = excluded.like_count,
+                    comment_count = excluded.comment_count,
+                    score = excluded.score,
+                    updated_at = CASE WHEN articles.data != excluded.data
+                                      THEN excluded.updated_at ELSE articles.updated_at END,
+                    data = excluded.data
+            """, rows)
+
+    def replace_articles(self, articles, author=''):
+        """用articles替换作者的全部文章（保存完整数据集时使用）"""
+        keys = set(article_keys(ensure_normalized(articles)))
+        stale = [
+            row['article_key'] for row in self._query('SELECT article_key FROM articles WHERE author = ?', (author,))
+            if row['article_key'] not in keys
+        ]
+        with self.lock, self.conn:
+            self.conn.executemany(
+                'DELETE FROM articles WHERE author = ? AND article_key = ?', [(author, key) for key in stale]
+            )
+        self.upsert_articles(articles, author)
+
+    def count(self, author=''):
+        return self._query('SELECT COUNT(*) FROM articles WHERE author = ?', (author,))[0][0]
+
+    def all_articles(self, author=''):
+        """作者的全部文章，按保存时的顺序"""
+        return self._articles('SELECT data FROM articles WHERE author = ? ORDER BY position', (author,))
+
+    def articles_in_month(self, month, author=''):
+        """指定月份（YYYY-MM）的文章"""
+        return self._articles(
+            'SELECT data FROM articles WHERE author = ? AND month = ? ORDER BY position', (author, month)
+        )
+
+    def month_counts(self, author=''):
+        """各月份的文章数，按月份倒序"""
+        rows = self._query(
+            'SELECT month, COUNT(*) FROM articles WHERE author = ? AND month IS NOT NULL '
+            'GROUP BY month ORDER BY month DESC', (author,)
+        )
+        return {row[0]: row[1] for row in rows}
+
+    SUMMARY_UPSERT = """
+        INSERT INTO summaries (author, month, article_count, data, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(author, month) DO UPDATE SET
+            article_count = excluded.article_count,
+            data = excluded.data,
+            updated_at = excluded.updated_at
+    """
+
+    ROLLUP_UPSERT = """
+        INSERT INTO rollups (author, period, level, data, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(author, period) DO UPDATE SET
+            level = excluded.level,
+            data = excluded.data,
+            updated_at = excluded.updated_at
+    """
+
+    @staticmethod
+    def _summary_rows(summaries, author):
+        now = time.time()
+        return [
+            (author, month, entry.get('article_count', 0), json.dumps(entry, ensure_ascii=False), now)
+            for month, entry in summaries.items()
+        ]
+
+    @staticmethod
+    def _rollup_rows(rollups, author):
+        now = time.time()
+        return [
+            (author, period, entry.get('level', ''), json.dumps(entry, ensure_ascii=False), now)
+            for period, entry in rollups.items()
+        ]
+
+    def _replace_set(self, table, key_column, upsert_sql, rows, author):
+        """在同一个事务里删除作者不在rows中的旧行并写入rows"""
+        keys = {row[1] for row in rows}
+        with self.lock, self.conn:
+            stale = [
+                (author, row[0])
+                for row in self.conn.execute(f'SELECT {key_column} FROM {table} WHERE author = ?', (author,))
+                if row[0] not in keys
+            ]
+            self.conn.executemany(f'DELETE FROM {table} WHERE author = ? AND {key_column} = ?', stale)
+            self.conn.executemany(upsert_sql, rows)
+
+    def upsert_summaries(self, summaries, author=''):
+        """写入月度总结"""
+        rows = self._summary_rows(summaries, author)
+        with self.lock, self.conn:
+            self.conn.executemany(self.SUMMARY_UPSERT, rows)
+
+    def replace_summaries(self, summaries, author=''):
+        """用summaries替换作者的全部月度总结（已不存在的月份一并删除）"""
+        self._replace_set('summaries', 'month', self.SUMMARY_UPSERT, self._summary_rows(summaries, author), author)
+
+    def summaries(self, author=''):
+        """作者的全部月度总结，按月份倒序"""
+        rows = self._query('SELECT month, data FROM summaries WHERE author = ? ORDER BY month DESC', (author,))
+        return {row['month']: json.loads(row['data']) for row in rows}
+
+    def upsert_rollups(self, rollups, author=''):
+        """写入季度/年度总结，键为2025-Q3或2025这样的时间段"""
+        rows = self._rollup_rows(rollups, author)
+        with self.lock, self.conn:
+            self.conn.executemany(self.ROLLUP_UPSERT, rows)
+
+    def replace_rollups(self, rollups, author=''):
+        """用rollups替换作者的全部季度/年度总结"""
+        self._replace_set('rollups', 'period', self.ROLLUP_UPSERT, self._rollup_rows(rollups, author), author)
+
+    def rollups(self, author=''):
+        """作者的全部季度/年度总结，按时间段倒序"""
+        rows = self._query('SELECT period, data FROM rollups WHERE author = ? ORDER BY period DESC', (author,))
+        return {row['period']: json.loads(row['data']) for row in rows}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+文章记录规范化 - 入库时解析一次
+发布时间统一解析为published（"YYYY-MM-DD HH:MM:SS"，字符串即可排序）、timestamp（秒）和month（YYYY-MM），
+统计数字转为整数，标题去掉"原创"等文章类型标签；数据库、总结、网站生成和关键词索引直接读取这些字段，不再逐条解析日期
+"""
+
+import calendar
+import re
+from datetime import datetime
+
+# 常见的CSDN日期格式，日期之后可以带时间
+DATE_PATTERNS = [
+    re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})'),  # 2025-09-15
+    re.compile(r'(\d{4})年(\d{1,2})月(\d{1,2})日'),  # 2025年9月15日
+    re.compile(r'(\d{1,2})-(\d{1,2})'),  # 09-15 (当年)
+    re.compile(r'(\d{1,2})月(\d{1,2})日'),  # 9月15日 (当年)
+]
+TIME_PATTERN = re.compile(r'\s*(\d{1,2}):(\d{2})(?::(\d{2}))?')
+
+# 文章类型标签：列表页上是标题前单独的元素，解析时已去掉；手工整理的数据中写作"原创 标题"、"【原创】标题"，
+# 标签后必须有分隔，"翻译工作流实践"这样以这些词开头的标题保持不变。旧版爬虫把标签和标题直接连在一起，
+# 旧记录（第一次规范化）开头的标签不论有没有分隔都去掉
+TITLE_LABELS = ('原创', '转载', '翻译')
+_LABELS = '|'.join(TITLE_LABELS)
+TITLE_LABEL_PATTERN = re.compile(rf'^(?:【(?:{_LABELS})】|(?:{_LABELS})(?:\s+|\s*[:：|｜-]\s*))')
+
+COUNT_FIELDS = ('read_count', 'like_count', 'comment_count')
+COUNT_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*([kKwW万]?)')
+COUNT_UNITS = {'': 1, 'k': 1000, 'K': 1000, 'w': 10000, 'W': 10000, '万': 10000}
+
+
+def parse_publish_date(date_str):
+    """解析各种格式的日期字符串（日期后的时间一并解析），无法解析返回None"""
+    if not date_str:
+        return None
+
+    current_year = datetime.now().year
+
+    for pattern in DATE_PATTERNS:
+        match = pattern.search(date_str)
+        if match:
+            try:
+                groups = match.groups()
+                if len(groups) == 3:  # 年月日
+                    year, month, day = map(int, groups)
+                else:  # 月日
+                    year = current_year
+                    month, day = map(int, groups)
+                published = datetime(year, month, day)
+            except ValueError:
+                continue
+
+            time_match = TIME_PATTERN.match(date_str, match.end())
+            if time_match:
+                hour, minute, second = (int(g or 0) for g in time_match.groups())
+                try:
+                    published = published.replace(hour=hour, minute=minute, second=second)
+                except ValueError:
+                    pass
+            return published
+
+    return None
+
+
+def parse_count(value):
+    """阅读量等统计数字转为整数：支持"1,234"、"1.2k"、"3.5w"/"3.5万"，无法解析为0"""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = COUNT_PATTERN.search(str(value or '').replace(',', ''))
+    if not match:
+        return 0
+    return int(float(match.group(1)) * COUNT_UNITS[match.group(2)])
+
+
+def clean_title(title, legacy=False):
+    """去掉标题前带分隔的"原创"/"转载"/"翻译"标签；legacy=True时（旧版爬虫的记录）开头紧连的标签也去掉"""
+    title = (title or '').strip()
+    if legacy:
+        for label in TITLE_LABELS:
+            if title.startswith(label) and title[len(label):].strip():
+                title = title[len(label):].strip()
+                break
+    return TITLE_LABEL_PATTERN.sub('', title, count=1).strip() or title
+
+
+def normalize_article(article, legacy=False):
+    """就地规范化文章记录并返回；publish_time保留页面上的原文
+
+    legacy=True表示旧的articles.json或数据库记录，标题来自旧版爬虫，开头的标签与标题连在一起
+    """
+    published = parse_publish_date(article.get('publish_time', ''))
+    article['title'] = clean_title(article.get('title'), legacy)
+    article['published'] = published.strftime('%Y-%m-%d %H:%M:%S') if published else None
+    # 发布时间按页面显示的本地时间记录，timestamp只用于排序和计算间隔
+    article['timestamp'] = calendar.timegm(published.timetuple()) if published else None
+    article['month'] = published.strftime('%Y-%m') if published else None
+    # 订阅源条目没有统计数据，不补0，与已保存的文章合并时沿用已有的值
+    for key in COUNT_FIELDS:
+        if key in article:
+            article[key] = parse_count(article[key])
+    return article
+
+
+def ensure_normalized(articles):
+    """规范化还没有规范化过的文章（旧的articles.json和数据库记录），已规范化的只检查一个字段"""
+    for article in articles:
+        if 'month' not in article:
+            normalize_article(article, legacy=True)
+    return articles
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+页面解析基准测试
+对比原来的整页 html.parser 解析和 lxml + SoupStrainer 快速解析，
+页面来源可以是保存的CSDN页面目录、HTTP缓存，或由fixtures.py生成的模拟页面
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from config import Config
+from fixtures import generate_articles, render_list_page, render_article_page
+from page_parser import parse_list_page, parse_article_page, FAST_PARSER
+
+
+def classify_page(html):
+    """根据标记判断是列表页还是文章页"""
+    if 'article-item-box' in html or 'blog-list-box' in html:
+        return 'list'
+    return 'article'
+
+
+def load_saved_pages(pattern):
+    """读取保存的页面文件"""
+    pages = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, 'rb') as f:
+            html = f.read().decode('utf-8', errors='replace')
+        if '<html' in html.lower():
+            pages.append((classify_page(html), html))
+    return pages
+
+
+def generate_pages(article_count):
+    """生成模拟页面"""
+    articles = generate_articles(article_count)
+    per_page = Config.ARTICLES_PER_PAGE
+
+    pages = []
+    for start in range(0, len(articles), per_page):
+        pages.append(('list', render_list_page(articles[start:start + per_page], seed=start)))
+    for article in articles:
+        pages.append(('article', render_article_page(article, seed=int(article['id']))))
+    return pages
+
+
+def extract_list(html, fast):
+    """解析列表页并提取每个文章项的文本"""
+    soup = parse_list_page(html, fast)
+    items = (
+        soup.find_all('div', class_='article-item-box') or
+        soup.find_all('div', class_='article-list') or
+        soup.find_all('article') or
+        soup.find_all('div', class_='blog-list-box')
+    )
+    return [item.get_text(' ', strip=True) for item in items]
+
+
+def extract_article(html, fast):
+    """解析文章页并提取正文文本"""
+    soup = parse_article_page(html, fast)
+    content_elem = (
+        soup.find('div', {'id': 'content_views'}) or
+        soup.find('div', class_='markdown_views') or
+        soup.find('div', class_='htmledit_views') or
+        soup.find('article') or
+        soup.find('div', class_='blog-content-box')
+    )
+    return content_elem.get_text(separator='\n', strip=True) if content_elem else ''
+
+
+def run(pages, fast, repeat):
+    """解析全部页面repeat次，返回(最佳耗时, 提取结果)"""
+    best = None
+    outputs = []
+    for _ in range(repeat):
+        outputs = []
+        start = time.perf_counter()
+        for kind, html in pages:
+            if kind == 'list':
+                outputs.append(extract_list(html, fast))
+            else:
+                outputs.append(extract_article(html, fast))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, outputs
+
+
+def _normalize(output):
+    if isinstance(output, list):
+        return [' '.join(text.split()) for text in output]
+    return ' '.join(output.split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="页面解析基准测试")
+    parser.add_argument('--pages', help='保存的页面文件通配符，如 "saved/*.html"')
+    parser.add_argument('--http-cache', action='store_true', help='使用HTTP缓存目录中的页面')
+    parser.add_argument('--articles', type=int, default=100, help='没有保存页面时生成的模拟文章数（默认100）')
+    parser.add_argument('--repeat', type=int, default=3, help='重复次数，取最好成绩（默认3）')
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = load_saved_pages(args.pages)
+    elif args.http_cache:
+        pages = load_saved_pages(os.path.join(Config.HTTP_CACHE_DIR, '*.body'))
+    else:
+        pages = generate_pages(args.articles)
+
+    if not pages:
+        print("没有找到可用的页面")
+        return 1
+
+    list_count = sum(1 for kind, _ in pages if kind == 'list')
+    total_mb = sum(len(html.encode('utf-8')) for _, html in pages) / 1024 / 1024
+    print(f"页面: {len(pages)} 个（列表页 {list_count}，文章页 {len(pages) - list_count}），共 {total_mb:.1f} MB")
+
+    full_time, full_outputs = run(pages, False, args.repeat)
+    fast_time, fast_outputs = run(pages, True, args.repeat)
+
+    mismatches = sum(
+        1 for a, b in zip(full_outputs, fast_outputs) if _normalize(a) != _normalize(b)
+    )
+
+    print(f"{'解析路径':<28}{'总耗时(s)':>10}{'毫秒/页':>10}{'页/秒':>10}")
+    for name, elapsed in [('html.parser 整页', full_time), (f'{FAST_PARSER} + SoupStrainer', fast_time)]:
+        print(f"{name:<28}{elapsed:>10.3f}{elapsed * 1000 / len(pages):>10.2f}{len(pages) / elapsed:>10.1f}")
+    print(f"提速: {full_time / fast_time:.1f}x")
+    print(f"提取结果不一致的页面: {mismatches}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
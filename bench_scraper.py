@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+爬虫吞吐量基准测试
+启动本地模拟CSDN服务器，分别用CSDNScraper和SmartCSDNScraper抓取全部列表页和文章内容，
+报告每秒文章数、请求延迟p50/p99和重试次数，结果离线可重复
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from config import Config
+from csdn_scraper import CSDNScraper
+from fetch_engine import AsyncFetchEngine
+from http_cache import HTTPCache
+from mock_server import MockCSDNServer
+from smart_scraper import SmartCSDNScraper
+from transport import HTTPTransport
+
+
+class RecordingTransport(HTTPTransport):
+    """记录每个请求的耗时"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+
+    def get(self, url, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().get(url, *args, **kwargs)
+        finally:
+            with self.lock:
+                self.latencies.append(time.perf_counter() - start)
+
+
+def percentile(values, p):
+    """最近秩百分位数"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def scrape_plain(scraper, max_pages):
+    articles = scraper.get_article_list(max_pages)
+    contents = scraper.get_article_contents([article['url'] for article in articles])
+    return articles, contents
+
+
+def scrape_smart(scraper, max_pages):
+    articles = scraper.get_article_list_smart(max_pages)
+    contents = scraper.get_article_contents_smart([article['url'] for article in articles])
+    return articles, contents
+
+
+SCRAPERS = {
+    'CSDNScraper': (CSDNScraper, scrape_plain),
+    'SmartCSDNScraper': (SmartCSDNScraper, scrape_smart)
+}
+
+
+def run(name, server, max_pages, verbose):
+    """用一个全新的引擎、连接池和空缓存跑一次完整抓取"""
+    scraper_class, scrape = SCRAPERS[name]
+    engine = AsyncFetchEngine()
+    transport = RecordingTransport()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scraper = scraper_class(engine=engine, cache=HTTPCache(cache_dir=cache_dir), transport=transport)
+        server.reset_stats()
+
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        start = time.perf_counter()
+        with output:
+            articles, contents = scrape(scraper, max_pages)
+        elapsed = time.perf_counter() - start
+
+    engine.close()
+    fetched = sum(1 for content in contents if content)
+    return {
+        'name': name,
+        'articles': len(articles),
+        'fetched': fetched,
+        'elapsed': elapsed,
+        'rate': fetched / elapsed if elapsed else 0.0,
+        'p50': percentile(transport.latencies, 50),
+        'p99': percentile(transport.latencies, 99),
+        'requests': len(transport.latencies),
+        'retries': server.retries()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="爬虫吞吐量基准测试（本地模拟服务器）")
+    parser.add_argument('--articles', type=int, default=100, help='模拟文章数（默认100）')
+    parser.add_argument('--latency', type=float, default=0.05, help='服务器基础响应延迟，秒（默认0.05）')
+    parser.add_argument('--jitter', type=float, default=0.05, help='随机附加延迟上限，秒（默认0.05）')
+    parser.add_argument('--error-521', type=float, default=0.0, help='返回521的概率')
+    parser.add_argument('--error-403', type=float, default=0.0, help='返回403的概率')
+    parser.add_argument('--paragraphs', type=int, nargs='+', help='正文段落数分布，如 3 5 40')
+    parser.add_argument('--rate', type=float, default=20.0,
+                        help='每秒请求数上限，同时用于主机限速、全局限速和AIMD上限（默认20）')
+    parser.add_argument('--scraper', choices=list(SCRAPERS), action='append', help='只测试指定爬虫，可重复')
+    parser.add_argument('--verbose', action='store_true', help='显示爬虫输出')
+    args = parser.parse_args()
+
+    server = MockCSDNServer(
+        article_count=args.articles, latency=args.latency, jitter=args.jitter,
+        error_521=args.error_521, error_403=args.error_403, paragraphs=args.paragraphs
+    ).start()
+
+    # 把CSDN地址和限速指向本地服务器
+    Config.CSDN_HOST = server.host
+    Config.CSDN_BASE_URL = server.base_url()
+    Config.RATE_LIMIT_PER_HOST = args.rate
+    Config.GLOBAL_RATE_LIMIT = args.rate
+    Config.PACING_MAX_RATE = args.rate
+
+    max_pages = -(-args.articles // Config.ARTICLES_PER_PAGE) + 1
+    print(f"模拟服务器 {server.host}：{args.articles} 篇文章，延迟 {args.latency}+{args.jitter}s，"
+          f"521 {args.error_521:.0%} / 403 {args.error_403:.0%}，限速 {args.rate} 次/秒")
+
+    results = [run(name, server, max_pages, args.verbose) for name in args.scraper or SCRAPERS]
+    server.stop()
+
+    print(f"{'爬虫':<20}{'文章':>6}{'正文':>6}{'耗时(s)':>10}{'篇/秒':>8}{'p50(ms)':>10}{'p99(ms)':>10}{'请求':>6}{'重试':>6}")
+    for r in results:
+        print(f"{r['name']:<20}{r['articles']:>6}{r['fetched']:>6}{r['elapsed']:>10.2f}{r['rate']:>8.1f}"
+              f"{r['p50'] * 1000:>10.0f}{r['p99'] * 1000:>10.0f}{r['requests']:>6}{r['retries']:>6}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+月度总结吞吐量基准测试
+启动本地LLM桩服务器，用模拟文章生成全部月度总结，报告总耗时、LLM请求数、请求延迟p50/p99、
+最大并发和token用量；可把请求录制到文件，再用回放模式在完全离线的情况下重复运行
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import tempfile
+import threading
+import time
+from ai_summarizer import AISummarizer
+from bench_scraper import percentile
+from config import Config
+from content_store import ContentStore
+from fixtures import generate_articles
+from llm_backend import CassetteBackend, LLMBackend, OpenAIBackend
+from llm_stub_server import LLMStubServer
+
+
+class RecordingBackend(LLMBackend):
+    """记录每次调用的耗时"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = 0
+
+    def complete(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.backend.complete(*args, **kwargs)
+        except Exception:
+            with self.lock:
+                self.errors += 1
+            raise
+        finally:
+            with self.lock:
+                self.latencies.append(time.perf_counter() - start)
+
+
+def make_articles(count, seed=0):
+    """模拟文章：打乱样例正文的句子，避免被近似重复检测合并"""
+    rng = random.Random(seed)
+    articles = generate_articles(count, seed=seed)
+    sentences = [s for article in articles[:20] for s in article['content'].split('。') if s.strip()]
+    for article in articles:
+        article['content'] = '。'.join(rng.sample(sentences, min(len(sentences), rng.randint(5, 40))))
+    return articles
+
+
+def run(articles, backend, verbose):
+    """用一个新的总结器和空的全文存储生成全部月度总结"""
+    recorder = RecordingBackend(backend)
+    with tempfile.TemporaryDirectory() as store_dir:
+        content_store = ContentStore(store_dir)
+        content_store.store_articles(articles)
+        summarizer = AISummarizer(content_store=content_store, backend=recorder)
+
+        output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        start = time.perf_counter()
+        with output:
+            summaries = summarizer.generate_all_monthly_summaries(articles)
+        elapsed = time.perf_counter() - start
+
+    return {
+        'months': len(summaries),
+        'elapsed': elapsed,
+        'calls': len(recorder.latencies),
+        'errors': recorder.errors,
+        'serial': sum(recorder.latencies),
+        'p50': percentile(recorder.latencies, 50),
+        'p99': percentile(recorder.latencies, 99)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="月度总结吞吐量基准测试（本地LLM桩服务器）")
+    parser.add_argument('--articles', type=int, default=200, help='模拟文章数（默认200，约12个月）')
+    parser.add_argument('--latency', type=float, default=0.5, help='LLM基础响应延迟，秒（默认0.5）')
+    parser.add_argument('--jitter', type=float, default=0.2, help='随机附加延迟上限，秒（默认0.2）')
+    parser.add_argument('--per-token', type=float, default=0.0, help='每个输出token的附加延迟，秒')
+    parser.add_argument('--error-429', type=float, default=0.0, help='返回429的概率')
+    parser.add_argument('--error-500', type=float, default=0.0, help='返回500的概率')
+    parser.add_argument('--concurrency', type=int, nargs='+', help='要对比的并发数，如 1 4 8（默认为配置值）')
+    parser.add_argument('--record', help='把LLM请求录制到该文件')
+    parser.add_argument('--replay', help='只回放该录制文件，不启动桩服务器')
+    parser.add_argument('--verbose', action='store_true', help='显示总结器输出')
+    args = parser.parse_args()
+
+    articles = make_articles(args.articles)
+    Config.SUMMARY_RETRY_BASE_DELAY = 0.1
+
+    server = None
+    if args.replay:
+        backend = CassetteBackend(args.replay)
+        print(f"回放录制文件 {args.replay}：{len(backend.entries)} 条响应")
+    else:
+        server = LLMStubServer(
+            latency=args.latency, jitter=args.jitter, per_token=args.per_token,
+            error_429=args.error_429, error_500=args.error_500
+        ).start()
+        backend = OpenAIBackend(base_url=server.base_url(), max_connections=max(args.concurrency or [16]))
+        if args.record:
+            backend = CassetteBackend(args.record, backend, mode='record')
+        print(f"LLM桩服务器 {server.base_url()}：延迟 {args.latency}+{args.jitter}s，"
+              f"429 {args.error_429:.0%} / 500 {args.error_500:.0%}")
+
+    results = []
+    for concurrency in args.concurrency or [Config.SUMMARY_CONCURRENCY]:
+        Config.SUMMARY_CONCURRENCY = concurrency
+        if server:
+            server.reset_stats()
+        result = run(articles, backend, args.verbose)
+        result['concurrency'] = concurrency
+        result['max_in_flight'] = server.max_in_flight if server else 0
+        result['tokens'] = server.prompt_tokens + server.completion_tokens if server else 0
+        results.append(result)
+
+    if server:
+        server.stop()
+
+    print(f"{'并发':>4}{'月份':>6}{'请求':>6}{'失败':>6}{'耗时(s)':>10}{'串行(s)':>10}{'加速比':>8}"
+          f"{'p50(ms)':>10}{'p99(ms)':>10}{'最大并发':>8}{'token':>10}")
+    for r in results:
+        speedup = r['serial'] / r['elapsed'] if r['elapsed'] else 0.0
+        print(f"{r['concurrency']:>4}{r['months']:>6}{r['calls']:>6}{r['errors']:>6}{r['elapsed']:>10.2f}"
+              f"{r['serial']:>10.2f}{speedup:>8.1f}{r['p50'] * 1000:>10.0f}{r['p99'] * 1000:>10.0f}"
+              f"{r['max_in_flight']:>8}{r['tokens']:>10}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,10 +6,30 @@ load_dotenv()
 class Config:
     # CSDN博客配置
     CSDN_USER_ID = "2301_80171004"
-    CSDN_BASE_URL = f"https://blog.csdn.net/{CSDN_USER_ID}"
+    CSDN_HOST = "https://blog.csdn.net"
+    CSDN_BASE_URL = f"{CSDN_HOST}/{CSDN_USER_ID}"
+    
+    # 多作者模式下每个作者的数据和网站输出目录
+    AUTHORS_DIR = "authors"
     
     # OpenAI配置
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
+    # OpenAI兼容服务的地址（自建推理服务或 llm_stub_server.py，如 http://127.0.0.1:8001/v1），为空使用官方地址
+    OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL', '')
+    # LLM请求录制文件：record模式调用后端并录制响应，replay模式只回放（不需要密钥和网络）
+    LLM_CASSETTE = os.getenv('LLM_CASSETTE', '')
+    LLM_CASSETTE_MODE = os.getenv('LLM_CASSETTE_MODE', 'replay')
+    SUMMARY_MODEL = "gpt-3.5-turbo"  # 生成月度总结的模型，也是总结缓存键的一部分
+    SUMMARY_CONCURRENCY = 4  # 同时进行的月度总结LLM请求数
+    SUMMARY_TIMEOUT = 60  # 单次LLM请求超时（秒）
+    SUMMARY_DEADLINE = 180  # 单个月份总结（含重试）的最长耗时（秒），超过即退回统计总结
+    SUMMARY_RETRIES = 3  # 超时、限流等临时错误的重试次数
+    SUMMARY_RETRY_BASE_DELAY = 1.0  # 重试等待的基数（秒），按指数退避并随机抖动
+    SUMMARY_PROMPT_TOKENS = 3000  # 一个提示词中文章内容的token预算，按文章热度分配
+    SUMMARY_ARTICLE_MIN_TOKENS = 80  # 每篇文章至少占用的token数，放不下时分组map-reduce
+    SUMMARY_MAP_TOKENS = 600  # map阶段每组要点的最大输出token数
+    SUMMARY_MAX_TOKENS = 2000  # 月度总结的最大输出token数
+    SUMMARY_ROLLUPS = True  # 由月度总结生成季度和年度总结，显示在总结页
     
     # 输出目录配置
     OUTPUT_DIR = "portfolio"
@@ -27,3 +47,67 @@ class Config:
     
     # 每页文章数
     ARTICLES_PER_PAGE = 20
+    
+    # 作者RSS订阅源路径（相对博客主页），增量爬取时优先读取
+    FEED_PATH = "/rss/list"
+    
+    # 抓取引擎配置
+    FETCH_CONCURRENCY = 4  # 最大并发请求数
+    RATE_LIMIT_PER_HOST = 1 / REQUEST_DELAY  # 每个主机初始每秒请求数（令牌桶速率，之后由AIMD调节）
+    RATE_LIMIT_BURST = 2  # 令牌桶容量，允许的突发请求数
+    GLOBAL_RATE_LIMIT = 1.0  # 所有主机、所有作者合计每秒请求数
+    
+    # 自适应限速（AIMD）：响应正常时加性提速，出错或变慢时乘性降速
+    PACING_MIN_RATE = 0.05  # 每个主机最低每秒请求数
+    PACING_MAX_RATE = 1.0  # 每个主机每秒请求数上限，任何情况下都不会超过
+    PACING_INCREASE = 0.05  # 每次正常响应增加的速率
+    PACING_DECREASE = 0.5  # 出错或变慢时速率乘以该系数
+    PACING_SLOW_LATENCY = 5.0  # 响应耗时超过该秒数视为变慢
+    PACING_LATENCY_FACTOR = 2.0  # 响应耗时超过近期平均值的倍数视为变慢
+    PACING_WINDOW = 50  # 统计错误率的最近请求数
+    
+    # HTTP传输层（两个爬虫共享的连接池）
+    HTTP_POOL_SIZE = FETCH_CONCURRENCY  # 每个主机保持的keep-alive连接数
+    HTTP_POOL_HOSTS = 10  # 缓存连接池的主机数
+    HTTP_RETRIES = 2  # 连接/读取错误的重试次数（状态码错误由自适应限速处理）
+    HTTP_TIMEOUT = 20  # 默认请求超时（秒）
+    
+    # HTTP响应缓存目录（条件请求 + 离线回放）
+    HTTP_CACHE_DIR = "http_cache"
+    
+    # 文章全文存储（gzip压缩，按文章ID寻址），记录中只保留摘录
+    CONTENT_STORE_DIR = "content_store"
+    CONTENT_EXCERPT_LENGTH = 200  # 页面展示用的摘录长度
+    
+    # 正文抓取预算：按优先级（发布时间、热度、陈旧程度）在预算内获取正文，None表示不限
+    CONTENT_FETCH_BUDGET = 30  # 每次爬取最多发出的正文请求数
+    CONTENT_FETCH_TIME_BUDGET = 300  # 正文抓取最长耗时（秒）
+    CONTENT_BACKFILL_BUDGET = 0  # 增量爬取时额外补齐缺少或过旧正文的篇数，0表示只抓新增或变化的文章
+    CONTENT_RECENCY_HALF_LIFE = 90  # 发布时间权重的半衰期（天）
+    CONTENT_REFRESH_DAYS = 30  # 已存正文超过该天数视为过旧，预算有余时重新抓取
+    
+    # 文章和月度总结数据库（SQLite），多作者共用，按作者区分
+    DATABASE_FILE = "portfolio.db"
+    EXPORT_JSON = True  # 保存时同时导出articles.json和monthly_summaries.json
+    
+    # 关键词索引（TF-IDF）：中文字符n-gram + 英文单词，文档频率保存在数据库中增量更新
+    TERM_NGRAMS = (2, 4)  # 中文n-gram的长度范围
+    TERM_MIN_DF = 2  # 至少出现在该篇数的文章中才作为关键词
+    TERM_MAX_DF = 0.5  # 出现在超过该比例的文章中的词视为模板文字，不作为关键词
+    TERM_TRENDING = 5  # 每月热词数
+    
+    # 近似重复检测：SimHash指纹汉明距离不超过该值的正文视为重复
+    SIMHASH_MAX_DISTANCE = 3
+    
+    # 抓取日志文件（断点续传）
+    JOURNAL_FILE = "scrape_journal.jsonl"
+    
+    # 流水线各阶段之间队列的容量
+    PIPELINE_QUEUE_SIZE = 8
+    
+    @classmethod
+    def base_url_for(cls, user_id=None):
+        """获取指定作者的博客主页地址"""
+        if not user_id:
+            return cls.CSDN_BASE_URL
+        return f"{cls.CSDN_HOST}/{user_id}"
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+文章内容抓取调度 - 在请求数/时间预算内按优先级获取正文
+优先级由发布时间（越新越高）、热度（阅读量和点赞数）和陈旧程度（没有正文、标题或时间有变化、
+已存正文过旧）决定；全文存储中已有且未过期的正文直接复用，不发请求
+"""
+
+import heapq
+import math
+import time
+from article_db import article_keys, article_score
+from article_schema import ensure_normalized
+from config import Config
+
+
+class ContentScheduler:
+    def __init__(self, content_store, max_requests=None, time_budget=None, batch_size=None, backfill_budget=None):
+        """max_requests/time_budget为本次最多发出的正文请求数和耗时（秒），None表示不限
+
+        backfill_budget: 设置时预算优先用于changed_urls中的文章，其余缺少正文或正文过旧的文章最多抓取这么多篇
+        （增量爬取使用，没有变化时不发正文请求）；None表示所有文章按优先级共用max_requests
+        """
+        self.config = Config()
+        self.content_store = content_store
+        self.max_requests = self.config.CONTENT_FETCH_BUDGET if max_requests is None else max_requests
+        self.backfill_budget = backfill_budget
+        self.time_budget = self.config.CONTENT_FETCH_TIME_BUDGET if time_budget is None else time_budget
+        self.batch_size = batch_size or self.config.FETCH_CONCURRENCY
+        self.half_life = self.config.CONTENT_RECENCY_HALF_LIFE
+        self.refresh_age = self.config.CONTENT_REFRESH_DAYS * 86400
+
+        self.reused = 0
+        self.fetched = 0
+        self.failed = 0
+        self.skipped = 0
+        self.pending = set()  # 预算内尚未抓取的文章URL
+
+    def staleness(self, article, changed=False, key=None):
+        """0表示已存正文可直接使用；没有正文或内容有变化为1；已存正文过旧为0.5"""
+        if changed:
+            return 1.0
+        stored_at = self.content_store.stored_at(article, key)
+        if stored_at is None:
+            return 1.0
+        if time.time() - stored_at > self.refresh_age:
+            return 0.5
+        return 0.0
+
+    def recency(self, published, newest):
+        """相对最新一篇按发布时间（timestamp，秒）指数衰减，半衰期为CONTENT_RECENCY_HALF_LIFE天；日期未知视为很旧"""
+        if published is None:
+            return 0.0
+        age_days = max(0, (newest - published) // 86400)
+        return 0.5 ** (age_days / self.half_life)
+
+    def plan(self, articles, changed_urls=()):
+        """复用已存正文，返回需要抓取的(文章键, 文章)，按优先级从高到低排列"""
+        articles = ensure_normalized(articles)
+        candidates = []
+        for key, article in zip(article_keys(articles), articles):
+            staleness = self.staleness(article, article['url'] in changed_urls, key)
+            if staleness == 0:
+                self.content_store.reuse(article, key)
+                self.reused += 1
+            else:
+                candidates.append((staleness, key, article))
+
+        # 发布时间以本批最新一篇为基准，长期停更的作者也能区分新旧；
+        # 热度取对数后按本批最大值归一化，避免一篇爆款压过所有新文章
+        dates = [article['timestamp'] for _, _, article in candidates]
+        newest = max((d for d in dates if d is not None), default=None)
+        top_score = max((math.log1p(article_score(a)) for _, _, a in candidates), default=0) or 1
+        heap = []
+        for position, ((staleness, key, article), published) in enumerate(zip(candidates, dates)):
+            popularity = math.log1p(article_score(article)) / top_score
+            priority = staleness * (self.recency(published, newest) + popularity)
+            heap.append((-priority, position, key, article))
+        heapq.heapify(heap)
+        return [heapq.heappop(heap)[2:] for _ in range(len(heap))]
+
+    def run(self, articles, fetch, changed_urls=()):
+        """在预算内按优先级抓取正文并存入全文存储，每完成一批产出这一批文章
+
+        fetch(urls)返回与urls顺序一致的正文列表（失败为空字符串）
+        """
+        queue = self.plan(articles, changed_urls)
+        budget = len(queue)
+        if self.backfill_budget is not None:
+            # 新增或变化的文章排在前面，补齐正文的文章只取优先级最高的backfill_budget篇
+            changed = [entry for entry in queue if entry[1]['url'] in changed_urls]
+            backfill = [entry for entry in queue if entry[1]['url'] not in changed_urls]
+            queue = changed + backfill
+            budget = len(changed) + min(len(backfill), self.backfill_budget)
+        if self.max_requests is not None:
+            budget = min(budget, self.max_requests)
+        deadline = None if self.time_budget is None else time.monotonic() + self.time_budget
+
+        self.pending = {article['url'] for _, article in queue[:budget]}
+        done = 0
+        while done < budget:
+            if deadline is not None and time.monotonic() >= deadline:
+                print(f"正文抓取已用完{self.time_budget}秒时间预算")
+                break
+
+            batch = queue[done:min(done + self.batch_size, budget)]
+            done += len(batch)
+            contents = fetch([article['url'] for _, article in batch])
+            for (key, article), content in zip(batch, contents):
+                self.pending.discard(article['url'])
+                if content:
+                    self.content_store.attach(article, content, key)
+                    self.fetched += 1
+                else:
+                    self.failed += 1
+                    self._keep_stored(article, key)
+            yield [article for _, article in batch]
+
+        # 超出预算的文章如果有过旧的正文，仍然沿用
+        for key, article in queue[done:]:
+            self._keep_stored(article, key)
+        self.pending.clear()
+        self.skipped += len(queue) - done
+
+    def _keep_stored(self, article, key):
+        if self.content_store.stored_at(article, key) is not None:
+            self.content_store.reuse(article, key)
+
+    def fetch_all(self, articles, fetch, changed_urls=()):
+        """run的非流式版本"""
+        for _ in self.run(articles, fetch, changed_urls):
+            pass
+        return articles
+
+    def summary(self):
+        """调度统计"""
+        return (f"正文抓取: 复用已存正文 {self.reused} 篇，抓取 {self.fetched} 篇，"
+                f"失败 {self.failed} 篇，超出预算未抓取 {self.skipped} 篇")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+文章全文存储 - 按文章ID寻址，gzip压缩保存在磁盘上；文章ID由文章键（article_db.article_keys）决定，url重复的记录各存一份
+文章记录里只保留content_id、正文哈希和用于页面展示的摘录，总结和关键词提取需要全文时再按需读取
+"""
+
+import gzip
+import hashlib
+import os
+import re
+import threading
+from config import Config
+from dedup import content_hash
+from article_db import article_keys
+from article_schema import ensure_normalized
+
+ARTICLE_ID_PATTERN = re.compile(r'/article/details/(\d+)(?:[/?]|$)')
+
+
+def article_id(url):
+    """从文章URL中取出CSDN文章ID，取不到时（包括带#后缀的文章键）用哈希"""
+    match = ARTICLE_ID_PATTERN.search(url or '')
+    if match:
+        return match.group(1)
+    return hashlib.sha1((url or '').encode('utf-8')).hexdigest()[:16]
+
+
+class ContentHandle:
+    """全文的惰性句柄，调用read()时才从磁盘解压读取"""
+
+    def __init__(self, store, content_id):
+        self.store = store
+        self.content_id = content_id
+
+    def read(self):
+        return self.store.get(self.content_id)
+
+
+class ContentStore:
+    def __init__(self, store_dir=None):
+        self.config = Config()
+        self.store_dir = store_dir or self.config.CONTENT_STORE_DIR
+        self.excerpt_length = self.config.CONTENT_EXCERPT_LENGTH
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    def _path(self, content_id):
+        return os.path.join(self.store_dir, f"{content_id}.txt.gz")
+
+    def put(self, key, text):
+        """按文章键保存全文，返回content_id"""
+        content_id = article_id(key)
+        path = self._path(content_id)
+
+        # 先写临时文件再替换，避免中断时留下半个文件
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        return content_id
+
+    def get(self, content_id):
+        """读取全文，不存在返回空字符串"""
+        try:
+            with gzip.open(self._path(content_id), 'rt', encoding='utf-8') as f:
+                return f.read()
+        except (OSError, EOFError):
+            return ""
+
+    @staticmethod
+    def content_id(article, key=None):
+        """文章全文的ID：给出文章键时由键决定，否则沿用记录里的content_id或由url计算"""
+        if key is not None:
+            return article_id(key)
+        return article.get('content_id') or article_id(article.get('url'))
+
+    def stored_at(self, article, key=None):
+        """文章全文的保存时间（Unix时间），没有保存过返回None"""
+        content_id = self.content_id(article, key)
+        try:
+            return os.path.getmtime(self._path(content_id))
+        except OSError:
+            return None
+
+    def reuse(self, article, key=None):
+        """文章记录没有（或不是这个键的）全文句柄、但全文存储中已有时，直接关联已存的全文"""
+        content_id = self.content_id(article, key)
+        if article.get('content_id') != content_id:
+            text = self.get(content_id)
+            article['content_id'] = content_id
+            article['content'] = text[:self.excerpt_length]
+            article['content_hash'] = content_hash(text)
+        return article
+
+    def handle(self, article):
+        """文章全文的惰性句柄，文章没有存储全文时返回None"""
+        content_id = article.get('content_id')
+        return ContentHandle(self, content_id) if content_id else None
+
+    def attach(self, article, text, key=None):
+        """保存文章全文，记录里只留content_id、正文哈希和摘录；key为文章键，默认为url"""
+        article['content_id'] = self.put(article['url'] if key is None else key, text)
+        article['content'] = text[:self.excerpt_length]
+        article['content_hash'] = content_hash(text)
+        return article
+
+    def store_articles(self, articles):
+        """把记录里还是全文的文章转存到全文存储，返回转存的篇数"""
+        stored = 0
+        for key, article in zip(article_keys(ensure_normalized(articles)), articles):
+            if article.get('content') and not article.get('content_id'):
+                self.attach(article, article['content'], key)
+                stored += 1
+        return stored
+
+    def text_hash(self, article):
+        """正文哈希，保存正文时已算好；旧记录没有时读取全文计算一次并记在记录里"""
+        if not article.get('content_hash'):
+            article['content_hash'] = content_hash(self.full_text(article))
+        return article['content_hash']
+
+    def hash_articles(self, articles):
+        """给还没有正文哈希的旧记录补上，返回补上的篇数"""
+        missing = [article for article in articles if not article.get('content_hash')]
+        for article in missing:
+            self.text_hash(article)
+        return len(missing)
+
+    def full_text(self, article):
+        """读取文章全文；旧数据没有content_id时使用记录里的内容"""
+        handle = self.handle(article)
+        if handle is not None:
+            text = handle.read()
+            if text:
+                return text
+        return article.get('content', '')
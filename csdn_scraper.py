@@ -1,19 +1,20 @@
 import requests
-from bs4 import BeautifulSoup
-import time
 import json
 import re
 from datetime import datetime
 from urllib.parse import urljoin
-from config import Config
+from http_cache import CacheMissError
+from scraper_base import ScraperBase
+from page_parser import parse_list_page, parse_article_page, title_text
+from dedup import Deduplicator, canonical_url
+from article_schema import clean_title, ensure_normalized, normalize_article
 
-class CSDNScraper:
-    def __init__(self):
-        self.config = Config()
-        self.session = requests.Session()
+class CSDNScraper(ScraperBase):
+    def __init__(self, engine=None, cache=None, user_id=None, transport=None):
+        super().__init__(engine, cache, user_id, transport)
         
-        # 更完善的请求头，模拟真实浏览器
-        headers = {
+        # 更完善的请求头，模拟真实浏览器（随每个请求发送，不修改共享会话）
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
@@ -29,104 +30,120 @@ class CSDNScraper:
             'sec-ch-ua-mobile': '?0',
             'sec-ch-ua-platform': '"Windows"'
         }
-        self.session.headers.update(headers)
         
-        # 设置超时和重试
-        from requests.adapters import HTTPAdapter
-        from urllib3.util.retry import Retry
+    def get_article_list(self, max_pages=None, known_urls=None):
+        """获取所有文章列表（按并发窗口批量抓取列表页）
         
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=2,
-            status_forcelist=[429, 500, 502, 503, 504, 521, 522, 524]
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-        
-    def get_article_list(self, max_pages=None):
-        """获取所有文章列表"""
+        传入known_urls时为增量模式：遇到已保存的文章所在页即停止翻页
+        """
         articles = []
+        for page_articles in self.iter_article_pages(max_pages, known_urls):
+            articles.extend(page_articles)
+        return articles
+    
+    def iter_article_pages(self, max_pages=None, known_urls=None):
+        """逐页产出文章列表，供流水线边抓取边处理"""
         page = 1
+        # 增量模式先只抓第1页：新文章通常不满一页，第1页就遇到已保存的文章时不再多抓一个窗口
+        window = 1 if known_urls else self.engine.concurrency
         
         while True:
-            print(f"正在爬取第{page}页...")
+            last_page = page + window - 1
+            if max_pages:
+                last_page = min(last_page, max_pages)
+            pages = list(range(page, last_page + 1))
             
-            # 构建文章列表URL
-            url = f"{self.config.CSDN_BASE_URL}/article/list/{page}"
+            print(f"正在爬取第{page}-{last_page}页...")
+            urls = [f"{self.base_url}/article/list/{p}" for p in pages]
+            results = self._map('page', self._fetch_list_page, urls)
             
-            try:
-                # 添加随机延迟，模拟人类行为
-                import random
-                delay = random.uniform(1, 3)
-                time.sleep(delay)
-                
-                response = self.session.get(url, timeout=15)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 查找文章列表 - 尝试多种可能的选择器
-                article_items = (
-                    soup.find_all('div', class_='article-item-box') or
-                    soup.find_all('div', class_='article-list') or 
-                    soup.find_all('article') or
-                    soup.find_all('div', class_='blog-list-box')
-                )
+            stop = False
+            for current_page, page_articles in zip(pages, results):
+                if page_articles is None:
+                    print(f"爬取第{current_page}页失败")
+                    # 前3页出错就停止，之后的页面跳过继续
+                    if current_page < 3:
+                        stop = True
+                        break
+                    continue
                 
-                if not article_items:
-                    print(f"第{page}页没有找到文章，可能遇到反爬限制或页面结构变化")
-                    print(f"页面内容预览: {response.text[:200]}...")
+                if not page_articles:
+                    print(f"第{current_page}页没有找到文章，可能遇到反爬限制或页面结构变化")
+                    stop = True
                     break
                 
-                for item in article_items:
-                    article_info = self._extract_article_info(item)
-                    if article_info:
-                        articles.append(article_info)
-                
-                print(f"第{page}页获取到{len(article_items)}篇文章")
+                print(f"第{current_page}页获取到{len(page_articles)}篇文章")
+                yield page_articles
                 
-                # 检查是否达到最大页数
-                if max_pages and page >= max_pages:
+                if known_urls and any(a['url'] in known_urls for a in page_articles):
+                    print(f"第{current_page}页遇到已保存的文章，停止翻页")
+                    stop = True
                     break
-                
-                page += 1
-                
-                # 增加页面间延迟
-                time.sleep(self.config.REQUEST_DELAY + random.uniform(1, 2))
-                
+            
+            # 检查是否达到最大页数
+            if stop or (max_pages and last_page >= max_pages):
+                break
+            
+            page = last_page + 1
+            window = self.engine.concurrency
+    
+    def _fetch_list_page(self, url, max_retries=3):
+        """抓取并解析单个列表页，返回文章列表；请求失败返回None"""
+        for attempt in range(max_retries):
+            try:
+                response = self._get(url, timeout=15)
+                response.raise_for_status()
             except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 521:
-                    print(f"遇到521错误，等待{self.config.REQUEST_DELAY * 2}秒后重试...")
-                    time.sleep(self.config.REQUEST_DELAY * 2)
+                if e.response.status_code == 521 and attempt < max_retries - 1:
+                    print(f"遇到521错误，等待{self._retry_wait(url):.1f}秒后重试...")
                     continue
-                else:
-                    print(f"HTTP错误 {e.response.status_code}: {e}")
-                    break
+                print(f"HTTP错误 {e.response.status_code}: {e}")
+                return None
             except Exception as e:
-                print(f"爬取第{page}页时出错: {e}")
-                # 尝试继续下一页
-                if page < 3:  # 前3页出错就停止
-                    break
-                else:
-                    page += 1
-                    continue
+                print(f"请求 {url} 时出错: {e}")
+                return None
+            
+            # 只解析文章列表容器
+            soup = parse_list_page(response.text)
+            
+            # 查找文章列表 - 尝试多种可能的选择器
+            article_items = (
+                soup.find_all('div', class_='article-item-box') or
+                soup.find_all('div', class_='article-list') or 
+                soup.find_all('article') or
+                soup.find_all('div', class_='blog-list-box')
+            )
+            
+            if not article_items:
+                print(f"页面内容预览: {response.text[:200]}...")
+                return []
+            
+            articles = []
+            for item in article_items:
+                article_info = self._extract_article_info(item)
+                if article_info:
+                    articles.append(article_info)
+            return articles
         
-        return articles
+        return None
     
     def _extract_article_info(self, item):
         """从文章项中提取信息"""
         try:
-            # 文章标题和链接
-            title_elem = item.find('h4', class_='') or item.find('a')
+            # 文章标题和链接（链接在h4内部的a标签上）
+            title_elem = item.find('h4') or item.find('a')
             if not title_elem:
                 return None
                 
-            title = title_elem.get_text(strip=True)
-            article_url = title_elem.get('href', '')
+            title = title_text(title_elem)
+            link_elem = title_elem if title_elem.name == 'a' else title_elem.find('a')
+            article_url = link_elem.get('href', '') if link_elem else ''
+            if not article_url:
+                return None
             
             if not article_url.startswith('http'):
-                article_url = urljoin(self.config.CSDN_BASE_URL, article_url)
+                article_url = urljoin(self.base_url, article_url)
+            article_url = canonical_url(article_url)
             
             # 发布时间
             time_elem = item.find('span', class_='date')
@@ -135,7 +152,7 @@ class CSDNScraper:
             # 阅读量、点赞数、评论数
             stats = self._extract_stats(item)
             
-            return {
+            return normalize_article({
                 'title': title,
                 'url': article_url,
                 'publish_time': publish_time,
@@ -143,7 +160,7 @@ class CSDNScraper:
                 'like_count': stats.get('like_count', 0),
                 'comment_count': stats.get('comment_count', 0),
                 'content': ''  # 稍后获取
-            }
+            })
             
         except Exception as e:
             print(f"提取文章信息时出错: {e}")
@@ -172,29 +189,34 @@ class CSDNScraper:
     
     def get_article_content(self, article_url):
         """获取文章详细内容"""
+        return self.get_article_contents([article_url])[0]
+    
+    def get_article_contents(self, article_urls):
+        """并发获取多篇文章内容，结果顺序与article_urls一致"""
+        results = self._map('content', self._fetch_article_content, article_urls)
+        return [content or "" for content in results]
+    
+    def _fetch_article_content(self, article_url):
+        """抓取单篇文章内容"""
         max_retries = 3
         
         for attempt in range(max_retries):
             try:
                 print(f"正在获取文章内容: {article_url} (尝试 {attempt + 1}/{max_retries})")
                 
-                # 添加随机延迟
-                import random
-                time.sleep(random.uniform(2, 4))
-                
                 # 添加Referer头，模拟从列表页点击进入
-                headers = {'Referer': self.config.CSDN_BASE_URL}
-                response = self.session.get(article_url, timeout=20, headers=headers)
+                headers = {'Referer': self.base_url}
+                response = self._get(article_url, timeout=20, headers=headers)
                 
                 # 检查响应状态
                 if response.status_code == 521:
-                    print(f"遇到521错误，等待{5 + attempt * 2}秒后重试...")
-                    time.sleep(5 + attempt * 2)
+                    print(f"遇到521错误，等待{self._retry_wait(article_url):.1f}秒后重试...")
                     continue
                 
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                # 只解析正文容器
+                soup = parse_article_page(response.text)
                 
                 # 查找文章内容 - 尝试多种选择器
                 content_elem = (
@@ -207,20 +229,20 @@ class CSDNScraper:
                 
                 if content_elem:
                     # 清理HTML标签，保留文本内容
-                    content = content_elem.get_text(separator='\n', strip=True)
-                    # 限制内容长度，避免过长
-                    if len(content) > 2000:
-                        content = content[:2000] + "..."
-                    return content
+                    # 返回完整正文，由ContentStore压缩保存
+                    return content_elem.get_text(separator='\n', strip=True)
                 else:
                     print(f"无法找到文章内容: {article_url}")
                     return ""
                     
+            except CacheMissError as e:
+                print(e)
+                break
             except requests.exceptions.HTTPError as e:
                 if e.response and e.response.status_code == 521:
                     print(f"521错误，尝试 {attempt + 1}/{max_retries}")
                     if attempt < max_retries - 1:
-                        time.sleep(5 + attempt * 3)
+                        self._retry_wait(article_url)
                         continue
                 else:
                     print(f"HTTP错误: {e}")
@@ -228,7 +250,7 @@ class CSDNScraper:
             except Exception as e:
                 print(f"获取文章内容时出错: {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(2)
+                    self._retry_wait(article_url)
                     continue
                 break
         
@@ -238,20 +260,69 @@ class CSDNScraper:
         """爬取所有文章（包括内容）"""
         print("开始爬取CSDN博客文章...")
         
-        # 获取文章列表
-        articles = self.get_article_list(max_pages)
+        # 获取文章列表，合并重复条目后再获取内容
+        dedup = Deduplicator()
+        articles = dedup.dedupe_by_url(self.get_article_list(max_pages))
         print(f"共找到{len(articles)}篇文章")
+        print(dedup.summary())
         
         if include_content:
-            # 获取每篇文章的详细内容
-            for i, article in enumerate(articles, 1):
-                print(f"正在获取第{i}/{len(articles)}篇文章内容...")
-                content = self.get_article_content(article['url'])
+            # 并发获取每篇文章的详细内容，由抓取引擎统一限速
+            print(f"正在获取{len(articles)}篇文章内容...")
+            contents = self.get_article_contents([article['url'] for article in articles])
+            for article, content in zip(articles, contents):
                 article['content'] = content
-                time.sleep(self.config.REQUEST_DELAY)
         
         return articles
     
+    def article_changed(self, old_article, new_article):
+        """判断列表页上的文章相对已保存的版本是否为新增或有变化"""
+        if old_article is None:
+            return True
+        # 列表页标题前的"原创"等文章类型标签解析时已去掉，与订阅源标题一致；
+        # 发布时间比较解析后的值，列表页和订阅源的写法不同也不会误判
+        return (
+            clean_title(old_article.get('title')) != new_article.get('title') or
+            old_article.get('published') != new_article.get('published')
+        )
+    
+    def merge_articles(self, existing, fresh):
+        """以URL为键合并新抓取的文章和已有数据，新数据在前
+        
+        每篇新文章只替换已有数据中同一URL的第一条记录，URL重复的其他记录保留，合并后不会少于已有的篇数
+        """
+        existing_by_url = {}
+        for article in existing:
+            existing_by_url.setdefault(article['url'], article)
+        
+        merged = []
+        replaced = set()
+        for article in fresh:
+            old_article = existing_by_url.get(article['url'])
+            if old_article:
+                replaced.add(id(old_article))
+                # 没有重新获取内容的文章沿用已保存的内容
+                if not article.get('content'):
+                    article['content'] = old_article.get('content', '')
+                    if old_article.get('content_id'):
+                        article['content_id'] = old_article['content_id']
+                # 订阅源中的文章没有阅读量等统计数据，沿用已保存的值
+                for key, value in old_article.items():
+                    article.setdefault(key, value)
+            merged.append(article)
+        
+        merged.extend(article for article in existing if id(article) not in replaced)
+        
+        return merged
+    
+    def load_articles_from_json(self, filename="articles.json"):
+        """从JSON文件加载文章，文件不存在返回空列表"""
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                return ensure_normalized(json.load(f))
+        except FileNotFoundError:
+            return []
+    
     def save_articles_to_json(self, articles, filename="articles.json"):
         """保存文章到JSON文件"""
         with open(filename, 'w', encoding='utf-8') as f:
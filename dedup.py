@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+去重 - URL规范化、精确哈希和SimHash近似重复检测
+在获取文章内容之前按规范化URL合并重复条目，在生成月度总结之前剔除正文相同或几乎相同的文章，
+节省的请求数和LLM token与重复率成正比
+"""
+
+import hashlib
+import re
+from collections import Counter
+from urllib.parse import urlsplit, urlunsplit
+from config import Config
+
+# CSDN文章的几种等价地址：移动版、http、带查询参数或锚点
+CSDN_MOBILE_HOSTS = {'m.blog.csdn.net': 'blog.csdn.net', 'wap.blog.csdn.net': 'blog.csdn.net'}
+WHITESPACE = re.compile(r'\s+')
+
+
+def canonical_url(url):
+    """规范化文章URL：统一协议和主机大小写，去掉查询参数、锚点和末尾斜杠"""
+    if not url:
+        return url
+
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    host = CSDN_MOBILE_HOSTS.get(host, host)
+    scheme = 'https' if host.endswith('csdn.net') else parts.scheme.lower()
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((scheme, host, path, '', ''))
+
+
+def normalize_text(text):
+    """合并空白，用于精确哈希和指纹"""
+    return WHITESPACE.sub(' ', text or '').strip()
+
+
+def content_hash(text):
+    """正文的精确哈希"""
+    return hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+def _features(text, size=3):
+    """字符n-gram特征，中英文都适用"""
+    text = normalize_text(text).lower()
+    if len(text) <= size:
+        return [text] if text else []
+    return [text[i:i + size] for i in range(len(text) - size + 1)]
+
+
+def simhash(text, bits=64):
+    """SimHash指纹：相似的文本指纹之间的汉明距离小"""
+    weights = [0] * bits
+    for feature, count in Counter(_features(text)).items():
+        h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=bits // 8).digest(), 'big')
+        for i in range(bits):
+            weights[i] += count if h >> i & 1 else -count
+
+    fingerprint = 0
+    for i, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << i
+    return fingerprint
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+class Deduplicator:
+    def __init__(self, max_distance=None, bands=4, bits=64):
+        """max_distance为判定近似重复的最大汉明距离，须小于bands（抽屉原理保证候选不漏）"""
+        self.config = Config()
+        self.max_distance = self.config.SIMHASH_MAX_DISTANCE if max_distance is None else max_distance
+        self.bands = max(bands, self.max_distance + 1)
+        self.bits = bits
+        self.dropped_urls = 0
+        self.dropped_contents = 0
+
+    def dedupe_by_url(self, articles, seen=None):
+        """按规范化URL合并重复条目，保留第一次出现的记录；seen为之前批次已出现的URL集合，会被更新"""
+        seen = set() if seen is None else seen
+        unique = []
+        for article in articles:
+            article['url'] = canonical_url(article['url'])
+            if article['url'] in seen:
+                self.dropped_urls += 1
+                continue
+            seen.add(article['url'])
+            unique.append(article)
+        return unique
+
+    def _band_keys(self, fingerprint):
+        width = self.bits // self.bands
+        mask = (1 << width) - 1
+        return [(band, fingerprint >> (band * width) & mask) for band in range(self.bands)]
+
+    def dedupe_by_content(self, articles, text_of):
+        """剔除正文完全相同或SimHash近似相同的文章，保留每组中第一篇；text_of(article)返回正文"""
+        exact = set()
+        index = {}  # (分段, 分段值) -> 已保留的指纹
+        unique = []
+
+        for article in articles:
+            text = text_of(article)
+            if not normalize_text(text):
+                # 没有正文的文章无法比较，原样保留
+                unique.append(article)
+                continue
+
+            digest = content_hash(text)
+            if digest in exact:
+                self.dropped_contents += 1
+                continue
+
+            fingerprint = simhash(text, self.bits)
+            keys = self._band_keys(fingerprint)
+            candidates = {fp for key in keys for fp in index.get(key, ())}
+            if any(hamming_distance(fingerprint, fp) <= self.max_distance for fp in candidates):
+                self.dropped_contents += 1
+                continue
+
+            exact.add(digest)
+            for key in keys:
+                index.setdefault(key, []).append(fingerprint)
+            unique.append(article)
+
+        return unique
+
+    def summary(self):
+        """去重统计"""
+        return f"去重: 合并重复URL {self.dropped_urls} 条，剔除重复正文 {self.dropped_contents} 篇"
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+订阅源解析 - 用流式XML解析器读取RSS/Atom
+一次小请求就能拿到最近文章的标题、链接、发布时间和摘要，不需要解析整页HTML
+"""
+
+import io
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from html import unescape
+from dedup import canonical_url
+from article_schema import normalize_article
+
+TAG = re.compile(r'<[^>]+>')
+WHITESPACE = re.compile(r'\s+')
+
+
+def _local(tag):
+    """去掉命名空间前缀：{http://www.w3.org/2005/Atom}entry -> entry"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _text(value):
+    """摘要中可能带HTML标签和实体"""
+    return WHITESPACE.sub(' ', unescape(TAG.sub(' ', value or ''))).strip()
+
+
+def parse_feed_date(value):
+    """RSS的RFC 822日期或Atom的ISO 8601日期，统一为列表页的格式（保留发布方的本地时间）"""
+    value = (value or '').strip()
+    if not value:
+        return ''
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return value
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _entry(elem):
+    """把一个item/entry元素转换为文章记录"""
+    fields = {}
+    link = ''
+    for child in elem:
+        name = _local(child.tag)
+        if name == 'link':
+            # RSS的link是文本，Atom的link在href属性上
+            if child.get('href') and child.get('rel', 'alternate') == 'alternate':
+                link = child.get('href')
+            elif child.text:
+                link = child.text
+        else:
+            fields.setdefault(name, child.text or '')
+
+    return normalize_article({
+        'title': _text(fields.get('title')),
+        'url': canonical_url(link.strip()),
+        'publish_time': parse_feed_date(
+            fields.get('pubDate') or fields.get('published') or fields.get('updated')
+        ),
+        'summary': _text(fields.get('description') or fields.get('summary') or fields.get('content'))
+    })
+
+
+def parse_feed(data):
+    """流式解析RSS/Atom，返回文章记录列表（按订阅源中的顺序）"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    articles = []
+    for _, elem in ET.iterparse(io.BytesIO(data), events=('end',)):
+        if _local(elem.tag) in ('item', 'entry'):
+            article = _entry(elem)
+            if article['url']:
+                articles.append(article)
+            # 处理完立即释放，内存占用与订阅源大小无关
+            elem.clear()
+    return articles
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+异步抓取引擎 - 有界并发 + 按主机令牌桶限速（AIMD自适应速率） + 多队列公平调度
+用asyncio调度同步的抓取函数，吞吐量由限速预算决定，而不是串行sleep加网络往返
+多个作者共享同一个引擎时，各作者的任务按队列轮转出队，共用全局限速预算
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlparse
+from config import Config
+from pacing import AIMDPacer
+
+
+class TokenBucket:
+    """令牌桶限速器（线程安全，不绑定事件循环）"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """预定一个令牌，返回拿到令牌前需要等待的秒数"""
+        if self.rate <= 0:
+            return 0.0
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            # 允许令牌为负：相当于排队预定，后来者等待更久
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def set_rate(self, rate):
+        """调整速率，此前累积的令牌按旧速率结算"""
+        with self.lock:
+            now = time.monotonic()
+            if self.rate > 0:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.rate = float(rate)
+
+
+class AsyncFetchEngine:
+    """有界并发抓取引擎
+
+    事件循环运行在后台线程中，任何线程都可以通过map/submit提交任务。
+    每个任务属于一个队列（通常是作者ID），调度器在队列之间轮转出队。
+    """
+
+    def __init__(self, concurrency=None, rate_per_host=None, burst=None, global_rate=None):
+        self.config = Config()
+        self.concurrency = concurrency or self.config.FETCH_CONCURRENCY
+        self.rate_per_host = rate_per_host or self.config.RATE_LIMIT_PER_HOST
+        self.burst = burst or self.config.RATE_LIMIT_BURST
+        global_rate = global_rate or self.config.GLOBAL_RATE_LIMIT
+        self.global_bucket = TokenBucket(global_rate, self.burst) if global_rate else None
+
+        self.buckets = {}
+        self.pacers = {}
+        self.queues = OrderedDict()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+
+        self.loop = None
+        self.wakeup = None
+        self.semaphore = None
+
+    def bucket_for(self, url):
+        """获取URL所属主机的令牌桶，其速率由该主机的AIMD限速器调节"""
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.buckets:
+                bucket = TokenBucket(self.rate_per_host, self.burst)
+                self.buckets[host] = bucket
+                self.pacers[host] = AIMDPacer(bucket)
+            return self.buckets[host]
+
+    def pacer_for(self, url):
+        """获取URL所属主机的自适应限速器"""
+        self.bucket_for(url)
+        return self.pacers[urlparse(url).netloc]
+
+    def observe(self, url, status_code, latency):
+        """报告一次请求的状态码和耗时（秒），status_code为None表示网络异常"""
+        self.pacer_for(url).observe(status_code, latency)
+
+    def retry_delay(self, url):
+        """重试前需要等待的秒数：与首次请求一样，在全局令牌桶和该主机的令牌桶各预定一个令牌"""
+        delay = self.bucket_for(url).reserve()
+        if self.global_bucket:
+            delay = max(delay, self.global_bucket.reserve())
+        return delay
+
+    def pacing_metrics(self):
+        """各主机的当前速率和错误率"""
+        with self.lock:
+            pacers = dict(self.pacers)
+        return {host: pacer.metrics() for host, pacer in pacers.items()}
+
+    def pacing_summary(self):
+        """限速指标摘要"""
+        lines = []
+        for host, metrics in self.pacing_metrics().items():
+            lines.append(
+                f"限速 {host}: 当前 {metrics['rate']} 次/秒，错误率 {metrics['error_rate']:.0%}，"
+                f"请求 {metrics['requests']} 次，降速 {metrics['decreases']} 次"
+            )
+        return '\n'.join(lines)
+
+    def _ensure_loop(self):
+        """按需启动后台事件循环"""
+        with self.lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                thread = threading.Thread(target=self._run_loop, args=(ready,), daemon=True)
+                thread.start()
+                ready.wait()
+        return self.loop
+
+    def _run_loop(self, ready):
+        asyncio.set_event_loop(self.loop)
+        self.wakeup = asyncio.Event()
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.loop.create_task(self._dispatch())
+        ready.set()
+        self.loop.run_forever()
+
+        # close()停止事件循环后，取消调度循环等未完成的任务再关闭
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.close()
+
+    def _enqueue(self, queue, func, url, future):
+        self.queues.setdefault(queue, deque()).append((func, url, future))
+        self.wakeup.set()
+
+    def _next_job(self):
+        """从队首队列取出一个任务，并把该队列移到队尾，实现队列间轮转"""
+        queue, jobs = next(iter(self.queues.items()))
+        job = jobs.popleft()
+        del self.queues[queue]
+        if jobs:
+            self.queues[queue] = jobs
+        return job
+
+    async def _wait(self, seconds):
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    async def _dispatch(self):
+        """调度循环：有空闲并发槽位且拿到全局令牌时，轮转取出下一个任务"""
+        while True:
+            await self.semaphore.acquire()
+
+            while not self.queues:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+
+            if self.global_bucket:
+                await self._wait(self.global_bucket.reserve())
+
+            func, url, future = self._next_job()
+            if not future.set_running_or_notify_cancel():
+                self.semaphore.release()
+                continue
+
+            self.loop.create_task(self._run(func, url, future))
+
+    async def _run(self, func, url, future):
+        """在主机限速内执行一次抓取"""
+        try:
+            await self._wait(self.bucket_for(url).reserve())
+            result = await self.loop.run_in_executor(self.executor, func, url)
+            future.set_result(result)
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            self.semaphore.release()
+
+    def submit(self, func, url, queue=None):
+        """提交一个抓取任务到指定队列，返回concurrent.futures.Future"""
+        loop = self._ensure_loop()
+        future = Future()
+        loop.call_soon_threadsafe(self._enqueue, queue, func, url, future)
+        return future
+
+    def map(self, func, urls, queue=None):
+        """并发抓取一组URL，结果顺序与urls一致，出错的项返回None"""
+        urls = list(urls)
+        futures = [self.submit(func, url, queue) for url in urls]
+
+        results = []
+        for url, future in zip(urls, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"抓取 {url} 时出错: {e}")
+                results.append(None)
+
+        return results
+
+    def close(self):
+        """停止事件循环并关闭线程池"""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+CSDN页面夹具生成器
+基于test_data.py的测试文章批量生成文章数据，并渲染成结构接近CSDN的列表页和文章页，
+用于解析基准测试和本地模拟服务器
+"""
+
+import os
+import random
+from datetime import datetime, timedelta
+from html import escape
+from config import Config
+from test_data import generate_test_articles
+
+
+# 正文段落数分布：多数为中等长度，少数为长文
+DEFAULT_PARAGRAPHS = [3, 5, 8, 12, 20, 40]
+
+
+def generate_articles(count, user_id=None, seed=0, base_date=None, base_url=None, paragraphs=None):
+    """按test_data.py的样例批量生成文章（按发布时间倒序）
+
+    base_url为文章链接的博客地址（默认CSDN），paragraphs为正文段落数的候选分布
+    """
+    rng = random.Random(seed)
+    user_id = user_id or Config.CSDN_USER_ID
+    base_url = base_url or Config.base_url_for(user_id)
+    paragraphs = paragraphs or DEFAULT_PARAGRAPHS
+    samples = generate_test_articles()
+    base_date = base_date or datetime(2025, 9, 15, 12, 0, 0)
+
+    articles = []
+    publish_date = base_date
+    for i in range(count):
+        sample = samples[i % len(samples)]
+        publish_date -= timedelta(hours=rng.randint(6, 72), minutes=rng.randint(0, 59))
+
+        content = '\n'.join(sample['content'] for _ in range(rng.choice(paragraphs)))
+
+        articles.append({
+            'id': str(100000000 + i),
+            'title': f"{sample['title']} ({i + 1})",
+            'url': f"{base_url}/article/details/{100000000 + i}",
+            'publish_time': publish_date.strftime('%Y-%m-%d %H:%M:%S'),
+            'read_count': int(sample['read_count'] * rng.uniform(0.2, 3)),
+            'like_count': int(sample['like_count'] * rng.uniform(0.2, 3)),
+            'comment_count': int(sample['comment_count'] * rng.uniform(0.2, 3)),
+            'content': content
+        })
+
+    return articles
+
+
+def _boilerplate_head(title):
+    """页面头部：样式表和脚本，模拟真实页面中大量与文章无关的标记"""
+    scripts = '\n'.join(
+        f'<script type="text/javascript">var csdn_cfg_{i} = {{"id": {i}, "track": "{"x" * 80}"}};</script>'
+        for i in range(40)
+    )
+    styles = '\n'.join(
+        f'<link rel="stylesheet" href="https://csdnimg.cn/release/blogv2/dist/pc/css/style-{i}.css">'
+        for i in range(20)
+    )
+    return f"""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<title>{escape(title)}-CSDN博客</title>
+{styles}
+{scripts}
+</head>"""
+
+
+def _boilerplate_sidebar(rng):
+    """侧边栏：热门文章、分类专栏等链接"""
+    links = '\n'.join(
+        f'<li><a href="https://blog.csdn.net/other/article/details/{rng.randint(10**8, 10**9)}">'
+        f'<span class="title">推荐阅读 {i}</span><span class="read">{rng.randint(100, 99999)}</span></a></li>'
+        for i in range(120)
+    )
+    return f"""<aside class="blog_container_aside">
+<div id="asideProfile" class="aside-box"><div class="profile-intro">博主信息</div></div>
+<div id="asideHotArticle" class="aside-box"><ul class="hotArticle-list">{links}</ul></div>
+</aside>"""
+
+
+def _boilerplate_toolbar():
+    items = ''.join(f'<li class="toolbar-menu-item"><a href="https://www.csdn.net/nav/{i}">栏目{i}</a></li>' for i in range(30))
+    return f'<div id="csdn-toolbar"><ul class="toolbar-menus">{items}</ul></div>'
+
+
+def render_list_page(articles, user_id=None, seed=0):
+    """渲染文章列表页"""
+    rng = random.Random(seed)
+    user_id = user_id or Config.CSDN_USER_ID
+
+    items = []
+    for article in articles:
+        items.append(f"""<div class="article-item-box csdn-tracking-statistics" data-articleid="{article['id']}">
+<h4 class=""><a href="{article['url']}" target="_blank"><span class="article-type type-1 float-none">原创</span>{escape(article['title'])}</a></h4>
+<p class="content">{escape(article['content'][:100])}</p>
+<div class="info-box d-flex align-content-center"><p>
+<span class="date">{article['publish_time']}</span>
+<span class="read-num">阅读 {article['read_count']}</span>
+<span class="praise">点赞 {article['like_count']}</span>
+<span class="comment">评论 {article['comment_count']}</span>
+</p></div>
+</div>""")
+
+    return f"""{_boilerplate_head(user_id)}
+<body>
+{_boilerplate_toolbar()}
+<div class="main_father clearfix d-flex justify-content-center">
+<main>
+<div class="article-list">
+{''.join(items)}
+</div>
+</main>
+{_boilerplate_sidebar(rng)}
+</div>
+</body>
+</html>"""
+
+
+def render_empty_list_page(user_id=None):
+    """渲染没有文章的列表页（超出最后一页）"""
+    return f"""{_boilerplate_head(user_id or Config.CSDN_USER_ID)}
+<body>
+{_boilerplate_toolbar()}
+<main><div class="no-data">空空如也</div></main>
+</body>
+</html>"""
+
+
+def render_article_page(article, seed=0):
+    """渲染文章详情页"""
+    rng = random.Random(seed)
+    paragraphs = ''.join(f'<p>{escape(line)}</p>\n' for line in article['content'].split('\n'))
+
+    return f"""{_boilerplate_head(article['title'])}
+<body>
+{_boilerplate_toolbar()}
+<div class="main_father clearfix d-flex justify-content-center">
+<main>
+<div class="blog-content-box">
+<div class="article-header-box"><h1 id="articleContentId" class="title-article">{escape(article['title'])}</h1>
+<div class="bar-content"><span class="time">{article['publish_time']}</span>
+<span class="read-count">{article['read_count']}</span></div></div>
+<article class="baidu_pl">
+<div id="article_content" class="article_content clearfix">
+<div id="content_views" class="markdown_views prism-atom-one-dark">
+{paragraphs}
+</div>
+</div>
+</article>
+</div>
+<div class="comment-box">{'<div class="comment-line-box">评论</div>' * rng.randint(0, 30)}</div>
+</main>
+{_boilerplate_sidebar(rng)}
+</div>
+</body>
+</html>"""
+
+
+def render_rss_feed(articles, user_id=None):
+    """渲染作者的RSS 2.0订阅源（CSDN的 /rss/list）"""
+    user_id = user_id or Config.CSDN_USER_ID
+    items = []
+    for article in articles:
+        published = datetime.strptime(article['publish_time'], '%Y-%m-%d %H:%M:%S')
+        items.append(f"""<item>
+<title><![CDATA[{article['title']}]]></title>
+<link>{escape(article['url'])}</link>
+<guid>{escape(article['url'])}</guid>
+<author>{escape(user_id)}</author>
+<pubDate>{published.strftime('%a, %d %b %Y %H:%M:%S')} +0800</pubDate>
+<description><![CDATA[<p>{escape(article['content'][:200])}</p>]]></description>
+<category><![CDATA[技术]]></category>
+</item>""")
+
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0">
+<channel>
+<title><![CDATA[{user_id}的博客]]></title>
+<link>{escape(Config.base_url_for(user_id))}</link>
+<description><![CDATA[CSDN博客]]></description>
+<language>zh-cn</language>
+{''.join(items)}
+</channel>
+</rss>"""
+
+
+def write_fixture_pages(directory, article_count=100, user_id=None):
+    """生成列表页和文章页并写入目录，返回写入的文件数"""
+    os.makedirs(directory, exist_ok=True)
+    articles = generate_articles(article_count, user_id)
+    per_page = Config.ARTICLES_PER_PAGE
+
+    count = 0
+    for page in range(0, len(articles), per_page):
+        path = os.path.join(directory, f"list_{page // per_page + 1}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render_list_page(articles[page:page + per_page], user_id, seed=page))
+        count += 1
+
+    for article in articles:
+        path = os.path.join(directory, f"article_{article['id']}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render_article_page(article, seed=int(article['id'])))
+        count += 1
+
+    return count
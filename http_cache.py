@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+HTTP响应缓存 - 按URL持久化响应体和ETag/Last-Modified
+支持条件请求（304视为命中）和只回放缓存的离线模式
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+from config import Config
+
+
+class CacheMissError(requests.exceptions.RequestException):
+    """离线模式下缓存未命中"""
+
+
+class HTTPCache:
+    def __init__(self, cache_dir=None, offline=False):
+        self.config = Config()
+        self.cache_dir = cache_dir or self.config.HTTP_CACHE_DIR
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        """返回URL对应的元数据文件和响应体文件路径"""
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.body'
+
+    def load(self, url):
+        """读取缓存条目，不存在返回None"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(body_path, 'rb') as f:
+                entry['body'] = f.read()
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def store(self, url, response):
+        """保存200响应及其校验头"""
+        meta_path, body_path = self._paths(url)
+        entry = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_type': response.headers.get('Content-Type', ''),
+            'encoding': response.encoding or response.apparent_encoding,
+            'fetched_at': time.time()
+        }
+
+        # 先写临时文件再替换，避免中断时留下半个缓存
+        self._write_atomic(body_path, response.content)
+        self._write_atomic(meta_path, json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+    def _write_atomic(self, path, data):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _build_response(self, url, entry):
+        """用缓存条目构造requests.Response"""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = url
+        response._content = entry['body']
+        response.encoding = entry.get('encoding')
+        if entry.get('content_type'):
+            response.headers['Content-Type'] = entry['content_type']
+        response.from_cache = True
+        return response
+
+    def _count(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, transport, url, headers=None, **kwargs):
+        """带缓存的GET请求，transport为HTTPTransport（或requests.Session），其余参数与session.get一致"""
+        entry = self.load(url)
+
+        if self.offline:
+            if entry is None:
+                self._count(False)
+                raise CacheMissError(f"离线模式下缓存未命中: {url}")
+            self._count(True)
+            return self._build_response(url, entry)
+
+        headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = transport.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self._count(True)
+            return self._build_response(url, entry)
+
+        self._count(False)
+        if response.status_code == 200:
+            self.store(url, response)
+        return response
+
+    def summary(self):
+        """缓存命中统计"""
+        return f"HTTP缓存命中 {self.hits} 次，未命中 {self.misses} 次"
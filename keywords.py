@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+技术关键词匹配 - Aho-Corasick自动机
+词表只编译一次，每篇文章扫描一遍即可得到所有词的出现次数（不区分大小写），
+耗时与文本长度成正比、与词表大小无关；安装了pyahocorasick时使用其C实现
+"""
+
+import re
+from collections import Counter, deque
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# 总结器和网站生成器共用的技术词表
+TECH_TERMS = [
+    'Python', 'Java', 'JavaScript', 'C++', 'Go', 'Rust', 'TypeScript',
+    'React', 'Vue', 'Angular', 'Node.js', 'Django', 'Flask', 'Spring',
+    'MySQL', 'Redis', 'MongoDB', 'PostgreSQL', 'Elasticsearch',
+    'Docker', 'Kubernetes', 'Linux', 'Git', 'GitHub', 'CI/CD',
+    'AI', '人工智能', '机器学习', '深度学习', 'ChatGPT', 'LLM',
+    '算法', '数据结构', '设计模式', 'OOP', 'API',
+    '前端', '后端', '全栈', '微服务', '分布式',
+    '云计算', '大数据', '区块链', 'Web3',
+    'TensorFlow', 'PyTorch', 'Pandas', 'NumPy',
+    'AWS', '阿里云', '腾讯云',
+    'Nginx', 'Apache', 'Tomcat',
+    'JVM', 'GC', '性能优化',
+    'CUDA', 'GPU', '并行计算',
+    'Qt', 'LVGL', 'OpenGL',
+    'Shell', 'Bash', 'PowerShell',
+    'JSON', 'XML', 'YAML', 'ProtoBuf'
+]
+
+ASCII_WORD = re.compile(r'[a-z0-9_]')
+
+
+def _is_word(ch):
+    return bool(ch) and ASCII_WORD.match(ch) is not None
+
+
+class KeywordMatcher:
+    def __init__(self, terms, native=None):
+        """terms为词表（保留原始大小写用于输出）；native为None时有pyahocorasick就用"""
+        self.terms = list(dict.fromkeys(terms))
+        keys = [term.lower() for term in self.terms]
+        # 以英文字母或数字开头/结尾的词要求词边界，避免Go匹配到Google、AI匹配到MAIN
+        self.bounds = [(_is_word(key[0]), _is_word(key[-1])) for key in keys]
+        self.lengths = [len(key) for key in keys]
+
+        self.native = ahocorasick is not None if native is None else native
+        if self.native:
+            self.automaton = ahocorasick.Automaton()
+            for index, key in enumerate(keys):
+                self.automaton.add_word(key, index)
+            self.automaton.make_automaton()
+        else:
+            self._build(keys)
+
+    def _build(self, keys):
+        """构建纯Python的自动机：trie + 失败链接，再展开为完整的状态转移表"""
+        goto = [{}]
+        outputs = [[]]
+        for index, key in enumerate(keys):
+            state = 0
+            for ch in key:
+                if ch not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            outputs[state].append(index)
+
+        fail = [0] * len(goto)
+        order = []
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for ch, child in goto[state].items():
+                queue.append(child)
+                link = fail[state]
+                while link and ch not in goto[link]:
+                    link = fail[link]
+                fail[child] = goto[link].get(ch, 0) if state else 0
+                outputs[child] = outputs[child] + outputs[fail[child]]
+
+        # 按广度优先顺序展开，每个状态的转移表继承失败状态的转移表，扫描时不需要回溯
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        for state in order:
+            delta[state] = {**delta[fail[state]], **goto[state]}
+
+        self.delta = delta
+        self.outputs = outputs
+        # 不在词表字符集中的字符不可能属于任何匹配，只扫描由词表字符组成的片段
+        alphabet = sorted({ch for key in keys for ch in key})
+        self.segment = re.compile('[' + ''.join(re.escape(ch) for ch in alphabet) + ']+')
+
+    def _matches(self, text):
+        """产出(结束位置, 词序号)，text须已转为小写"""
+        if self.native:
+            yield from self.automaton.iter(text)
+            return
+
+        delta, outputs = self.delta, self.outputs
+        for segment in self.segment.finditer(text):
+            state = 0
+            offset = segment.start()
+            for position, ch in enumerate(segment.group(), offset):
+                state = delta[state].get(ch, 0)
+                for index in outputs[state]:
+                    yield position, index
+
+    def count(self, text):
+        """一遍扫描统计每个词的出现次数（不区分大小写），返回Counter"""
+        if not text:
+            return Counter()
+
+        text = text.lower()
+        counts = Counter()
+        last = len(text) - 1
+        for end, index in self._matches(text):
+            start = end - self.lengths[index] + 1
+            need_left, need_right = self.bounds[index]
+            if need_left and start > 0 and _is_word(text[start - 1]):
+                continue
+            if need_right and end < last and _is_word(text[end + 1]):
+                continue
+            counts[self.terms[index]] += 1
+        return counts
+
+    def count_articles(self, articles, text_of):
+        """每篇文章的词频，text_of(article)返回要扫描的文本"""
+        return [self.count(text_of(article)) for article in articles]
+
+    def document_frequency(self, articles, text_of):
+        """每个词出现在多少篇文章中"""
+        frequency = Counter()
+        for counts in self.count_articles(articles, text_of):
+            frequency.update(counts.keys())
+        return frequency
+
+    def extract(self, text):
+        """文本中出现的词，按出现次数从多到少"""
+        return [term for term, _ in self.count(text).most_common()]
+
+
+# 默认技术词表的自动机，导入时编译一次
+TECH_KEYWORDS = KeywordMatcher(TECH_TERMS)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+LLM后端 - 月度总结使用的对话补全接口
+OpenAIBackend使用openai 1.x客户端，设置base_url即可指向任何OpenAI兼容的服务（自建推理服务、llm_stub_server.py）；
+CassetteBackend把请求和响应录制到文件，之后不需要API密钥和网络即可回放
+"""
+
+import hashlib
+import json
+import os
+import threading
+import httpx
+import openai
+from config import Config
+
+
+class CassetteMissError(Exception):
+    """回放模式下录制文件中没有该请求"""
+    pass
+
+
+class LLMBackend:
+    """后端接口：complete返回补全文本，调用失败直接抛出异常，由调用方决定是否重试"""
+
+    def complete(self, messages, model, max_tokens, temperature, timeout=None):
+        raise NotImplementedError
+
+
+class OpenAIBackend(LLMBackend):
+    def __init__(self, api_key=None, base_url=None, max_connections=None):
+        """base_url为空时使用OpenAI官方地址；自建服务通常不校验密钥"""
+        self.config = Config()
+        max_connections = max_connections or self.config.SUMMARY_CONCURRENCY
+        # 显式传入连接池：并发的LLM请求复用keep-alive连接，重试由AISummarizer统一处理
+        self.client = openai.OpenAI(
+            api_key=api_key or self.config.OPENAI_API_KEY or 'not-needed',
+            base_url=base_url or self.config.OPENAI_BASE_URL or None,
+            max_retries=0,
+            http_client=httpx.Client(limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ))
+        )
+
+    def complete(self, messages, model, max_tokens, temperature, timeout=None):
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            timeout=timeout
+        )
+        return response.choices[0].message.content
+
+
+class CassetteBackend(LLMBackend):
+    def __init__(self, path, backend=None, mode='replay'):
+        """mode为record时调用backend并录制响应（已录制的请求直接回放），为replay时只回放"""
+        self.path = path
+        self.backend = backend
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry['key']] = entry['response']
+
+    @staticmethod
+    def request_key(messages, model, max_tokens, temperature):
+        """请求的内容哈希，与超时等传输参数无关"""
+        payload = json.dumps(
+            {'model': model, 'messages': messages, 'max_tokens': max_tokens, 'temperature': temperature},
+            ensure_ascii=False, sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def complete(self, messages, model, max_tokens, temperature, timeout=None):
+        key = self.request_key(messages, model, max_tokens, temperature)
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+
+        if self.mode != 'record' or self.backend is None:
+            raise CassetteMissError(f"录制文件中没有该请求: {key[:12]}")
+
+        response = self.backend.complete(messages, model, max_tokens, temperature, timeout)
+        with self.lock:
+            self.entries[key] = response
+            # 追加写入，录制中断时已完成的请求不会丢失
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'key': key, 'model': model, 'response': response}, ensure_ascii=False) + '\n')
+        return response
+
+    def summary(self):
+        return f"LLM录制文件: 回放 {self.hits} 次，未命中 {self.misses} 次"
+
+
+def create_backend(config=None):
+    """按配置创建后端；没有API密钥、base_url和录制文件时返回None（使用统计总结）"""
+    config = config or Config()
+    backend = None
+    if config.OPENAI_API_KEY or config.OPENAI_BASE_URL:
+        backend = OpenAIBackend()
+
+    if config.LLM_CASSETTE:
+        mode = config.LLM_CASSETTE_MODE
+        if mode == 'record' and backend is None:
+            print("警告: 录制LLM响应需要API密钥或OPENAI_BASE_URL，只回放已录制的请求")
+        return CassetteBackend(config.LLM_CASSETTE, backend, mode)
+    return backend
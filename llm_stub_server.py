@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+本地LLM桩服务器
+实现OpenAI兼容的 /v1/chat/completions 接口，响应内容由请求内容确定性生成，可配置延迟和429/500错误注入，
+用于离线测量月度总结的吞吐量和重试行为（将 OPENAI_BASE_URL 指向本服务器即可）
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from prompt_packer import estimate_tokens
+
+ERROR_BODIES = {
+    429: {'error': {'message': 'Rate limit reached', 'type': 'rate_limit_error'}},
+    500: {'error': {'message': 'Internal server error', 'type': 'server_error'}}
+}
+
+# 生成响应用的词表，中英文混合，接近真实总结的token密度
+VOCABULARY = [
+    '本月', '文章', '主要', '围绕', '技术', '实践', '性能', '优化', '模型', '部署', '数据库', '缓存',
+    '并发', '架构', '总结', '深入', '分析', 'Python', 'Docker', 'Kubernetes', 'API', 'LLM'
+]
+
+
+class LLMStubServer:
+    def __init__(self, latency=0.5, jitter=0.2, per_token=0.0, error_429=0.0, error_500=0.0,
+                 seed=0, port=0):
+        """latency/jitter为每个响应的基础延迟和随机附加延迟（秒），per_token为每个输出token的附加延迟，
+        error_*为注入错误的概率"""
+        self.latency = latency
+        self.jitter = jitter
+        self.per_token = per_token
+        self.error_rates = {429: error_429, 500: error_500}
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.host = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.reset_stats()
+
+    def reset_stats(self):
+        """清空请求统计"""
+        with self.lock:
+            self.statuses = Counter()
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.in_flight = 0
+            self.max_in_flight = 0
+
+    def completion_text(self, request):
+        """由请求内容确定性生成的补全文本，长度不超过max_tokens"""
+        prompt = json.dumps(request.get('messages', []), ensure_ascii=False, sort_keys=True)
+        seed = int.from_bytes(hashlib.sha256(prompt.encode('utf-8')).digest()[:8], 'big')
+        rng = random.Random(seed)
+        max_tokens = request.get('max_tokens') or 256
+        words = ['## 总结\n']
+        while estimate_tokens(''.join(words)) < min(max_tokens, 400):
+            words.append(rng.choice(VOCABULARY))
+            if rng.random() < 0.1:
+                words.append('。\n- ')
+        return ''.join(words)
+
+    def _respond(self, request):
+        """返回(状态码, 响应JSON)"""
+        with self.lock:
+            roll = self.rng.random()
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+
+        for status, rate in self.error_rates.items():
+            if roll < rate:
+                time.sleep(delay)
+                return status, ERROR_BODIES[status]
+            roll -= rate
+
+        text = self.completion_text(request)
+        prompt_tokens = sum(estimate_tokens(m.get('content', '')) for m in request.get('messages', []))
+        completion_tokens = estimate_tokens(text)
+        time.sleep(delay + completion_tokens * self.per_token)
+
+        with self.lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+        return 200, {
+            'id': 'chatcmpl-stub',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', ''),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': text},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens
+            }
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+
+                if not self.path.rstrip('/').endswith('/chat/completions'):
+                    status, payload = 404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}}
+                else:
+                    with server.lock:
+                        server.in_flight += 1
+                        server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    try:
+                        status, payload = server._respond(request)
+                    finally:
+                        with server.lock:
+                            server.in_flight -= 1
+
+                with server.lock:
+                    server.statuses[status] += 1
+
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def base_url(self):
+        """OpenAI兼容的接口地址，用作OPENAI_BASE_URL"""
+        return f"{self.host}/v1"
+
+    def start(self):
+        """在后台线程中启动服务"""
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地LLM桩服务器（OpenAI兼容接口）")
+    parser.add_argument('--port', type=int, default=8001, help='监听端口（默认8001）')
+    parser.add_argument('--latency', type=float, default=0.5, help='基础响应延迟，秒（默认0.5）')
+    parser.add_argument('--jitter', type=float, default=0.2, help='随机附加延迟上限，秒（默认0.2）')
+    parser.add_argument('--per-token', type=float, default=0.0, help='每个输出token的附加延迟，秒')
+    parser.add_argument('--error-429', type=float, default=0.0, help='返回429的概率')
+    parser.add_argument('--error-500', type=float, default=0.0, help='返回500的概率')
+    args = parser.parse_args()
+
+    server = LLMStubServer(
+        latency=args.latency, jitter=args.jitter, per_token=args.per_token,
+        error_429=args.error_429, error_500=args.error_500, port=args.port
+    )
+    print(f"LLM桩服务器已启动: {server.base_url()}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
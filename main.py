@@ -8,107 +8,325 @@ import argparse
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from csdn_scraper import CSDNScraper
 from smart_scraper import SmartCSDNScraper
 from ai_summarizer import AISummarizer
 from portfolio_generator import PortfolioGenerator
+from fetch_engine import AsyncFetchEngine
+from http_cache import HTTPCache
+from transport import HTTPTransport
+from content_store import ContentStore
+from content_scheduler import ContentScheduler
+from article_db import ArticleDB
+from term_index import TermIndex
+from dedup import Deduplicator, canonical_url
+from scrape_journal import ScrapeJournal
+from pipeline import StagedPipeline
 from config import Config
 
 class CSDBlogPortfolio:
-    def __init__(self):
+    def __init__(self, offline=False, user_id=None, parent=None):
         self.config = Config()
-        self.scraper = CSDNScraper()
-        self.smart_scraper = SmartCSDNScraper()
-        self.summarizer = AISummarizer()
-        self.generator = PortfolioGenerator()
+        self.user_id = user_id or self.config.CSDN_USER_ID
         
-    def scrape_articles(self, max_pages=None, force_refresh=False):
-        """爬取文章"""
-        articles_file = 'articles.json'
+        # 多作者模式下每个作者的数据和网站输出到独立目录
+        self.data_dir = os.path.join(self.config.AUTHORS_DIR, user_id) if user_id else ''
+        if self.data_dir:
+            os.makedirs(self.data_dir, exist_ok=True)
+        self.articles_file = os.path.join(self.data_dir, 'articles.json')
+        self.summaries_file = os.path.join(self.data_dir, 'monthly_summaries.json')
+        self.rollups_file = os.path.join(self.data_dir, 'summary_rollups.json')
+        self.journal_file = os.path.join(self.data_dir, self.config.JOURNAL_FILE)
         
-        # 检查是否已有数据且不强制刷新
-        if os.path.exists(articles_file) and not force_refresh:
+        if parent is None:
+            # 两个爬虫共享同一个抓取引擎、HTTP缓存、连接池和全文存储，按主机统一限速
+            self.engine = AsyncFetchEngine()
+            self.http_cache = HTTPCache(offline=offline)
+            self.transport = HTTPTransport()
+            self.content_store = ContentStore()
+            self.db = ArticleDB()
+        else:
+            # 与父实例共享调度器、HTTP缓存、连接池、全文存储和数据库
+            self.engine = parent.engine
+            self.http_cache = parent.http_cache
+            self.transport = parent.transport
+            self.content_store = parent.content_store
+            self.db = parent.db
+        
+        self.scraper = CSDNScraper(
+            engine=self.engine, cache=self.http_cache,
+            user_id=user_id, transport=self.transport
+        )
+        self.smart_scraper = SmartCSDNScraper(
+            engine=self.engine, cache=self.http_cache,
+            user_id=user_id, transport=self.transport
+        )
+        
+        # 关键词索引与文章保存在同一个数据库中，按作者区分
+        self.term_index = TermIndex(self.db, self.content_store, self.user_id)
+        self.summarizer = AISummarizer(
+            content_store=self.content_store, db=self.db, author=self.user_id, term_index=self.term_index
+        )
+        self.generator = PortfolioGenerator(
+            output_dir=os.path.join(self.data_dir, self.config.OUTPUT_DIR),
+            content_store=self.content_store, term_index=self.term_index
+        )
+    
+    def for_author(self, user_id):
+        """创建指定作者的实例，共享本实例的调度器、HTTP缓存和连接池"""
+        return CSDBlogPortfolio(user_id=user_id, parent=self)
+        
+    def _open_journal(self, resume=False):
+        """打开抓取日志并交给两个爬虫，每完成一个列表页或文章即落盘"""
+        journal = ScrapeJournal(self.journal_file, resume=resume)
+        self.scraper.journal = journal
+        self.smart_scraper.journal = journal
+        return journal
+    
+    def scrape_articles(self, max_pages=None, force_refresh=False, incremental=False, resume=False,
+                        on_batch=None):
+        """爬取文章
+        
+        on_batch: 可选回调，每抓完一页（连同内容）就把这批文章交给下游，用于流水线模式
+        """
+        on_batch = on_batch or (lambda batch: None)
+        
+        # 增量模式：以已有数据为基准，只抓取新增或变化的文章
+        if incremental and self.has_saved_articles():
+            articles = self.scrape_incremental(max_pages, resume)
+            on_batch(articles)
+            return articles
+        
+        # 检查是否已有数据且不强制刷新（续传时继续上次未完成的抓取）
+        if self.has_saved_articles() and not force_refresh and not resume:
             print("发现已有文章数据，使用缓存数据...")
             print("如需重新爬取，请使用 --force-refresh 参数")
-            with open(articles_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            articles = self.load_articles()
+            on_batch(articles)
+            return articles
         
         print("开始爬取CSDN博客文章...")
+        journal = self._open_journal(resume)
+        dedup = Deduplicator()
+        seen_urls = set()
+        emitted = set()
+        
+        def emit(batch):
+            # 回退到普通爬虫时跳过已经交给下游的文章
+            batch = [a for a in batch if (a['url'], a['title']) not in emitted]
+            emitted.update((a['url'], a['title']) for a in batch)
+            if batch:
+                on_batch(batch)
         
         # 优先使用智能爬虫
         try:
             print("使用智能爬虫（推荐）...")
-            articles = self.smart_scraper.get_article_list_smart(max_pages=max_pages or 5)
+            articles = []
+            pages = []
+            for page_articles in self.smart_scraper.iter_article_pages_smart(max_pages=max_pages or 5):
+                # 先合并重复条目，重复的文章不再获取内容
+                page_articles = dedup.dedupe_by_url(page_articles, seen_urls)
+                articles.extend(page_articles)
+                pages.append(page_articles)
             
-            # 获取文章内容
-            if articles:
-                print(f"获取到{len(articles)}篇文章，开始获取详细内容...")
-                for i, article in enumerate(articles[:10], 1):  # 限制获取内容的文章数量
-                    print(f"获取第{i}/{min(10, len(articles))}篇文章内容...")
-                    content = self.smart_scraper.get_article_content_smart(article['url'])
-                    article['content'] = content
-                    if i >= 10:  # 最多获取10篇文章的详细内容
-                        print("已获取前10篇文章的详细内容，其余文章只保留基本信息")
-                        break
+            # 列表齐全后按优先级在预算内获取正文；某页需要抓取的正文都完成后即交给下游
+            scheduler = ContentScheduler(self.content_store)
+            print(f"开始获取文章详细内容（预算{scheduler.max_requests}篇）...")
+            for _ in scheduler.run(articles, self.smart_scraper.get_article_contents_smart):
+                while pages and not any(a['url'] in scheduler.pending for a in pages[0]):
+                    emit(pages.pop(0))
+            for page_articles in pages:
+                emit(page_articles)
         except Exception as e:
             print(f"智能爬虫失败: {e}")
             print("回退到普通爬虫...")
-            articles = self.scraper.scrape_all_articles(max_pages=max_pages)
+            articles = self.scraper.scrape_all_articles(max_pages=max_pages, include_content=False)
+            scheduler = ContentScheduler(self.content_store)
+            scheduler.fetch_all(articles, self.scraper.get_article_contents)
+            emit(articles)
+        
+        print(dedup.summary())
+        print(scheduler.summary())
+        print(self.http_cache.summary())
+        print(self.transport.summary())
+        print(self.engine.pacing_summary())
         
-        # 保存文章数据
-        self.scraper.save_articles_to_json(articles, articles_file)
+        # 保存文章数据，成功后日志已并入数据集，可以删除
+        self.save_articles(articles)
+        journal.compact()
         
         return articles
     
-    def generate_summaries(self, articles, force_refresh=False):
-        """生成月度总结"""
-        summaries_file = 'monthly_summaries.json'
+    def scrape_incremental(self, max_pages=None, resume=False):
+        """增量爬取：遇到已保存的文章即停止翻页，优先获取新增或变化文章的内容"""
+        journal = self._open_journal(resume)
+        # 已保存的数据只统一URL写法，不去重：URL重复的记录在数据库中各占一行，增量爬取不能让数据集变少
+        dedup = Deduplicator()
+        existing = self.load_articles()
+        known = {}
+        for article in existing:
+            article['url'] = canonical_url(article['url'])
+            known.setdefault(article['url'], article)
+        print(f"开始增量爬取，已有{len(existing)}篇文章...")
+        
+        try:
+            # 订阅源一次请求即可拿到最近的文章，包含已保存的文章时说明没有遗漏，无需翻页
+            fresh = self.smart_scraper.get_feed_articles() or []
+            if any(article['url'] in known for article in fresh):
+                print("订阅源已覆盖全部新文章，跳过列表页")
+            else:
+                # 订阅源不可用或新文章超出订阅源范围：只翻订阅源之后的列表页获取更早的文章
+                start_page = len(fresh) // self.config.ARTICLES_PER_PAGE + 1
+                fresh += self.smart_scraper.get_article_list_smart(
+                    max_pages=max_pages or 5, known_urls=known, start_page=start_page
+                )
+            fetch_contents = self.smart_scraper.get_article_contents_smart
+        except Exception as e:
+            print(f"智能爬虫失败: {e}")
+            print("回退到普通爬虫...")
+            fresh = self.scraper.get_article_list(max_pages, known_urls=known)
+            fetch_contents = self.scraper.get_article_contents
+        
+        # 新抓取的条目按URL去重；新增或标题/时间有变化的文章需要重新获取内容，缺少正文的旧文章最多补齐CONTENT_BACKFILL_BUDGET篇
+        fresh = dedup.dedupe_by_url(fresh)
+        changed = {a['url'] for a in fresh if self.scraper.article_changed(known.get(a['url']), a)}
+        print(f"列表页共{len(fresh)}篇文章，其中新增或变化{len(changed)}篇")
+        
+        articles = self.scraper.merge_articles(existing, fresh)
+        scheduler = ContentScheduler(self.content_store, backfill_budget=self.config.CONTENT_BACKFILL_BUDGET)
+        scheduler.fetch_all(articles, fetch_contents, changed_urls=changed)
+        print(dedup.summary())
+        print(scheduler.summary())
+        print(self.http_cache.summary())
+        print(self.transport.summary())
+        print(self.engine.pacing_summary())
         
-        # 检查是否已有总结且不强制刷新
-        if os.path.exists(summaries_file) and not force_refresh:
-            print("发现已有月度总结，使用缓存数据...")
-            print("如需重新生成，请使用 --force-refresh 参数")
-            with open(summaries_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        self.save_articles(articles)
+        journal.compact()
+        return articles
+    
+    def has_saved_articles(self):
+        """数据库或旧的articles.json中是否已有该作者的文章"""
+        return self.db.count(self.user_id) > 0 or os.path.exists(self.articles_file)
+    
+    def load_articles(self):
+        """读取已保存的文章；数据库中还没有该作者时导入旧的articles.json
+        
+        记录里还是全文的旧数据先转存到全文存储，记录里只留content_id、正文哈希和摘录
+        """
+        if self.db.count(self.user_id):
+            articles = self.db.all_articles(self.user_id)
+            # 旧记录没有正文哈希，补算一次后写回，之后判断总结缓存不再需要读取正文
+            stored = self.content_store.store_articles(articles)
+            if self.content_store.hash_articles(articles) or stored:
+                self.db.upsert_articles(articles, self.user_id)
+            return articles
+        
+        articles = self.scraper.load_articles_from_json(self.articles_file)
+        if articles:
+            print(f"从 {self.articles_file} 导入{len(articles)}篇文章到数据库")
+            self.content_store.store_articles(articles)
+            self.db.upsert_articles(articles, self.user_id)
+        return articles
+    
+    def save_articles(self, articles):
+        """保存完整的文章数据集并更新关键词索引，按配置同时导出articles.json"""
+        # 正文调度器已把抓到的正文存入全文存储；其他途径得到的全文（如回退爬虫合并的旧记录）在这里转存
+        self.content_store.store_articles(articles)
+        self.db.replace_articles(articles, self.user_id)
+        self.term_index.sync(articles)
+        if self.config.EXPORT_JSON:
+            self.scraper.save_articles_to_json(articles, self.articles_file)
+    
+    def load_summaries(self):
+        """读取已保存的月度总结，没有返回None；数据库中没有时导入旧的monthly_summaries.json"""
+        summaries = self.db.summaries(self.user_id)
+        if summaries:
+            return summaries
+        
+        if not os.path.exists(self.summaries_file):
+            return None
+        with open(self.summaries_file, 'r', encoding='utf-8') as f:
+            summaries = json.load(f)
+        self.db.upsert_summaries(summaries, self.user_id)
+        return summaries
+    
+    def save_summaries(self, summaries):
+        """保存月度总结（替换已保存的全部月份），按配置同时导出monthly_summaries.json"""
+        self.db.replace_summaries(summaries, self.user_id)
+        if self.config.EXPORT_JSON:
+            with open(self.summaries_file, 'w', encoding='utf-8') as f:
+                json.dump(summaries, f, ensure_ascii=False, indent=2)
+            print(f"月度总结已保存到 {self.summaries_file}")
+    
+    def generate_summaries(self, articles, force_refresh=False):
+        """生成月度总结：只重新生成文章集合有变化的月份，强制刷新时全部重新生成"""
+        cached = {} if force_refresh else self.load_summaries() or {}
         
         print("开始生成AI月度总结...")
-        summaries = self.summarizer.generate_all_monthly_summaries(articles)
+        # articles已保存在数据库中，总结器按月份直接查询
+        self.db.upsert_articles(articles, self.user_id)
+        self.term_index.sync(articles)
+        summaries = self.summarizer.generate_all_monthly_summaries(cached=cached)
         
         # 保存总结数据
-        with open(summaries_file, 'w', encoding='utf-8') as f:
-            json.dump(summaries, f, ensure_ascii=False, indent=2)
-        
-        print(f"月度总结已保存到 {summaries_file}")
+        self.save_summaries(summaries)
         return summaries
     
-    def generate_portfolio(self, articles, summaries):
-        """生成作品集网站"""
+    def load_rollups(self):
+        """读取已保存的季度/年度总结"""
+        return self.db.rollups(self.user_id)
+    
+    def save_rollups(self, rollups):
+        """保存季度/年度总结（替换已保存的全部时间段），按配置同时导出summary_rollups.json"""
+        self.db.replace_rollups(rollups, self.user_id)
+        if self.config.EXPORT_JSON:
+            with open(self.rollups_file, 'w', encoding='utf-8') as f:
+                json.dump(rollups, f, ensure_ascii=False, indent=2)
+    
+    def generate_rollups(self, summaries, force_refresh=False):
+        """由月度总结生成季度和年度总结，下级总结没有变化的时间段复用已保存的结果"""
+        if not self.config.SUMMARY_ROLLUPS or not summaries:
+            return {}
+        
+        cached = {} if force_refresh else self.load_rollups()
+        rollups = self.summarizer.generate_rollups(summaries, cached)
+        self.save_rollups(rollups)
+        return rollups
+    
+    def load_saved_data(self):
+        """加载已保存的文章和总结数据，没有文章数据时返回(None, {})"""
+        if not self.has_saved_articles():
+            return None, {}
+        
+        return self.load_articles(), self.load_summaries() or {}
+    
+    def generate_portfolio(self, articles, summaries, rollups=None):
+        """生成作品集网站；不传rollups时使用已保存的季度/年度总结"""
         print("开始生成作品集网站...")
-        output_dir = self.generator.generate_portfolio(articles, summaries)
+        if rollups is None and self.config.SUMMARY_ROLLUPS:
+            rollups = self.load_rollups()
+        output_dir = self.generator.generate_portfolio(articles, summaries, rollups)
         return output_dir
     
-    def run_full_pipeline(self, max_pages=None, force_refresh=False):
+    def run_full_pipeline(self, max_pages=None, force_refresh=False, incremental=False, resume=False):
         """运行完整流程"""
         try:
             print("=" * 60)
             print("CSDN博客作品集生成器")
             print("=" * 60)
             
-            # 步骤1: 爬取文章
-            print("\n📄 步骤1: 爬取博客文章")
-            articles = self.scrape_articles(max_pages, force_refresh)
+            # 爬取、月度总结、网站生成三个阶段流水线并发执行
+            print("\n🚀 爬取文章 → 生成AI月度总结 → 生成作品集网站（流水线）")
+            pipeline = StagedPipeline(self)
+            articles, summaries, output_dir = pipeline.run(
+                max_pages, force_refresh, incremental, resume
+            )
             print(f"✅ 成功获取 {len(articles)} 篇文章")
-            
-            # 步骤2: 生成月度总结
-            print("\n🤖 步骤2: 生成AI月度总结")
-            summaries = self.generate_summaries(articles, force_refresh)
             print(f"✅ 成功生成 {len(summaries)} 个月份的总结")
-            
-            # 步骤3: 生成作品集网站
-            print("\n🌐 步骤3: 生成作品集网站")
-            output_dir = self.generate_portfolio(articles, summaries)
             print(f"✅ 作品集网站已生成到: {output_dir}")
             
             # 显示统计信息
@@ -126,21 +344,19 @@ class CSDBlogPortfolio:
             return False
     
     def _show_statistics(self, articles, summaries):
-        """显示统计信息"""
-        total_reads = sum(article.get('read_count', 0) for article in articles)
-        total_likes = sum(article.get('like_count', 0) for article in articles)
-        total_comments = sum(article.get('comment_count', 0) for article in articles)
+        """显示统计信息（读取本次构建已计算的汇总数据，与网站页面的统计一致）"""
+        context = self.generator.build_context(articles)
         
         print("\n📊 博客统计信息:")
-        print(f"   • 总文章数: {len(articles)}")
-        print(f"   • 总阅读量: {total_reads:,}")
-        print(f"   • 总点赞数: {total_likes:,}")
-        print(f"   • 总评论数: {total_comments:,}")
-        print(f"   • 活跃月份: {len(summaries)}")
+        print(f"   • 总文章数: {context['total_articles']}")
+        print(f"   • 总阅读量: {context['total_reads']:,}")
+        print(f"   • 总点赞数: {context['total_likes']:,}")
+        print(f"   • 总评论数: {context['total_comments']:,}")
+        print(f"   • 活跃月份: {len(context['monthly_counts'])}")
+        print(f"   • 月度总结: {len(summaries)}个月份")
         
-        if articles:
-            avg_reads = total_reads // len(articles)
-            print(f"   • 平均阅读量: {avg_reads}")
+        if context['total_articles']:
+            print(f"   • 平均阅读量: {context['avg_reads']}")
     
     def _show_usage_instructions(self, output_dir):
         """显示使用说明"""
@@ -155,11 +371,73 @@ class CSDBlogPortfolio:
         
         print("\n🔄 更新说明:")
         print("   • 要更新数据，请使用 --force-refresh 参数重新运行")
-        print("   • 要只更新总结，请删除 monthly_summaries.json 后重新运行")
+        print("   • 月度总结按文章内容缓存，只有文章有变化的月份会重新生成")
         
         print(f"\n⚙️ 配置文件: config.py")
         print(f"   • 如需使用AI总结功能，请在 .env 文件中设置 OPENAI_API_KEY")
 
+def load_author_ids(args):
+    """从 --authors 和 --authors-file 参数收集作者ID列表（去重，保持顺序）"""
+    user_ids = []
+    if args.authors:
+        user_ids.extend(args.authors.split(','))
+    if args.authors_file:
+        with open(args.authors_file, 'r', encoding='utf-8') as f:
+            user_ids.extend(f.read().split())
+    
+    user_ids = [user_id.strip() for user_id in user_ids if user_id.strip()]
+    return list(dict.fromkeys(user_ids))
+
+def run_multi_author(user_ids, args):
+    """多作者模式：所有作者的爬取任务共用一个调度器，再分别生成总结和网站"""
+    root = CSDBlogPortfolio(offline=args.offline)
+    apps = [root.for_author(user_id) for user_id in user_ids]
+    
+    def scrape(app):
+        try:
+            return app.scrape_articles(
+                args.max_pages, args.force_refresh, args.incremental, args.resume
+            )
+        except Exception as e:
+            print(f"❌ 作者 {app.user_id} 爬取失败: {e}")
+            return None
+    
+    results = {}
+    if not args.generate_only:
+        # 每个作者一个线程提交任务，调度器在作者队列之间轮转，共享全局限速
+        print(f"开始爬取 {len(apps)} 位作者的文章...")
+        with ThreadPoolExecutor(max_workers=len(apps)) as pool:
+            results = dict(zip(user_ids, pool.map(scrape, apps)))
+        
+        for user_id, articles in results.items():
+            if articles is not None:
+                print(f"✅ {user_id}: 共获取 {len(articles)} 篇文章")
+        print(root.http_cache.summary())
+        print(root.transport.summary())
+        print(root.engine.pacing_summary())
+    
+    if args.scrape_only:
+        return 0 if all(articles is not None for articles in results.values()) else 1
+    
+    failed = []
+    for app in apps:
+        print(f"\n👤 作者 {app.user_id}")
+        articles, summaries = app.load_saved_data()
+        if articles is None:
+            print("❌ 未找到文章数据，跳过")
+            failed.append(app.user_id)
+            continue
+        
+        if not args.generate_only:
+            summaries = app.generate_summaries(articles, args.force_refresh)
+            app.generate_rollups(summaries, args.force_refresh)
+        output_dir = app.generate_portfolio(articles, summaries)
+        print(f"✅ 作品集网站已生成到: {output_dir}")
+    
+    if failed:
+        print(f"\n⚠️ 以下作者没有生成网站: {', '.join(failed)}")
+    return 1 if failed else 0
+
 def main():
     parser = argparse.ArgumentParser(
         description="CSDN博客作品集生成器",
@@ -171,6 +449,10 @@ def main():
   %(prog)s --force-refresh          # 强制重新爬取和生成
   %(prog)s --scrape-only            # 只爬取文章，不生成网站
   %(prog)s --generate-only          # 只生成网站（需要已有数据）
+  %(prog)s --force-refresh --offline # 只用HTTP缓存回放，不访问网络
+  %(prog)s --incremental            # 增量爬取新文章并合并到已有数据
+  %(prog)s --authors id1,id2,id3    # 多作者模式，共享调度器和限速
+  %(prog)s --resume                 # 从抓取日志续传上次中断的爬取
         """
     )
     
@@ -210,37 +492,66 @@ def main():
         help='使用智能爬虫（推荐，能更好地处理反爬虫机制）'
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        '--incremental', 
+        action='store_true',
+        help='增量爬取：遇到已保存的文章即停止，只获取新增或变化的文章并合并'
+    )
+    
+    parser.add_argument(
+        '--resume', 
+        action='store_true',
+        help='断点续传：跳过抓取日志中已完成的列表页和文章'
+    )
+    
+    parser.add_argument(
+        '--offline', 
+        action='store_true',
+        help='离线模式：只回放HTTP缓存中的页面，不访问网络'
+    )
+    
+    parser.add_argument(
+        '--authors', 
+        help='多作者模式：逗号分隔的CSDN用户ID列表，输出到 authors/<用户ID>/'
+    )
+    
+    parser.add_argument(
+        '--authors-file', 
+        help='多作者模式：包含CSDN用户ID的文件（空白或换行分隔）'
+    )
     
-    # 创建主应用实例
-    app = CSDBlogPortfolio()
+    args = parser.parse_args()
     
     try:
+        user_ids = load_author_ids(args)
+        if user_ids:
+            return run_multi_author(user_ids, args)
+        
+        # 创建主应用实例
+        app = CSDBlogPortfolio(offline=args.offline)
+        
         if args.scrape_only:
             # 只爬取文章
-            articles = app.scrape_articles(args.max_pages, args.force_refresh)
+            articles = app.scrape_articles(
+                args.max_pages, args.force_refresh, args.incremental, args.resume
+            )
             print(f"✅ 文章爬取完成，共获取 {len(articles)} 篇文章")
             
         elif args.generate_only:
             # 只生成网站
-            if not os.path.exists('articles.json'):
+            articles, summaries = app.load_saved_data()
+            if articles is None:
                 print("❌ 未找到文章数据，请先运行爬虫")
                 return 1
             
-            with open('articles.json', 'r', encoding='utf-8') as f:
-                articles = json.load(f)
-            
-            summaries = {}
-            if os.path.exists('monthly_summaries.json'):
-                with open('monthly_summaries.json', 'r', encoding='utf-8') as f:
-                    summaries = json.load(f)
-            
             app.generate_portfolio(articles, summaries)
             print("✅ 作品集网站生成完成")
             
         else:
             # 运行完整流程
-            success = app.run_full_pipeline(args.max_pages, args.force_refresh)
+            success = app.run_full_pipeline(
+                args.max_pages, args.force_refresh, args.incremental, args.resume
+            )
             return 0 if success else 1
     
     except KeyboardInterrupt:
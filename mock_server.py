@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+本地模拟CSDN服务器
+用fixtures.py生成的列表页、文章页和RSS订阅源代替真实站点，可配置响应延迟、521/403错误注入和正文长度分布，
+用于离线、可重复地测量爬虫性能
+"""
+
+import argparse
+import hashlib
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from config import Config
+from fixtures import (
+    DEFAULT_PARAGRAPHS, generate_articles, render_list_page, render_empty_list_page, render_article_page,
+    render_rss_feed
+)
+
+LIST_PATH = re.compile(r'^/([^/]+)/article/list/(\d+)$')
+DETAIL_PATH = re.compile(r'^/([^/]+)/article/details/(\d+)$')
+
+# Cloudflare在源站不可用时返回的页面
+ERROR_PAGES = {
+    521: '<html><head><title>521: Web server is down</title></head><body>Error 521</body></html>',
+    403: '<html><head><title>403 Forbidden</title></head><body>Access denied</body></html>'
+}
+
+
+class MockCSDNServer:
+    def __init__(self, article_count=200, user_ids=None, latency=0.05, jitter=0.05,
+                 error_521=0.0, error_403=0.0, paragraphs=None, seed=0, port=0, feed_size=20):
+        """latency/jitter为每个响应的基础延迟和随机附加延迟（秒），error_*为注入错误的概率，
+        feed_size为订阅源中的最近文章数（0表示不提供订阅源）"""
+        self.feed_size = feed_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rates = {521: error_521, 403: error_403}
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.host = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+        # 每位作者一套文章，页面预先渲染，避免渲染耗时混入测量结果
+        self.pages = {}
+        self.user_ids = user_ids or [Config.CSDN_USER_ID]
+        for index, user_id in enumerate(self.user_ids):
+            articles = generate_articles(
+                article_count, user_id, seed=seed + index,
+                base_url=f"{self.host}/{user_id}", paragraphs=paragraphs or DEFAULT_PARAGRAPHS
+            )
+            self._render(user_id, articles)
+
+        self.reset_stats()
+
+    def _render(self, user_id, articles):
+        per_page = Config.ARTICLES_PER_PAGE
+        for start in range(0, len(articles), per_page):
+            path = f"/{user_id}/article/list/{start // per_page + 1}"
+            self.pages[path] = render_list_page(articles[start:start + per_page], user_id, seed=start).encode('utf-8')
+        for article in articles:
+            path = f"/{user_id}/article/details/{article['id']}"
+            self.pages[path] = render_article_page(article, seed=int(article['id'])).encode('utf-8')
+        self.pages[('empty', user_id)] = render_empty_list_page(user_id).encode('utf-8')
+        if self.feed_size:
+            feed = render_rss_feed(articles[:self.feed_size], user_id)
+            self.pages[f"/{user_id}{Config.FEED_PATH}"] = feed.encode('utf-8')
+
+    def reset_stats(self):
+        """清空请求统计"""
+        with self.lock:
+            self.requests = Counter()  # 路径 -> 请求次数
+            self.statuses = Counter()
+            self.bytes_sent = 0
+
+    def retries(self):
+        """同一路径的重复请求次数，即客户端重试次数"""
+        with self.lock:
+            return sum(count - 1 for count in self.requests.values())
+
+    def _respond(self, path):
+        """返回(状态码, 响应体)，先按概率注入错误"""
+        with self.lock:
+            self.requests[path] += 1
+            roll = self.rng.random()
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+
+        time.sleep(delay)
+
+        for status, rate in self.error_rates.items():
+            if roll < rate:
+                return status, ERROR_PAGES[status].encode('utf-8')
+            roll -= rate
+
+        if path in self.pages:
+            return 200, self.pages[path]
+
+        match = LIST_PATH.match(path)
+        if match and match.group(1) in self.user_ids:
+            # 超出最后一页
+            return 200, self.pages[('empty', match.group(1))]
+        return 404, b'<html><body>404 Not Found</body></html>'
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                status, body = server._respond(self.path.split('?', 1)[0])
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+
+                with server.lock:
+                    server.statuses[status] += 1
+                    if status == 200 and self.headers.get('If-None-Match') != etag:
+                        server.bytes_sent += len(body)
+
+                if status == 200 and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                self.send_response(status)
+                if status == 200:
+                    self.send_header('ETag', etag)
+                if self.path.endswith(Config.FEED_PATH):
+                    self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+                else:
+                    self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def base_url(self, user_id=None):
+        """指定作者在模拟服务器上的博客地址"""
+        return f"{self.host}/{user_id or self.user_ids[0]}"
+
+    def start(self):
+        """在后台线程中启动服务"""
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模拟CSDN服务器")
+    parser.add_argument('--port', type=int, default=8000, help='监听端口（默认8000）')
+    parser.add_argument('--articles', type=int, default=200, help='每位作者的文章数（默认200）')
+    parser.add_argument('--authors', nargs='+', help='作者ID列表（默认为配置中的作者）')
+    parser.add_argument('--latency', type=float, default=0.05, help='基础响应延迟，秒（默认0.05）')
+    parser.add_argument('--jitter', type=float, default=0.05, help='随机附加延迟上限，秒（默认0.05）')
+    parser.add_argument('--error-521', type=float, default=0.0, help='返回521的概率')
+    parser.add_argument('--error-403', type=float, default=0.0, help='返回403的概率')
+    parser.add_argument('--paragraphs', type=int, nargs='+', help='正文段落数分布，如 3 5 40')
+    parser.add_argument('--feed-size', type=int, default=20, help='订阅源中的文章数，0表示不提供（默认20）')
+    args = parser.parse_args()
+
+    server = MockCSDNServer(
+        article_count=args.articles, user_ids=args.authors, latency=args.latency, jitter=args.jitter,
+        error_521=args.error_521, error_403=args.error_403, paragraphs=args.paragraphs, port=args.port,
+        feed_size=args.feed_size
+    )
+    print(f"模拟CSDN服务器已启动: {server.base_url()}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
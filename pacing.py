@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+自适应限速 - AIMD（加性增、乘性减）请求节奏控制
+服务器响应快且返回200时逐步提高请求速率；遇到429/403/521/5xx、网络异常或延迟明显升高时成倍降低，
+速率始终在 [PACING_MIN_RATE, PACING_MAX_RATE] 之间
+"""
+
+import threading
+import time
+from collections import deque
+from config import Config
+
+
+class AIMDPacer:
+    def __init__(self, bucket, min_rate=None, max_rate=None):
+        """bucket为要调节的TokenBucket，速率变化直接作用在它上面"""
+        self.config = Config()
+        self.bucket = bucket
+        self.min_rate = min_rate or self.config.PACING_MIN_RATE
+        self.max_rate = max_rate or self.config.PACING_MAX_RATE
+        self.increase = self.config.PACING_INCREASE
+        self.decrease = self.config.PACING_DECREASE
+
+        self.rate = min(max(bucket.rate, self.min_rate), self.max_rate)
+        self.bucket.set_rate(self.rate)
+
+        self.latency_ewma = None
+        self.recent = deque(maxlen=self.config.PACING_WINDOW)
+        self.requests = 0
+        self.errors = 0
+        self.decreases = 0
+        self.last_decrease = 0.0
+        self.lock = threading.Lock()
+
+    def is_error(self, status_code):
+        """status_code为None表示网络异常"""
+        return (
+            status_code is None or
+            status_code in (403, 429) or
+            status_code >= 500
+        )
+
+    def _is_slow(self, latency):
+        """延迟超过绝对阈值，或明显高于近期平均水平"""
+        if latency >= self.config.PACING_SLOW_LATENCY:
+            return True
+        return (
+            self.latency_ewma is not None and
+            latency >= 1.0 and
+            latency > self.latency_ewma * self.config.PACING_LATENCY_FACTOR
+        )
+
+    def observe(self, status_code, latency):
+        """记录一次请求的结果并调整速率"""
+        error = self.is_error(status_code)
+
+        with self.lock:
+            self.requests += 1
+            self.recent.append(error)
+            if error:
+                self.errors += 1
+
+            slow = not error and self._is_slow(latency)
+            if not error:
+                if self.latency_ewma is None:
+                    self.latency_ewma = latency
+                else:
+                    self.latency_ewma = 0.8 * self.latency_ewma + 0.2 * latency
+
+            if error or slow:
+                # 同一批并发请求同时失败只算一次拥塞，间隔至少一个请求周期
+                now = time.monotonic()
+                if now - self.last_decrease >= 1 / self.rate:
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    self.last_decrease = now
+                    self.decreases += 1
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+            self.bucket.set_rate(self.rate)
+
+    def error_rate(self):
+        """最近窗口内的错误率"""
+        with self.lock:
+            return sum(self.recent) / len(self.recent) if self.recent else 0.0
+
+    def metrics(self):
+        """当前速率、错误率等指标"""
+        return {
+            'rate': round(self.rate, 3),
+            'error_rate': round(self.error_rate(), 3),
+            'requests': self.requests,
+            'errors': self.errors,
+            'decreases': self.decreases,
+            'latency_ewma': round(self.latency_ewma, 3) if self.latency_ewma is not None else None
+        }
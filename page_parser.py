@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+页面解析层 - lxml + SoupStrainer 快速解析
+列表页和文章页只解析我们实际读取的容器（文章列表项、正文），不构建整页DOM
+"""
+
+import copy
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    FAST_PARSER = 'lxml'
+except ImportError:
+    FAST_PARSER = 'html.parser'
+
+# 列表页中包含文章项的容器
+LIST_CONTAINER_CLASSES = {'article-item-box', 'blog-list-box', 'article-list'}
+
+# 文章页中的正文容器
+CONTENT_CONTAINER_IDS = {'content_views'}
+CONTENT_CONTAINER_CLASSES = {'markdown_views', 'htmledit_views', 'blog-content-box', 'article-content'}
+
+
+def _classes(attrs):
+    """解析阶段的class属性可能是字符串或列表"""
+    value = attrs.get('class') or ''
+    if isinstance(value, str):
+        return set(value.split())
+    return set(value)
+
+
+def _is_list_container(name, attrs):
+    return name == 'article' or (
+        name == 'div' and bool(_classes(attrs) & LIST_CONTAINER_CLASSES)
+    )
+
+
+def _is_content_container(name, attrs):
+    return (
+        name == 'article' or
+        attrs.get('id') in CONTENT_CONTAINER_IDS or
+        bool(_classes(attrs) & CONTENT_CONTAINER_CLASSES)
+    )
+
+
+LIST_STRAINER = SoupStrainer(_is_list_container)
+CONTENT_STRAINER = SoupStrainer(_is_content_container)
+
+
+def title_text(title_elem):
+    """列表项标题的文字，不含"原创"/"转载"等文章类型标签（单独的article-type元素）"""
+    title_elem = copy.copy(title_elem)
+    for label in title_elem.find_all(class_='article-type'):
+        label.decompose()
+    return title_elem.get_text(strip=True)
+
+
+def parse_list_page(html, fast=True):
+    """解析文章列表页；fast=False时为原来的整页html.parser解析"""
+    if not fast:
+        return BeautifulSoup(html, 'html.parser')
+    return BeautifulSoup(html, FAST_PARSER, parse_only=LIST_STRAINER)
+
+
+def parse_article_page(html, fast=True):
+    """解析文章详情页；fast=False时为原来的整页html.parser解析"""
+    if not fast:
+        return BeautifulSoup(html, 'html.parser')
+    return BeautifulSoup(html, FAST_PARSER, parse_only=CONTENT_STRAINER)
+
+
+def parse_full_page(html):
+    """用快速解析器解析整页，供宽泛选择器兜底使用"""
+    return BeautifulSoup(html, FAST_PARSER)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+流水线 - 爬取、月度总结、网站生成三个阶段并发执行
+阶段之间用有界队列连接：某个月的文章抓完即可开始总结，文章数据齐全即可生成页面，
+HTTP延迟和LLM延迟相互重叠，总耗时接近最慢的阶段，而不是各阶段之和
+"""
+
+import queue
+import threading
+from config import Config
+
+
+class StagedPipeline:
+    def __init__(self, app, queue_size=None):
+        """app为CSDBlogPortfolio实例，提供爬虫、总结器、生成器和数据文件路径"""
+        self.app = app
+        self.config = Config()
+        queue_size = queue_size or self.config.PIPELINE_QUEUE_SIZE
+
+        # 爬取 → 总结：('batch', 文章列表) / ('done', 全部文章) / ('error', 异常)
+        self.article_queue = queue.Queue(maxsize=queue_size)
+        # 爬取/总结 → 渲染：('articles', 全部文章) / ('summary', 月份) / ('rollups', 季度/年度总结) /
+        #                   ('summaries', 全部总结) / ('error', 异常)
+        self.render_queue = queue.Queue(maxsize=queue_size)
+        # 总结阶段结束（正常或出错）后不再取article_queue，爬取阶段不必再等待空位
+        self.summarize_done = threading.Event()
+
+    def run(self, max_pages=None, force_refresh=False, incremental=False, resume=False):
+        """运行流水线，返回(文章列表, 月度总结, 输出目录)"""
+        stages = [
+            (self._scrape_stage, (max_pages, force_refresh, incremental, resume)),
+            (self._summarize_stage, (force_refresh,))
+        ]
+        for target, args in stages:
+            threading.Thread(target=self._guard, args=(target, args), daemon=True).start()
+
+        return self._render_stage()
+
+    def _guard(self, target, args):
+        """阶段出错时通知下游，由渲染阶段在主线程抛出"""
+        try:
+            target(*args)
+        except Exception as e:
+            self.render_queue.put(('error', e))
+            self._send_articles(('error', e))
+
+    def _send_articles(self, message):
+        """交给总结阶段：队列满时等待空位（总结阶段一直在取），总结阶段已结束则丢弃"""
+        while not self.summarize_done.is_set():
+            try:
+                self.article_queue.put(message, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _scrape_stage(self, max_pages, force_refresh, incremental, resume):
+        """爬取阶段：每抓完一页就交给总结阶段"""
+        articles = self.app.scrape_articles(
+            max_pages, force_refresh, incremental, resume,
+            on_batch=lambda batch: self._send_articles(('batch', batch))
+        )
+        self.render_queue.put(('articles', articles))
+        self._send_articles(('done', articles))
+
+    def _summarize_stage(self, force_refresh):
+        """总结阶段：月份的文章到齐后立即提交到总结线程池，多个月份的LLM请求并发进行"""
+        try:
+            self._summarize(force_refresh)
+        finally:
+            self.summarize_done.set()
+
+    def _summarize(self, force_refresh):
+        summarizer = self.app.summarizer
+
+        # 与generate_summaries一致：文章集合没有变化的月份复用已保存的总结
+        cached = {} if force_refresh else self.app.load_summaries() or {}
+
+        collected = {}  # 月份 -> 已收到的全部文章
+        pending = set()  # 有新文章、还没有按全部文章提交的月份
+        futures = {}
+
+        with summarizer.executor() as pool:
+            def summarize(month_key):
+                # 置顶等乱序文章会让某个月份提前提交；之后又收到该月文章时按全部文章重新提交，旧任务作废
+                pending.discard(month_key)
+                if month_key in futures:
+                    futures[month_key].cancel()
+                future = pool.submit(
+                    summarizer.summarize_month, month_key, list(collected[month_key]), cached.get(month_key)
+                )
+                future.add_done_callback(lambda _: self.render_queue.put(('summary', month_key)))
+                futures[month_key] = future
+
+            while True:
+                kind, payload = self.article_queue.get()
+                if kind == 'error':
+                    for future in futures.values():
+                        future.cancel()
+                    return
+
+                if kind == 'done':
+                    for month_key in sorted(pending, reverse=True):
+                        summarize(month_key)
+                    break
+
+                # 先把这批文章加入关键词索引，提示词中的本月术语才包含这些文章
+                self.app.term_index.sync(payload, complete=False)
+                monthly = summarizer.group_articles_by_month(payload)
+                for month_key, month_articles in monthly.items():
+                    collected.setdefault(month_key, []).extend(month_articles)
+                    pending.add(month_key)
+
+                # 列表页按时间倒序：比本批最早月份更新的月份不会再有新文章，可以开始总结
+                if monthly:
+                    oldest = min(monthly)
+                    for month_key in sorted((m for m in pending if m > oldest), reverse=True):
+                        summarize(month_key)
+
+            summaries = {month_key: futures[month_key].result() for month_key in sorted(futures, reverse=True)}
+
+        self.app.save_summaries(summaries)
+
+        self.render_queue.put(('rollups', self.app.generate_rollups(summaries, force_refresh)))
+        self.render_queue.put(('summaries', summaries))
+
+    def _render_stage(self):
+        """渲染阶段：文章齐全即生成首页和文章页，总结齐全再生成总结页"""
+        generator = self.app.generator
+        articles = None
+        summaries = None
+        rollups = None
+
+        while articles is None or summaries is None:
+            kind, payload = self.render_queue.get()
+
+            if kind == 'error':
+                raise payload
+            elif kind == 'articles':
+                articles = payload
+                generator.generate_index_page(articles)
+                generator.generate_articles_page(articles)
+            elif kind == 'summary':
+                print(f"{payload}月份总结已完成")
+            elif kind == 'rollups':
+                rollups = payload
+            elif kind == 'summaries':
+                summaries = payload
+
+        if summaries:
+            generator.generate_summaries_page(summaries, rollups)
+        else:
+            print("未提供月度总结数据，跳过总结页面生成")
+
+        return articles, summaries, generator.output_dir
@@ -3,149 +3,126 @@ import json
 import markdown
 from datetime import datetime
 from jinja2 import Environment, FileSystemLoader
-from collections import defaultdict, Counter
 from config import Config
+from content_store import ContentStore
+from article_columns import ArticleColumns
+from article_schema import ensure_normalized
+from keywords import TECH_KEYWORDS
+
+def article_set_key(articles):
+    """文章集合的指纹：URL、标题、发布时间、统计数字和正文摘要任一变化即不同（articles须已规范化）"""
+    return len(articles), hash(tuple(
+        (article['url'], article['title'], article['published'], article.get('read_count', 0),
+         article.get('like_count', 0), article.get('comment_count', 0), article.get('content', ''))
+        for article in articles
+    ))
+
+class BuildContext:
+    """一次构建的汇总数据：统计、排行、关键词和月度表只计算一次，各页面和命令行报告共用"""
+    
+    def __init__(self, key, stats):
+        self.key = key
+        self.stats = stats
+        self._summaries = None
+        self._summary_stats = None
+    
+    def __getitem__(self, key):
+        return self.stats[key]
+    
+    def summary_stats(self, summaries):
+        """月度总结的汇总：总结覆盖的文章数、月均文章数和最活跃的月份"""
+        if summaries is not self._summaries:
+            total = sum(summary_data.get('article_count', 0) for summary_data in summaries.values())
+            self._summaries = summaries
+            self._summary_stats = {
+                'total_articles_in_summaries': total,
+                'avg_articles_per_month': total // len(summaries) if summaries else 0,
+                'most_productive_month': max(
+                    summaries.keys(),
+                    key=lambda k: summaries[k].get('article_count', 0)
+                ) if summaries else "暂无"
+            }
+        return self._summary_stats
 
 class PortfolioGenerator:
-    def __init__(self):
+    def __init__(self, output_dir=None, content_store=None, term_index=None):
         self.config = Config()
+        self.output_dir = output_dir or self.config.OUTPUT_DIR
+        self.content_store = content_store or ContentStore()
+        # 设置了关键词索引时，技术关键词和每月热词由TF-IDF给出，否则按固定词表匹配
+        self.term_index = term_index
         self.env = Environment(loader=FileSystemLoader(self.config.TEMPLATES_DIR))
+        # 本次构建的汇总数据，首页、文章页、总结页和命令行报告共用
+        self.context = None
         
-    def prepare_data(self, articles, summaries=None):
-        """准备模板数据"""
-        # 基础统计
-        total_articles = len(articles)
-        total_reads = sum(article.get('read_count', 0) for article in articles)
-        total_likes = sum(article.get('like_count', 0) for article in articles)
-        total_comments = sum(article.get('comment_count', 0) for article in articles)
+    def build_context(self, articles):
+        """计算本次构建的汇总数据；文章集合与上次相同时直接返回上次的结果"""
+        key = article_set_key(ensure_normalized(articles))
+        if self.context is not None and self.context.key == key:
+            return self.context
         
-        # 按阅读量和点赞数排序获取热门文章
-        hot_articles = sorted(
-            articles, 
-            key=lambda x: x.get('read_count', 0) + x.get('like_count', 0) * 5, 
-            reverse=True
-        )[:6]
+        # 统计和排行都取自传入的articles，与页面上列出的文章是同一份数据
+        columns = ArticleColumns.from_articles(articles)
+        pick = lambda indices: [articles[i] for i in indices]
+        
+        # 基础统计
+        totals = columns.totals()
+        median_reads, p90_reads = columns.read_percentiles((50, 90))
         
-        # 最新文章（按发布时间排序）
-        latest_articles = sorted(
-            articles,
-            key=lambda x: self._parse_date_for_sort(x.get('publish_time', '')),
-            reverse=True
-        )[:6]
+        # 热门文章（阅读量 + 点赞数 × 5）和最新文章，argpartition只部分排序
+        hot_articles = pick(columns.hot(6))
+        latest_articles = pick(columns.latest(6))
         
-        # 按月份统计
-        monthly_stats = self._get_monthly_stats(articles)
-        months_active = len(monthly_stats)
+        # 月度文章数统计，最近6个月用于首页
+        monthly_counts = columns.month_counts()
+        monthly_stats = dict(list(monthly_counts.items())[:6])
         
         # 提取技术关键词
         tech_keywords = self._extract_tech_keywords(articles)
         
-        # 月度文章数统计
-        monthly_counts = self._get_monthly_counts(articles)
-        
-        return {
-            'total_articles': total_articles,
-            'total_reads': total_reads,
-            'total_likes': total_likes,
-            'total_comments': total_comments,
-            'avg_reads': total_reads // total_articles if total_articles > 0 else 0,
-            'months_active': months_active,
+        self.context = BuildContext(key, {
+            'total_articles': totals['articles'],
+            'total_reads': totals['reads'],
+            'total_likes': totals['likes'],
+            'total_comments': totals['comments'],
+            'avg_reads': columns.average_reads(),
+            'median_reads': median_reads,
+            'p90_reads': p90_reads,
+            'months_active': len(monthly_stats),
             'hot_articles': hot_articles,
             'latest_articles': latest_articles,
             'monthly_stats': monthly_stats,
+            'monthly_terms': self._get_monthly_terms(),
             'tech_keywords': tech_keywords[:20],  # 前20个关键词
-            'monthly_counts': monthly_counts,
-            'current_date': datetime.now().strftime('%Y-%m-%d'),
-            'summaries': summaries or {}
-        }
-    
-    def _parse_date_for_sort(self, date_str):
-        """解析日期用于排序"""
-        if not date_str:
-            return datetime.min
-        
-        # 尝试不同的日期格式
-        formats = [
-            '%Y-%m-%d',
-            '%Y年%m月%d日',
-            '%m-%d',
-            '%m月%d日'
-        ]
-        
-        for fmt in formats:
-            try:
-                if fmt in ['%m-%d', '%m月%d日']:
-                    # 对于只有月日的格式，假设是当年
-                    parsed = datetime.strptime(date_str, fmt)
-                    return parsed.replace(year=datetime.now().year)
-                else:
-                    return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
-        
-        return datetime.min
-    
-    def _get_monthly_stats(self, articles):
-        """获取月度统计"""
-        monthly = defaultdict(int)
-        
-        for article in articles:
-            date = self._parse_date_for_sort(article.get('publish_time', ''))
-            if date != datetime.min:
-                month_key = date.strftime('%Y-%m')
-                monthly[month_key] += 1
-        
-        # 返回最近6个月的统计
-        return dict(sorted(monthly.items(), reverse=True)[:6])
+            'monthly_counts': monthly_counts
+        })
+        return self.context
     
-    def _get_monthly_counts(self, articles):
-        """获取完整的月度文章数统计"""
-        monthly = defaultdict(int)
-        
-        for article in articles:
-            date = self._parse_date_for_sort(article.get('publish_time', ''))
-            if date != datetime.min:
-                month_key = date.strftime('%Y-%m')
-                monthly[month_key] += 1
-        
-        return dict(sorted(monthly.items(), reverse=True))
+    def prepare_data(self, articles, summaries=None):
+        """准备模板数据：统计、排行和月度计数在列式数组上向量化计算，同一次构建的各页面共用"""
+        return dict(
+            self.build_context(articles).stats,
+            current_date=datetime.now().strftime('%Y-%m-%d'),
+            summaries=summaries or {}
+        )
     
     def _extract_tech_keywords(self, articles):
-        """提取技术关键词"""
-        # 技术关键词词典
-        tech_terms = {
-            'Python', 'Java', 'JavaScript', 'C++', 'Go', 'Rust', 'TypeScript',
-            'React', 'Vue', 'Angular', 'Node.js', 'Django', 'Flask', 'Spring',
-            'MySQL', 'Redis', 'MongoDB', 'PostgreSQL', 'Elasticsearch',
-            'Docker', 'Kubernetes', 'Linux', 'Git', 'GitHub', 'CI/CD',
-            'AI', '人工智能', '机器学习', '深度学习', 'ChatGPT', 'LLM',
-            '算法', '数据结构', '设计模式', 'OOP', 'API',
-            '前端', '后端', '全栈', '微服务', '分布式',
-            '云计算', '大数据', '区块链', 'Web3',
-            'TensorFlow', 'PyTorch', 'Pandas', 'NumPy',
-            'AWS', '阿里云', '腾讯云',
-            'Nginx', 'Apache', 'Tomcat',
-            'JVM', 'GC', '性能优化',
-            'CUDA', 'GPU', '并行计算',
-            'Qt', 'LVGL', 'OpenGL',
-            'Shell', 'Bash', 'PowerShell',
-            'JSON', 'XML', 'YAML', 'ProtoBuf'
-        }
-        
-        # 统计关键词出现次数
-        keyword_count = Counter()
-        
-        for article in articles:
-            title = article.get('title', '')
-            content = article.get('content', '')
-            text = (title + ' ' + content).upper()
-            
-            for term in tech_terms:
-                if term.upper() in text or term in title or term in content:
-                    keyword_count[term] += 1
-        
-        # 返回按出现频次排序的关键词
-        return [keyword for keyword, count in keyword_count.most_common()]
+        """提取技术关键词：有关键词索引时取全部文章TF-IDF最高的词，否则按包含该词的文章数从多到少排序"""
+        if self.term_index is not None:
+            keywords = self.term_index.keywords(articles, n=20)
+            if keywords:
+                return keywords
+        
+        frequency = TECH_KEYWORDS.document_frequency(
+            articles, lambda article: article.get('title', '') + ' ' + self.content_store.full_text(article)
+        )
+        return [keyword for keyword, count in frequency.most_common()]
+    
+    def _get_monthly_terms(self):
+        """每月热词（该月明显比平时更常出现的词），没有关键词索引时为空"""
+        if self.term_index is None:
+            return {}
+        return self.term_index.trending()
     
     def generate_index_page(self, articles, summaries=None):
         """生成首页"""
@@ -155,10 +132,10 @@ class PortfolioGenerator:
         html_content = template.render(**data)
         
         # 确保输出目录存在
-        os.makedirs(self.config.OUTPUT_DIR, exist_ok=True)
+        os.makedirs(self.output_dir, exist_ok=True)
         
         # 写入文件
-        output_path = os.path.join(self.config.OUTPUT_DIR, 'index.html')
+        output_path = os.path.join(self.output_dir, 'index.html')
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
         
@@ -182,33 +159,20 @@ class PortfolioGenerator:
         html_content = template.render(**data)
         
         # 写入文件
-        output_path = os.path.join(self.config.OUTPUT_DIR, 'articles.html')
+        output_path = os.path.join(self.output_dir, 'articles.html')
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
         
         print(f"文章列表页已生成: {output_path}")
         return output_path
     
-    def generate_summaries_page(self, summaries):
-        """生成月度总结页"""
+    def generate_summaries_page(self, summaries, rollups=None):
+        """生成月度总结页；提供rollups时在月度总结之前显示季度和年度回顾"""
         template = self.env.get_template('summaries.html')
         
-        # 计算总结页面的统计数据
-        total_articles_in_summaries = sum(
-            summary_data.get('article_count', 0) 
-            for summary_data in summaries.values()
-        )
-        
-        avg_articles_per_month = (
-            total_articles_in_summaries // len(summaries) 
-            if summaries else 0
-        )
-        
-        # 找出最活跃的月份
-        most_productive_month = max(
-            summaries.keys(),
-            key=lambda k: summaries[k].get('article_count', 0)
-        ) if summaries else "暂无"
+        # 总结页面的统计数据，同一次构建中只计算一次
+        context = self.context or BuildContext(None, {})
+        summary_stats = context.summary_stats(summaries)
         
         # 转换Markdown格式的总结为HTML
         processed_summaries = {}
@@ -219,18 +183,23 @@ class PortfolioGenerator:
             processed_summary['summary'] = self._simple_markdown_to_html(summary_text)
             processed_summaries[month_key] = processed_summary
         
+        processed_rollups = {
+            period: dict(entry, summary=self._simple_markdown_to_html(entry.get('summary', '')))
+            for period, entry in (rollups or {}).items()
+        }
+        
         data = {
             'summaries': processed_summaries,
-            'total_articles_in_summaries': total_articles_in_summaries,
-            'avg_articles_per_month': avg_articles_per_month,
-            'most_productive_month': most_productive_month,
+            'years': {p: e for p, e in processed_rollups.items() if e.get('level') == 'year'},
+            'quarters': {p: e for p, e in processed_rollups.items() if e.get('level') == 'quarter'},
+            **summary_stats,
             'current_date': datetime.now().strftime('%Y-%m-%d')
         }
         
         html_content = template.render(**data)
         
         # 写入文件
-        output_path = os.path.join(self.config.OUTPUT_DIR, 'summaries.html')
+        output_path = os.path.join(self.output_dir, 'summaries.html')
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
         
@@ -253,7 +222,7 @@ class PortfolioGenerator:
             html = html.replace('*', '<em>').replace('*', '</em>')
             return html
     
-    def generate_portfolio(self, articles, summaries=None):
+    def generate_portfolio(self, articles, summaries=None, rollups=None):
         """生成完整的作品集"""
         print("开始生成作品集...")
         
@@ -262,17 +231,17 @@ class PortfolioGenerator:
         articles_path = self.generate_articles_page(articles)
         
         if summaries:
-            summaries_path = self.generate_summaries_page(summaries)
+            summaries_path = self.generate_summaries_page(summaries, rollups)
         else:
             print("未提供月度总结数据，跳过总结页面生成")
         
-        print(f"作品集生成完成！输出目录: {self.config.OUTPUT_DIR}")
+        print(f"作品集生成完成！输出目录: {self.output_dir}")
         print(f"- 首页: {index_path}")
         print(f"- 文章列表: {articles_path}")
         if summaries:
             print(f"- 月度总结: {summaries_path}")
         
-        return self.config.OUTPUT_DIR
+        return self.output_dir
 
 if __name__ == "__main__":
     generator = PortfolioGenerator()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+提示词打包 - 按token预算分配文章内容
+用本地规则估算token数（中文约一字一token，英文约四个字符一token），按文章热度把正文预算分给各篇文章；
+一个月的文章放不进一个提示词时分组，供月度总结做map-reduce
+"""
+
+import math
+import re
+from article_db import article_score
+from dedup import normalize_text
+
+CJK_RANGES = '\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uff00-\uffef'
+CJK = re.compile(f'[{CJK_RANGES}]')
+WORD = re.compile(r'[A-Za-z0-9_]+')
+SYMBOL = re.compile(f'[^\\sA-Za-z0-9_{CJK_RANGES}]')
+
+
+def estimate_tokens(text):
+    """估算文本的token数：中日文字符各算一个，英文单词和数字每4个字符一个，其余符号各算一个"""
+    if not text:
+        return 0
+    words = sum(math.ceil(len(word) / 4) for word in WORD.findall(text))
+    return len(CJK.findall(text)) + words + len(SYMBOL.findall(text))
+
+
+def truncate_to_tokens(text, budget):
+    """截取不超过budget个token的前缀"""
+    if budget <= 0:
+        return ''
+    if estimate_tokens(text) <= budget:
+        return text
+
+    # token数随长度单调增加，二分查找最长的前缀
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
+
+
+def allocate(sizes, weights, budget):
+    """按权重把budget分给各项，每项不超过自身大小，分不完的部分继续按权重分给其余各项（注水算法）"""
+    shares = [0] * len(sizes)
+    active = [i for i, size in enumerate(sizes) if size > 0]
+    remaining = budget
+
+    while active and remaining > 0:
+        total_weight = sum(weights[i] for i in active)
+        capped = []
+        for i in active:
+            share = remaining * weights[i] / total_weight
+            if shares[i] + share >= sizes[i]:
+                capped.append(i)
+
+        if not capped:
+            for i in active:
+                shares[i] += remaining * weights[i] / total_weight
+            break
+
+        # 放得下全文的文章拿满，剩余预算在其余文章间重新分配
+        for i in capped:
+            remaining -= sizes[i] - shares[i]
+            shares[i] = sizes[i]
+        active = [i for i in active if i not in capped]
+
+    return [int(share) for share in shares]
+
+
+def importance(article):
+    """文章权重：热度取对数，没有阅读数据的文章也保留基础份额"""
+    return 1 + math.log1p(article_score(article))
+
+
+class PromptPacker:
+    def __init__(self, budget, min_tokens):
+        """budget为一个提示词中文章部分的token预算，min_tokens为每篇文章至少占用的token数（含标题行）"""
+        self.budget = budget
+        self.min_tokens = min_tokens
+
+    def capacity(self):
+        """一个提示词最多容纳的文章数"""
+        return max(1, self.budget // self.min_tokens)
+
+    def fits(self, articles):
+        return len(articles) <= self.capacity()
+
+    def chunks(self, articles):
+        """把文章按原顺序分成若干组，每组都能放进一个提示词"""
+        size = self.capacity()
+        count = math.ceil(len(articles) / size)
+        # 均匀分组，避免最后一组只有一两篇
+        per_chunk = math.ceil(len(articles) / count) if count else 0
+        return [articles[i:i + per_chunk] for i in range(0, len(articles), per_chunk)] if count else []
+
+    def pack(self, articles, text_of, header_of):
+        """生成文章部分的提示词文本
+
+        header_of(index, article)返回文章的标题行，text_of(article)返回正文；
+        标题行先从预算中扣除，剩余预算按文章权重分配给正文
+        """
+        headers = [header_of(i, article) for i, article in enumerate(articles, 1)]
+        bodies = [normalize_text(text_of(article)) for article in articles]
+
+        body_budget = self.budget - sum(estimate_tokens(header) for header in headers)
+        shares = allocate(
+            [estimate_tokens(body) for body in bodies],
+            [importance(article) for article in articles],
+            max(0, body_budget)
+        )
+
+        parts = []
+        for header, body, share in zip(headers, bodies, shares):
+            excerpt = truncate_to_tokens(body, share)
+            suffix = '...' if len(excerpt) < len(body) else ''
+            parts.append(f"{header}\n   内容摘要：{excerpt}{suffix}\n")
+        return '\n'.join(parts)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+抓取日志 - 追加写入的JSONL日志
+每个列表页和文章内容抓取完成后立即落盘，中断后可用 --resume 跳过已完成的部分
+"""
+
+import json
+import os
+import threading
+
+
+class ScrapeJournal:
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}  # (类型, URL) -> 结果
+
+        if resume:
+            self._load()
+        elif os.path.exists(self.path):
+            # 不续传时从头开始，丢弃上次的日志
+            os.remove(self.path)
+
+    def _load(self):
+        """读取已有日志，忽略进程崩溃时写了一半的最后一行"""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                self.entries[(record['kind'], record['url'])] = record['result']
+
+        print(f"从抓取日志恢复 {len(self.entries)} 条记录: {self.path}")
+
+    def get(self, kind, url):
+        """获取已记录的结果，没有则返回None"""
+        return self.entries.get((kind, url))
+
+    def record(self, kind, url, result):
+        """追加一条记录并立即刷到磁盘"""
+        line = json.dumps({'kind': kind, 'url': url, 'result': result}, ensure_ascii=False)
+        with self.lock:
+            self.entries[(kind, url)] = result
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+    def map(self, engine, kind, func, urls, queue=None):
+        """通过抓取引擎执行抓取：已记录的URL直接复用结果，新结果完成一条记一条"""
+        urls = list(urls)
+        results = [self.get(kind, url) for url in urls]
+        pending = [i for i, result in enumerate(results) if result is None]
+
+        def fetch_and_record(url):
+            result = func(url)
+            # 失败（None/空内容/空列表页）不记录，续传时会重新抓取
+            if result:
+                self.record(kind, url, result)
+            return result
+
+        fetched = engine.map(fetch_and_record, [urls[i] for i in pending], queue=queue)
+        for i, result in zip(pending, fetched):
+            results[i] = result
+
+        return results
+
+    def compact(self):
+        """最终数据集已保存，删除日志"""
+        with self.lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
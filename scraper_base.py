@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+爬虫公共部分 - 普通爬虫和智能爬虫共用的抓取引擎、HTTP缓存、连接池和抓取日志，
+以及经缓存发起请求、按自适应限速等待重试、按日志跳过已完成URL的并发抓取
+"""
+
+import time
+import requests
+from config import Config
+from fetch_engine import AsyncFetchEngine
+from http_cache import HTTPCache, CacheMissError
+from transport import HTTPTransport
+
+
+class ScraperBase:
+    def __init__(self, engine=None, cache=None, user_id=None, transport=None):
+        self.config = Config()
+        self.user_id = user_id or self.config.CSDN_USER_ID
+        self.base_url = self.config.base_url_for(user_id)
+        self.engine = engine or AsyncFetchEngine()
+        self.cache = cache or HTTPCache()
+        # 与另一种爬虫、其他作者共享的连接池，并发请求复用已建立的连接
+        self.transport = transport or HTTPTransport()
+        self.journal = None  # 设置后抓取结果写入ScrapeJournal，支持断点续传
+        self.headers = {}  # 每个请求都带上的请求头，单次请求传入的同名请求头优先
+
+    def _map(self, kind, func, urls):
+        """通过抓取引擎并发抓取，设置了日志时跳过已完成的URL"""
+        if self.journal:
+            return self.journal.map(self.engine, kind, func, urls, queue=self.user_id)
+        return self.engine.map(func, urls, queue=self.user_id)
+
+    def _get(self, url, **kwargs):
+        """通过缓存发起请求，并把状态码和耗时报告给抓取引擎的自适应限速"""
+        kwargs['headers'] = {**self.headers, **kwargs.get('headers', {})}
+        start = time.monotonic()
+        try:
+            response = self.cache.get(self.transport, url, **kwargs)
+        except CacheMissError:
+            raise
+        except requests.exceptions.RequestException:
+            self.engine.observe(url, None, time.monotonic() - start)
+            raise
+
+        # 离线回放没有真实请求，不影响速率
+        if not self.cache.offline:
+            self.engine.observe(url, response.status_code, time.monotonic() - start)
+        return response
+
+    def _retry_wait(self, url):
+        """按该主机当前（出错后已降低的）速率等待下一次重试的时机"""
+        wait_time = self.engine.retry_delay(url)
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
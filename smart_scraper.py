@@ -1,21 +1,24 @@
 #!/usr/bin/env python3
 """
 智能爬虫 - 专门处理CSDN反爬虫机制
-包含多种反反爬策略：代理轮换、请求头轮换、智能延迟等
+包含多种反反爬策略：代理轮换、请求头轮换、自适应限速等
 """
 
 import requests
-import time
 import random
-from bs4 import BeautifulSoup
+import re
 from urllib.parse import urljoin
-from config import Config
+from xml.etree.ElementTree import ParseError
+from http_cache import CacheMissError
+from scraper_base import ScraperBase
+from page_parser import parse_list_page, parse_article_page, title_text, parse_full_page
+from dedup import canonical_url
+from feed_parser import parse_feed
+from article_schema import normalize_article
 
-class SmartCSDNScraper:
-    def __init__(self):
-        self.config = Config()
-        self.session = requests.Session()
-        self.setup_session()
+class SmartCSDNScraper(ScraperBase):
+    def __init__(self, engine=None, cache=None, user_id=None, transport=None):
+        super().__init__(engine, cache, user_id, transport)
         
         # 用户代理池
         self.user_agents = [
@@ -26,26 +29,6 @@ class SmartCSDNScraper:
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2.1 Safari/605.1.15'
         ]
         
-    def setup_session(self):
-        """设置会话"""
-        # 设置重试策略
-        from requests.adapters import HTTPAdapter
-        from urllib3.util.retry import Retry
-        
-        retry_strategy = Retry(
-            total=5,
-            backoff_factor=3,
-            status_forcelist=[429, 500, 502, 503, 504, 521, 522, 524],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-        
-        # 设置连接池
-        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
-    
     def get_random_headers(self):
         """获取随机请求头"""
         return {
@@ -63,20 +46,8 @@ class SmartCSDNScraper:
             'Cache-Control': 'max-age=0'
         }
     
-    def smart_delay(self, base_delay=3):
-        """智能延迟 - 模拟人类行为"""
-        # 基础延迟 + 随机延迟
-        delay = base_delay + random.uniform(1, 4)
-        
-        # 偶尔添加更长的延迟，模拟用户阅读时间
-        if random.random() < 0.1:  # 10%概率
-            delay += random.uniform(5, 15)
-            print(f"模拟用户阅读，额外等待{delay-base_delay:.1f}秒...")
-        
-        time.sleep(delay)
-    
-    def safe_request(self, url, max_retries=5):
-        """安全请求 - 处理521等错误"""
+    def safe_request(self, url, max_retries=5, retry_status=None):
+        """安全请求 - 处理521等错误；retry_status判断哪些状态码值得重试，其余非200状态码直接返回None"""
         for attempt in range(max_retries):
             try:
                 # 每次请求使用随机请求头
@@ -84,11 +55,12 @@ class SmartCSDNScraper:
                 
                 # 添加Referer
                 if attempt > 0:
-                    headers['Referer'] = self.config.CSDN_BASE_URL
+                    headers['Referer'] = self.base_url
                 
                 print(f"请求 {url} (尝试 {attempt + 1}/{max_retries})")
                 
-                response = self.session.get(
+                # 通过缓存发起条件请求，304直接使用缓存内容
+                response = self._get(
                     url, 
                     headers=headers, 
                     timeout=30,
@@ -98,101 +70,137 @@ class SmartCSDNScraper:
                 # 检查响应状态
                 if response.status_code == 200:
                     return response
-                elif response.status_code == 521:
-                    wait_time = (attempt + 1) * 10 + random.uniform(5, 15)
-                    print(f"521错误，等待{wait_time:.1f}秒后重试...")
-                    time.sleep(wait_time)
-                    continue
-                elif response.status_code == 403:
-                    wait_time = (attempt + 1) * 15 + random.uniform(10, 20)
-                    print(f"403错误，等待{wait_time:.1f}秒后重试...")
-                    time.sleep(wait_time)
+                elif retry_status and not retry_status(response.status_code):
+                    print(f"HTTP {response.status_code}: {response.reason}")
+                    return None
+                elif response.status_code in (521, 403, 429):
+                    # 抓取引擎已按错误降低该主机速率，重试等待由降低后的速率决定
+                    print(f"{response.status_code}错误，等待{self._retry_wait(url):.1f}秒后重试...")
                     continue
                 else:
                     print(f"HTTP {response.status_code}: {response.reason}")
                     if attempt < max_retries - 1:
-                        self.smart_delay(5)
+                        self._retry_wait(url)
                         continue
                     else:
                         break
                         
+            except CacheMissError as e:
+                print(e)
+                return None
             except requests.exceptions.RequestException as e:
                 print(f"请求异常: {e}")
                 if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 5
-                    print(f"等待{wait_time}秒后重试...")
-                    time.sleep(wait_time)
+                    print(f"等待{self._retry_wait(url):.1f}秒后重试...")
                     continue
                 else:
                     break
         
         return None
     
-    def get_article_list_smart(self, max_pages=3):
-        """智能获取文章列表"""
-        articles = []
+    def get_article_list_smart(self, max_pages=3, known_urls=None, start_page=1):
+        """智能获取文章列表（按并发窗口批量抓取列表页）
         
+        传入known_urls时为增量模式：遇到已保存的文章所在页即停止翻页
+        """
+        articles = []
+        for page_articles in self.iter_article_pages_smart(max_pages, known_urls, start_page):
+            articles.extend(page_articles)
+        return articles
+    
+    def iter_article_pages_smart(self, max_pages=3, known_urls=None, start_page=1):
+        """逐页产出文章列表，供流水线边抓取边处理；start_page之前的页已由订阅源覆盖时跳过"""
         print(f"开始智能爬取，最多{max_pages}页...")
         
-        for page in range(1, max_pages + 1):
-            print(f"\n=== 爬取第{page}页 ===")
-            
-            # 构建URL
-            url = f"{self.config.CSDN_BASE_URL}/article/list/{page}"
-            
-            # 智能延迟
-            if page > 1:
-                self.smart_delay()
-            
-            # 安全请求
-            response = self.safe_request(url)
-            
-            if not response:
-                print(f"第{page}页请求失败，跳过")
-                continue
-            
-            # 解析页面
-            soup = BeautifulSoup(response.text, 'html.parser')
+        # 增量模式先只抓第一页，没有遇到已保存的文章才按并发窗口批量翻页
+        window = 1 if known_urls else self.engine.concurrency
+        first_page = start_page
+        while first_page <= max_pages:
+            pages = list(range(first_page, min(first_page + window, max_pages + 1)))
+            first_page = pages[-1] + 1
+            window = self.engine.concurrency
+            print(f"\n=== 爬取第{pages[0]}-{pages[-1]}页 ===")
             
-            # 查找文章 - 多种选择器
-            selectors = [
-                'div.article-item-box',
-                'div.blog-list-box', 
-                'article',
-                'div[class*="article"]',
-                'div[class*="blog"]'
-            ]
+            urls = [f"{self.base_url}/article/list/{page}" for page in pages]
+            results = self._map('page', self._fetch_list_page_smart, urls)
             
-            article_items = []
+            for page, page_articles in zip(pages, results):
+                if page_articles is None:
+                    print(f"第{page}页请求失败，跳过")
+                    continue
+                
+                print(f"第{page}页成功获取{len(page_articles)}篇文章")
+                yield page_articles
+                
+                if known_urls and any(a['url'] in known_urls for a in page_articles):
+                    print(f"第{page}页遇到已保存的文章，停止翻页")
+                    return
+                
+                # 如果获取的文章很少，可能遇到了限制
+                if len(page_articles) < 5 and page > 1:
+                    print("获取文章数量异常，可能遇到反爬限制，停止爬取")
+                    return
+    
+    def get_feed_articles(self):
+        """读取作者的RSS订阅源，一次请求返回最近的文章（没有统计数据）；订阅源不可用时返回None"""
+        feed_url = f"{self.base_url}{self.config.FEED_PATH}"
+        return self.engine.map(self._fetch_feed, [feed_url], queue=self.user_id)[0]
+    
+    def _fetch_feed(self, url):
+        # 404/410说明作者没有订阅源，立即退回列表页；只有服务端错误和限流才值得重试
+        response = self.safe_request(url, retry_status=lambda status: status == 429 or status >= 500)
+        if not response:
+            return None
+        
+        try:
+            articles = parse_feed(response.content)
+        except ParseError as e:
+            print(f"订阅源解析失败: {e}")
+            return None
+        
+        print(f"订阅源共{len(articles)}篇文章")
+        return articles
+    
+    def _fetch_list_page_smart(self, url):
+        """抓取并解析单个列表页，请求失败返回None"""
+        response = self.safe_request(url)
+        
+        if not response:
+            return None
+        
+        # 查找文章 - 多种选择器
+        # 先只解析文章列表容器；找不到时再整页解析，用宽泛选择器兜底
+        selector_groups = [
+            (parse_list_page, ['div.article-item-box', 'div.blog-list-box', 'article']),
+            (parse_full_page, ['div[class*="article"]', 'div[class*="blog"]'])
+        ]
+        
+        article_items = []
+        for parse, selectors in selector_groups:
+            soup = parse(response.text)
             for selector in selectors:
                 items = soup.select(selector)
                 if items:
                     article_items = items
                     print(f"使用选择器 '{selector}' 找到{len(items)}篇文章")
                     break
-            
-            if not article_items:
-                print("未找到文章，可能遇到反爬限制")
-                print("页面内容预览:")
-                print(response.text[:500])
-                continue
-            
-            # 提取文章信息
-            page_articles = []
-            for item in article_items:
-                article_info = self.extract_article_info_smart(item)
-                if article_info:
-                    page_articles.append(article_info)
-            
-            articles.extend(page_articles)
-            print(f"第{page}页成功获取{len(page_articles)}篇文章")
-            
-            # 如果获取的文章很少，可能遇到了限制
-            if len(page_articles) < 5 and page > 1:
-                print("获取文章数量异常，可能遇到反爬限制，停止爬取")
+            if article_items:
                 break
         
-        return articles
+        if not article_items:
+            print("未找到文章，可能遇到反爬限制")
+            print("页面内容预览:")
+            print(response.text[:500])
+            return []
+        
+        # 提取文章信息
+        page_articles = []
+        for item in article_items:
+            article_info = self.extract_article_info_smart(item)
+            if article_info:
+                page_articles.append(article_info)
+        
+        return page_articles
     
     def extract_article_info_smart(self, item):
         """智能提取文章信息"""
@@ -208,7 +216,7 @@ class SmartCSDNScraper:
             if not title_elem:
                 return None
             
-            title = title_elem.get_text(strip=True)
+            title = title_text(title_elem)
             
             # 获取链接，优先从a标签获取
             if title_elem.name == 'a':
@@ -219,7 +227,8 @@ class SmartCSDNScraper:
                 article_url = link_elem.get('href', '') if link_elem else ''
             
             if not article_url.startswith('http'):
-                article_url = urljoin(self.config.CSDN_BASE_URL, article_url)
+                article_url = urljoin(self.base_url, article_url)
+            article_url = canonical_url(article_url)
             
             # 提取时间
             time_elem = item.find('span', class_='date') or item.find('time')
@@ -230,7 +239,7 @@ class SmartCSDNScraper:
             like_count = self.extract_number(item, ['点赞', 'like', '👍'])
             comment_count = self.extract_number(item, ['评论', 'comment'])
             
-            return {
+            return normalize_article({
                 'title': title,
                 'url': article_url,
                 'publish_time': publish_time,
@@ -238,20 +247,20 @@ class SmartCSDNScraper:
                 'like_count': like_count,
                 'comment_count': comment_count,
                 'content': ''  # 稍后获取
-            }
+            })
             
         except Exception as e:
             print(f"提取文章信息出错: {e}")
             return None
     
     def extract_number(self, element, keywords):
-        """从元素中提取数字"""
+        """从元素中提取数字：取包含关键词的统计标签中的第一个数字（跳过标题里的数字）"""
         try:
-            text = element.get_text()
             for keyword in keywords:
-                if keyword in text:
-                    import re
-                    numbers = re.findall(r'\d+', text)
+                for node in element.find_all(string=lambda text: text and keyword in text):
+                    if node.find_parent(['h4', 'a']) is not None:
+                        continue
+                    numbers = re.findall(r'\d+', node.parent.get_text())
                     if numbers:
                         return int(numbers[0])
             return 0
@@ -260,16 +269,23 @@ class SmartCSDNScraper:
     
     def get_article_content_smart(self, article_url):
         """智能获取文章内容"""
+        return self.get_article_contents_smart([article_url])[0]
+    
+    def get_article_contents_smart(self, article_urls):
+        """并发获取多篇文章内容，结果顺序与article_urls一致"""
+        results = self._map('content', self._fetch_article_content_smart, article_urls)
+        return [content or "" for content in results]
+    
+    def _fetch_article_content_smart(self, article_url):
+        """抓取单篇文章内容"""
         print(f"获取文章内容: {article_url}")
         
-        # 智能延迟
-        self.smart_delay(2)
-        
         response = self.safe_request(article_url)
         if not response:
             return ""
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # 只解析正文容器
+        soup = parse_article_page(response.text)
         
         # 多种内容选择器
         content_selectors = [
@@ -284,11 +300,8 @@ class SmartCSDNScraper:
         for selector in content_selectors:
             content_elem = soup.select_one(selector)
             if content_elem:
-                content = content_elem.get_text(separator='\n', strip=True)
-                # 限制长度
-                if len(content) > 1500:
-                    content = content[:1500] + "..."
-                return content
+                # 返回完整正文，由ContentStore压缩保存
+                return content_elem.get_text(separator='\n', strip=True)
         
         return ""
 
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+语料级关键词索引 - TF-IDF
+中文按字符n-gram、英文按单词切分，词表和每篇文章的词频保存在数据库中，文档频率（DF）随文章增删增量更新，
+构建网站时只需切分新增或变化的文章；TF-IDF用SciPy稀疏矩阵计算，给出全站关键词、每月热词和任意文章集合的关键词
+"""
+
+import hashlib
+import re
+import threading
+from collections import Counter
+import numpy as np
+from scipy import sparse
+from config import Config
+from article_schema import ensure_normalized
+from article_db import article_keys
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE,
+    display TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS term_docs (
+    author TEXT NOT NULL,
+    url TEXT NOT NULL,  -- 文章键（article_db.article_keys），url唯一时就是url
+    fingerprint TEXT NOT NULL,
+    month TEXT,
+    term_ids BLOB NOT NULL,
+    counts BLOB NOT NULL,
+    PRIMARY KEY (author, url)
+);
+
+CREATE TABLE IF NOT EXISTS term_df (
+    author TEXT NOT NULL,
+    term_id INTEGER NOT NULL,
+    df INTEGER NOT NULL,
+    PRIMARY KEY (author, term_id)
+);
+"""
+
+CJK_RUN = re.compile(r'[一-鿿]+')
+ENGLISH_WORD = re.compile(r'[A-Za-z][A-Za-z0-9+#]*(?:[._-][A-Za-z0-9+#]+)*')
+
+# 含有这些虚词的中文n-gram不作为关键词
+CJK_STOP_CHARS = '的了和是在与及或等为对将把被从这那个们也就都而其之以于我你他它吗呢吧啊着过很还'
+CJK_STOP_SPLIT = re.compile(f'[{CJK_STOP_CHARS} ]+')
+
+ENGLISH_STOP_WORDS = {
+    'the', 'and', 'for', 'with', 'this', 'that', 'from', 'are', 'was', 'you', 'your', 'not', 'but',
+    'can', 'all', 'has', 'have', 'will', 'into', 'use', 'using', 'how', 'what', 'why', 'when',
+    'which', 'its', 'our', 'their', 'http', 'https', 'www', 'com'
+}
+
+# 中文n-gram相互重叠、DF之比不低于该值时，认为是同一个短语的片段，拼接为一个短语（不超过最大长度）
+SUBSUME_RATIO = 0.8
+MAX_PHRASE_LENGTH = 8
+
+
+def cjk_ngrams(text, ngrams=None):
+    """中文连续汉字的n-gram（长度范围ngrams），先在虚词处断开，n-gram不会跨过虚词"""
+    low, high = ngrams or Config.TERM_NGRAMS
+    grams = []
+    for run in CJK_STOP_SPLIT.split(' '.join(CJK_RUN.findall(text))):
+        for n in range(low, min(high, len(run)) + 1):
+            grams.extend([run[i:i + n] for i in range(len(run) - n + 1)])
+    return grams
+
+
+def english_words(text):
+    """英文单词（保留原始写法），去掉单个字母和停用词"""
+    return [
+        word for word in ENGLISH_WORD.findall(text)
+        if len(word) >= 2 and word.lower() not in ENGLISH_STOP_WORDS
+    ]
+
+
+def tokenize(text, ngrams=None):
+    """切分文本，返回原始写法的词列表：中文n-gram和英文单词"""
+    return cjk_ngrams(text, ngrams) + english_words(text)
+
+
+def count_terms(title, text):
+    """词频和英文词第一次出现时的写法（英文不区分大小写，中文的写法即词本身）；标题中的词计2次"""
+    counts = Counter(cjk_ngrams(text))
+    title_grams = cjk_ngrams(title)
+    counts.update(title_grams)
+    counts.update(title_grams)
+
+    display = {}
+    words = english_words(text) + english_words(title) * 2
+    for word in words:
+        display.setdefault(word.lower(), word)
+    counts.update(word.lower() for word in words)
+    return counts, display
+
+
+def _merge(a, b):
+    """两个中文n-gram重叠（包含，或一个的结尾是另一个的开头）时返回拼接成的短语，否则返回None；
+    英文单词之间（如Go和Google）不合并"""
+    if a.isascii() or b.isascii():
+        return None
+    if b in a:
+        return a
+    if a in b:
+        return b
+    for k in range(min(len(a), len(b)) - 1, 0, -1):
+        if a.endswith(b[:k]):
+            return a + b[k:]
+        if b.endswith(a[:k]):
+            return b + a[k:]
+    return None
+
+
+class TermIndex:
+    def __init__(self, db, content_store, author=''):
+        """db为ArticleDB（与文章共用一个数据库），content_store用于读取文章全文"""
+        self.config = Config()
+        self.db = db
+        self.content_store = content_store
+        self.author = author
+        self.lock = threading.Lock()
+        self.loaded = False
+
+        with self.db.lock, self.db.conn:
+            self.db.conn.executescript(SCHEMA)
+
+    def _load(self):
+        """第一次使用时把词表、作者的文档词频和DF读入内存"""
+        if self.loaded:
+            return
+
+        with self.db.lock:
+            term_rows = self.db.conn.execute('SELECT id, term, display FROM terms').fetchall()
+            doc_rows = self.db.conn.execute(
+                'SELECT url, fingerprint, month, term_ids, counts FROM term_docs WHERE author = ?', (self.author,)
+            ).fetchall()
+            df_rows = self.db.conn.execute(
+                'SELECT term_id, df FROM term_df WHERE author = ?', (self.author,)
+            ).fetchall()
+
+        self.term_ids = {row[1]: row[0] for row in term_rows}
+        self.display = {row[0]: row[2] for row in term_rows}
+        self.docs = {
+            row[0]: (row[1], row[2], np.frombuffer(row[3], dtype=np.int32), np.frombuffer(row[4], dtype=np.int32))
+            for row in doc_rows
+        }
+        self.df = np.zeros(max(self.display, default=0) + 1, dtype=np.int64)
+        for term_id, df in df_rows:
+            self.df[term_id] = df
+        self.loaded = True
+
+    def fingerprint(self, article):
+        """判断文章是否需要重新切分：标题 + 全文的保存时间，旧数据没有全文存储时用记录里的内容"""
+        stored_at = self.content_store.stored_at(article) if article.get('content_id') else None
+        if stored_at is not None:
+            basis = f"{article.get('title', '')}\t{article['content_id']}\t{stored_at}"
+        else:
+            basis = f"{article.get('title', '')}\t{article.get('content', '')}"
+        return hashlib.sha1(basis.encode('utf-8')).hexdigest()[:16]
+
+    def _count(self, article):
+        return count_terms(article.get('title', ''), self.content_store.full_text(article))
+
+    def sync(self, articles, complete=True):
+        """让索引与作者的完整文章集合一致：只切分新增或变化的文章，删除已不存在的文章，DF按差量更新
+
+        complete=False时articles只是一部分（流水线中刚抓完的一批），只加入或更新这些文章，不删除其他文章
+        """
+        with self.lock:
+            self._load()
+            # 与文章表使用同一个键，url重复的文章（如示例数据）各自是一篇文档
+            articles = ensure_normalized(articles)
+            articles = dict(zip(article_keys(articles), articles))
+            removed = [key for key in self.docs if key not in articles] if complete else []
+            changed = []
+            for key, article in articles.items():
+                fingerprint = self.fingerprint(article)
+                doc = self.docs.get(key)
+                if doc is None or doc[0] != fingerprint:
+                    changed.append((key, article, fingerprint))
+
+            if not changed and not removed:
+                return 0, 0
+
+            counted = [(key, article, fingerprint, *self._count(article)) for key, article, fingerprint in changed]
+            new_terms = {}
+            for _, _, _, counts, display in counted:
+                for key in counts:
+                    if key not in self.term_ids:
+                        new_terms.setdefault(key, display.get(key, key))
+
+            with self.db.lock, self.db.conn:
+                conn = self.db.conn
+                if new_terms:
+                    conn.executemany('INSERT OR IGNORE INTO terms (term, display) VALUES (?, ?)', new_terms.items())
+                    # 多作者共用词表，另一个作者可能已插入同一个词，按词回查ID
+                    keys = list(new_terms)
+                    for start in range(0, len(keys), 500):
+                        batch = keys[start:start + 500]
+                        rows = conn.execute(
+                            f"SELECT id, term, display FROM terms WHERE term IN ({','.join('?' * len(batch))})", batch
+                        ).fetchall()
+                        for term_id, term, display in rows:
+                            self.term_ids[term] = term_id
+                            self.display[term_id] = display
+
+                size = max(self.display, default=0) + 1
+                delta = np.zeros(size, dtype=np.int64)
+                old_ids = [self.docs[key][2] for key in removed]
+                old_ids += [self.docs[key][2] for key, _, _ in changed if key in self.docs]
+                for ids in old_ids:
+                    delta[ids] -= 1
+
+                rows = []
+                for key, article, fingerprint, counts, _ in counted:
+                    ids, values = self._vector(counts)
+                    delta[ids] += 1
+                    self.docs[key] = (fingerprint, article['month'], ids, values)
+                    rows.append((
+                        self.author, key, fingerprint, article['month'], ids.tobytes(), values.tobytes()
+                    ))
+
+                conn.executemany(
+                    'DELETE FROM term_docs WHERE author = ? AND url = ?', [(self.author, key) for key in removed]
+                )
+                conn.executemany("""
+                    INSERT INTO term_docs (author, url, fingerprint, month, term_ids, counts)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(author, url) DO UPDATE SET
+                        fingerprint = excluded.fingerprint,
+                        month = excluded.month,
+                        term_ids = excluded.term_ids,
+                        counts = excluded.counts
+                """, rows)
+
+                touched = np.flatnonzero(delta)
+                conn.executemany("""
+                    INSERT INTO term_df (author, term_id, df) VALUES (?, ?, ?)
+                    ON CONFLICT(author, term_id) DO UPDATE SET df = df + excluded.df
+                """, [(self.author, int(i), int(delta[i])) for i in touched])
+                conn.execute('DELETE FROM term_df WHERE author = ? AND df <= 0', (self.author,))
+
+            for key in removed:
+                del self.docs[key]
+            if len(self.df) < size:
+                self.df = np.concatenate([self.df, np.zeros(size - len(self.df), dtype=np.int64)])
+            self.df[:size] += delta
+
+        print(f"关键词索引: 切分{len(changed)}篇，移除{len(removed)}篇，共{len(self.docs)}篇文章、{len(self.term_ids)}个词")
+        return len(changed), len(removed)
+
+    def _vector(self, counts):
+        """词频Counter转为按词ID排序的(词ID数组, 词频数组)，词表中没有的词忽略"""
+        ids = np.fromiter((self.term_ids.get(key, -1) for key in counts), dtype=np.int32, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.int32, count=len(counts))
+        order = np.argsort(ids)
+        ids, values = ids[order], values[order]
+        keep = ids >= 0
+        return ids[keep], values[keep]
+
+    def _vectors(self, articles):
+        """文章的(词ID, 词频)：索引中指纹一致的直接使用，否则临时切分（只保留索引中已有的词）"""
+        vectors = []
+        articles = ensure_normalized(articles)
+        for key, article in zip(article_keys(articles), articles):
+            doc = self.docs.get(key)
+            if doc is not None and doc[0] == self.fingerprint(article):
+                vectors.append((doc[2], doc[3]))
+                continue
+            vectors.append(self._vector(self._count(article)[0]))
+        return vectors
+
+    def _tfidf(self, vectors):
+        """TF-IDF矩阵（文章 × 词）：词频取对数，IDF平滑，每行L2归一化"""
+        size = len(self.df)
+        indptr = np.concatenate([[0], np.cumsum([len(ids) for ids, _ in vectors])])
+        indices = np.concatenate([ids for ids, _ in vectors]) if vectors else np.zeros(0, dtype=np.int32)
+        data = np.concatenate([counts for _, counts in vectors]).astype(np.float64) if vectors else np.zeros(0)
+        matrix = sparse.csr_matrix((1 + np.log(data), indices, indptr), shape=(len(vectors), size))
+
+        idf = np.log((1 + len(self.docs)) / (1 + self.df)) + 1
+        matrix = matrix.multiply(idf).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms) @ matrix
+
+    def _candidates(self):
+        """可以作为关键词的词：至少出现在TERM_MIN_DF篇文章中，且不超过TERM_MAX_DF比例（排除模板文字）"""
+        return (self.df >= self.config.TERM_MIN_DF) & (self.df <= self.config.TERM_MAX_DF * len(self.docs))
+
+    def _similar_df(self, a, b):
+        low, high = sorted((self.df[a], self.df[b]))
+        return low >= SUBSUME_RATIO * high
+
+    def _select(self, term_ids, scores, n):
+        """按分数从高到低取n个词；同一短语的多个中文n-gram片段拼接为一个短语"""
+        scores = scores * self._candidates()[term_ids]
+        keep = scores > 0
+        term_ids, scores = term_ids[keep], scores[keep]
+        if len(scores) > n * 10:
+            top = np.argpartition(-scores, n * 10)[:n * 10]
+            term_ids, scores = term_ids[top], scores[top]
+
+        # [短语, 代表词ID]，代表词用于比较DF
+        selected = []
+        for term_id in term_ids[np.argsort(-scores, kind='stable')]:
+            if len(selected) >= n:
+                break
+            phrase = self.display[term_id]
+            related = []
+            for entry in selected:
+                merged = _merge(entry[0], phrase)
+                if merged and self._similar_df(term_id, entry[1]):
+                    related.append(entry)
+                    phrase = merged
+            if not related:
+                selected.append([phrase, term_id])
+            elif len(phrase) <= MAX_PHRASE_LENGTH:
+                related[0][0] = phrase
+                selected = [entry for entry in selected if not any(entry is r for r in related[1:])]
+        return [entry[0] for entry in selected]
+
+    def keywords(self, articles=None, n=20):
+        """文章集合（默认为索引中作者的全部文章）的关键词：各篇TF-IDF之和最高的词"""
+        with self.lock:
+            self._load()
+            vectors = [(doc[2], doc[3]) for doc in self.docs.values()] if articles is None else self._vectors(articles)
+            if not vectors:
+                return []
+            scores = np.asarray(self._tfidf(vectors).sum(axis=0)).ravel()
+            return self._select(np.arange(len(scores)), scores, n)
+
+    def trending(self, n=None):
+        """每月热词：该月文章的平均TF-IDF比全部文章的平均值高出最多的词，返回{月份: 词列表}（月份倒序）"""
+        n = n or self.config.TERM_TRENDING
+        with self.lock:
+            self._load()
+            docs = [doc for doc in self.docs.values() if doc[1]]
+            if not docs:
+                return {}
+            matrix = self._tfidf([(doc[2], doc[3]) for doc in docs])
+            months, month_index = np.unique([doc[1] for doc in docs], return_inverse=True)
+
+            # 月份指示矩阵按每月文章数归一化，一次稀疏乘法得到各月的平均TF-IDF
+            month_sizes = np.bincount(month_index)
+            indicator = sparse.csr_matrix(
+                (1 / month_sizes[month_index], (month_index, np.arange(len(docs)))), shape=(len(months), len(docs))
+            )
+            month_means = (indicator @ matrix).tocsr()
+            baseline = np.asarray(matrix.mean(axis=0)).ravel()
+
+            trending = {}
+            for row, month in enumerate(months):
+                start, end = month_means.indptr[row], month_means.indptr[row + 1]
+                term_ids = month_means.indices[start:end]
+                lift = month_means.data[start:end] - baseline[term_ids]
+                trending[str(month)] = self._select(term_ids, lift, n)
+            return dict(sorted(trending.items(), reverse=True))
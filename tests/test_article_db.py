@@ -0,0 +1,67 @@
+import json
+import os
+
+from article_db import ArticleDB, article_keys
+from article_schema import ensure_normalized
+
+SAMPLE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'articles.json')
+
+
+def load_sample():
+    with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
+        return ensure_normalized(json.load(f))
+
+
+def test_import_shipped_json_keeps_every_article():
+    articles = load_sample()
+    db = ArticleDB(':memory:')
+    db.upsert_articles(articles, 'author')
+
+    assert db.count('author') == len(articles) == 80
+    assert sum(db.month_counts('author').values()) == 80
+    assert [a['title'] for a in db.all_articles('author')] == [a['title'] for a in articles]
+
+
+def test_resave_is_stable():
+    articles = load_sample()
+    db = ArticleDB(':memory:')
+    db.upsert_articles(articles, 'author')
+    db.replace_articles(load_sample(), 'author')
+    db.upsert_articles(load_sample(), 'author')
+
+    assert db.count('author') == 80
+
+
+def test_unique_urls_are_the_keys():
+    articles = ensure_normalized([
+        {'title': 'A', 'url': 'https://blog.csdn.net/u/article/details/1', 'publish_time': '2025-09-01'},
+        {'title': 'B', 'url': 'https://blog.csdn.net/u/article/details/2', 'publish_time': '2025-09-02'},
+    ])
+    assert article_keys(articles) == [a['url'] for a in articles]
+
+
+def test_same_url_in_two_authors():
+    article = {'title': 'A', 'url': 'https://blog.csdn.net/u/article/details/1', 'publish_time': '2025-09-01'}
+    db = ArticleDB(':memory:')
+    db.upsert_articles([dict(article)], 'a')
+    db.upsert_articles([dict(article)], 'b')
+
+    assert db.count('a') == db.count('b') == 1
+
+
+def test_replace_summaries_drops_stale_months():
+    db = ArticleDB(':memory:')
+    db.upsert_summaries({'2025-09': {'article_count': 3}, '2025-07': {'article_count': 1}}, 'a')
+    db.upsert_summaries({'2025-07': {'article_count': 2}}, 'b')
+    db.replace_summaries({'2025-09': {'article_count': 4}}, 'a')
+
+    assert db.summaries('a') == {'2025-09': {'article_count': 4}}
+    assert db.summaries('b') == {'2025-07': {'article_count': 2}}
+
+
+def test_replace_rollups_drops_stale_periods():
+    db = ArticleDB(':memory:')
+    db.upsert_rollups({'2025-Q3': {'level': 'quarter'}, '2025-Q2': {'level': 'quarter'}}, 'a')
+    db.replace_rollups({'2025-Q3': {'level': 'quarter'}}, 'a')
+
+    assert list(db.rollups('a')) == ['2025-Q3']
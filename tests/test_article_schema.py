@@ -0,0 +1,45 @@
+import json
+import os
+
+import fixtures
+from article_schema import TITLE_LABELS, clean_title, ensure_normalized, normalize_article
+from page_parser import parse_list_page, title_text
+
+SAMPLE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'articles.json')
+
+
+def test_title_starting_with_label_word_is_kept():
+    assert clean_title('翻译工作流实践') == '翻译工作流实践'
+    assert clean_title('原创设计模式') == '原创设计模式'
+    assert normalize_article({'title': '转载工具对比'})['title'] == '转载工具对比'
+
+
+def test_separated_label_is_removed():
+    assert clean_title('原创 Redis 深入') == 'Redis 深入'
+    assert clean_title('【转载】Kubernetes 入门') == 'Kubernetes 入门'
+    assert clean_title('翻译：Attention Is All You Need') == 'Attention Is All You Need'
+
+
+def test_list_page_title_drops_article_type_span():
+    articles = fixtures.generate_articles(2, base_url='https://blog.csdn.net/u')
+    articles[0]['title'] = '翻译工作流实践'
+    soup = parse_list_page(fixtures.render_list_page(articles))
+
+    titles = [title_text(h4) for h4 in soup.find_all('h4')]
+    assert titles == [article['title'] for article in articles]
+
+
+def test_shipped_json_titles_lose_the_glued_label():
+    with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+    originals = [article['title'] for article in raw]
+    articles = ensure_normalized(raw)
+
+    assert not any(article['title'].startswith(TITLE_LABELS) for article in articles)
+    assert articles[1]['title'] == originals[1][len('原创'):] == '9.15 拓扑'
+    assert articles[0]['title'].startswith('【2024 CSDN博客之星】')
+
+
+def test_normalized_records_are_not_stripped_again():
+    articles = ensure_normalized([{'title': '翻译工作流实践', 'publish_time': '2025-09-01', 'month': '2025-09'}])
+    assert articles[0]['title'] == '翻译工作流实践'
@@ -0,0 +1,29 @@
+import json
+import os
+
+from article_schema import ensure_normalized
+from content_store import ContentStore, article_id
+
+SAMPLE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'articles.json')
+
+
+def load_sample():
+    with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
+        return ensure_normalized(json.load(f))
+
+
+def test_article_id():
+    url = 'https://blog.csdn.net/u/article/details/123'
+    assert article_id(url) == '123'
+    assert article_id(url + '?spm=1') == '123'
+    assert article_id(url + '#0123456789ab') not in ('123', article_id(url + '#ba9876543210'))
+
+
+def test_shipped_json_stores_every_body(tmp_path):
+    articles = [article for article in load_sample() if article.get('content')]
+    bodies = [article['content'] for article in articles]
+    store = ContentStore(str(tmp_path))
+
+    assert store.store_articles(articles) == len(articles) > 1
+    assert len({article['content_id'] for article in articles}) == len(articles)
+    assert [store.full_text(article) for article in articles] == bodies
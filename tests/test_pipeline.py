@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from article_schema import ensure_normalized
+from pipeline import StagedPipeline
+
+
+class StubSummarizer:
+    def group_articles_by_month(self, articles):
+        monthly = {}
+        for article in ensure_normalized(articles):
+            monthly.setdefault(article['month'], []).append(article)
+        return monthly
+
+    def executor(self):
+        return ThreadPoolExecutor(max_workers=2)
+
+    def summarize_month(self, month_key, articles, cached=None):
+        return {'article_count': len(articles), 'articles': articles}
+
+
+class StubTermIndex:
+    def sync(self, articles, complete=True):
+        pass
+
+
+class StubGenerator:
+    output_dir = 'portfolio'
+
+    def generate_index_page(self, articles):
+        pass
+
+    def generate_articles_page(self, articles):
+        pass
+
+    def generate_summaries_page(self, summaries, rollups=None):
+        pass
+
+
+class StubApp:
+    def __init__(self, pages):
+        self.pages = pages
+        self.summarizer = StubSummarizer()
+        self.term_index = StubTermIndex()
+        self.generator = StubGenerator()
+        self.saved = None
+
+    def scrape_articles(self, max_pages, force_refresh, incremental, resume, on_batch):
+        articles = []
+        for page in self.pages:
+            on_batch(page)
+            articles.extend(page)
+        return articles
+
+    def load_summaries(self):
+        return {}
+
+    def save_summaries(self, summaries):
+        self.saved = summaries
+
+    def generate_rollups(self, summaries, force_refresh=False):
+        return {}
+
+
+def article(n, publish_time):
+    return {'title': f'文章{n}', 'url': f'https://blog.csdn.net/u/article/details/{n}', 'publish_time': publish_time}
+
+
+def test_pinned_old_article_does_not_split_a_month():
+    # 第1页：置顶的2024年文章 + 4篇8月文章；第2页：另外4篇8月文章和7月文章
+    page1 = [article(0, '2024-03-01 10:00:00')] + [article(n, f'2025-08-{28 - n:02d} 10:00:00') for n in range(1, 5)]
+    page2 = [article(n, f'2025-08-{28 - n:02d} 10:00:00') for n in range(5, 9)] + [article(9, '2025-07-30 10:00:00')]
+    app = StubApp([page1, page2])
+
+    _, summaries, _ = StagedPipeline(app).run()
+
+    assert summaries['2025-08']['article_count'] == 8
+    assert summaries['2025-07']['article_count'] == 1
+    assert summaries['2024-03']['article_count'] == 1
+    assert app.saved == summaries
@@ -0,0 +1,22 @@
+import json
+import os
+
+from article_db import ArticleDB
+from article_schema import ensure_normalized
+from content_store import ContentStore
+from term_index import TermIndex
+
+SAMPLE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'articles.json')
+
+
+def load_sample():
+    with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
+        return ensure_normalized(json.load(f))
+
+
+def test_shipped_json_indexes_every_article(tmp_path):
+    index = TermIndex(ArticleDB(':memory:'), ContentStore(str(tmp_path)), 'author')
+
+    assert index.sync(load_sample()) == (80, 0)
+    assert index.sync(load_sample()) == (0, 0)
+    assert len(index.docs) == 80
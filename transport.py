@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+HTTP传输层 - 两个爬虫共享的连接池会话
+可配置连接池大小、keep-alive复用、连接错误重试和默认超时，
+并记录每个请求的连接、TLS握手、首字节时间和字节数
+"""
+
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+from config import Config
+
+# 当前线程正在发送的请求的计时记录（requests在调用线程内同步完成连接和收发）
+_current = threading.local()
+
+
+def _record(key, seconds):
+    stats = getattr(_current, 'stats', None)
+    if stats is not None:
+        stats[key] += seconds
+
+
+class _TimedConnectionMixin:
+    """记录TCP连接和TLS握手的耗时"""
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        conn = super()._new_conn()
+        self._tcp_time = time.perf_counter() - start
+        _record('connect', self._tcp_time)
+        return conn
+
+    def connect(self):
+        self._tcp_time = 0.0
+        start = time.perf_counter()
+        super().connect()
+        if isinstance(self, HTTPSConnection):
+            # 总建连耗时减去TCP连接耗时即为TLS握手耗时
+            _record('tls', max(time.perf_counter() - start - self._tcp_time, 0.0))
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """使用计时连接的适配器"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool
+        }
+
+
+class HTTPTransport:
+    def __init__(self, pool_size=None, retries=None, timeout=None):
+        self.config = Config()
+        self.pool_size = pool_size or self.config.HTTP_POOL_SIZE
+        self.timeout = timeout or self.config.HTTP_TIMEOUT
+        retries = self.config.HTTP_RETRIES if retries is None else retries
+
+        # 只重试连接/读取错误；429/5xx/521由爬虫结合自适应限速处理
+        retry_strategy = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=0,
+            backoff_factor=0.5,
+            allowed_methods=["HEAD", "GET", "OPTIONS"],
+            raise_on_status=False
+        )
+        adapter = TimedHTTPAdapter(
+            pool_connections=self.config.HTTP_POOL_HOSTS,
+            pool_maxsize=self.pool_size,
+            max_retries=retry_strategy
+        )
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.totals = {'connect': 0.0, 'tls': 0.0, 'ttfb': 0.0, 'bytes': 0}
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        """GET请求，参数与session.get一致；响应的transfer_stats属性为本次请求的计时"""
+        _current.stats = {'connect': 0.0, 'tls': 0.0}
+        try:
+            response = self.session.get(url, headers=headers, timeout=timeout or self.timeout, **kwargs)
+            stats = dict(_current.stats)
+        finally:
+            _current.stats = None
+
+        stats['reused'] = stats['connect'] == 0
+        stats['ttfb'] = response.elapsed.total_seconds()
+        stats['bytes'] = len(response.content)
+        response.transfer_stats = stats
+
+        with self.lock:
+            self.requests += 1
+            if not stats['reused']:
+                self.new_connections += 1
+            for key in self.totals:
+                self.totals[key] += stats[key]
+
+        return response
+
+    def summary(self):
+        """传输统计摘要"""
+        if not self.requests:
+            return "HTTP请求 0 次"
+        n = self.requests
+        return (
+            f"HTTP请求 {n} 次，新建连接 {self.new_connections} 次（复用率 {1 - self.new_connections / n:.0%}），"
+            f"平均连接 {self.totals['connect'] / n * 1000:.0f}ms / TLS {self.totals['tls'] / n * 1000:.0f}ms / "
+            f"首字节 {self.totals['ttfb'] / n * 1000:.0f}ms，共 {self.totals['bytes'] / 1024 / 1024:.1f} MB"
+        )